@@ -18,7 +18,6 @@ Kullanım:
 import asyncio
 import json
 import sys
-from pathlib import Path
 from typing import Any
 
 from claude_agent_sdk import (
@@ -30,16 +29,9 @@ from claude_agent_sdk import (
     TextBlock,
 )
 
-# Paths
-DATA_DIR = Path(__file__).parent.parent / "src" / "data"
-
-
-def load_json(file_path: Path) -> Any:
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return None
+# Shared indexes
+from timing_store import get_timing_store
+from verse_index import get_verse_index
 
 
 # Kari bilgileri
@@ -323,24 +315,24 @@ async def get_word_timing(args: dict[str, Any]) -> dict[str, Any]:
     surah = args["surah"]
     ayah = args["ayah"]
 
-    surah_file = DATA_DIR / "quran-master" / f"surah-{str(surah).zfill(3)}.json"
-    surah_data = load_json(surah_file)
+    store = get_timing_store()
 
-    if not surah_data:
+    if store is None:
         return {"content": [{"type": "text", "text": "Veri bulunamadı"}], "is_error": True}
 
-    verse_data = next((v for v in surah_data.get("verses", []) if v.get("verseNumber") == ayah), None)
+    timings = store.verse_words(surah, ayah)
 
-    if not verse_data:
+    if timings is None:
         return {"content": [{"type": "text", "text": "Ayet bulunamadı"}], "is_error": True}
 
     words = []
-    for w in verse_data.get("words", []):
+    for w in timings:
         words.append({
-            "arabic": w.get("arabic", ""),
-            "start_ms": w.get("startTime"),
-            "end_ms": w.get("endTime"),
-            "duration_ms": w.get("endTime", 0) - w.get("startTime", 0)
+            "word_rank": w["word_rank"],
+            "arabic": _arabic_word(surah, ayah, w["word_rank"]),
+            "start_ms": w["start_ms"],
+            "end_ms": w["end_ms"],
+            "duration_ms": w["end_ms"] - w["start_ms"]
         })
 
     total_duration = sum(w["duration_ms"] for w in words)
@@ -358,6 +350,48 @@ async def get_word_timing(args: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+@tool(
+    "get_active_word",
+    "Tilavetin verilen anında (ms) okunan kelimeyi getirir (vurgulama senkronu için)",
+    {"surah": int, "ayah": int, "position_ms": int}
+)
+async def get_active_word(args: dict[str, Any]) -> dict[str, Any]:
+    """Konumdaki aktif kelimeyi getir."""
+    surah = args["surah"]
+    ayah = args["ayah"]
+    position_ms = args["position_ms"]
+
+    store = get_timing_store()
+
+    if store is None:
+        return {"content": [{"type": "text", "text": "Veri bulunamadı"}], "is_error": True}
+
+    if (surah, ayah) not in store.verses:
+        return {"content": [{"type": "text", "text": "Ayet bulunamadı"}], "is_error": True}
+
+    word = store.active_word(surah, ayah, position_ms)
+    if word is not None:
+        word["arabic"] = _arabic_word(surah, ayah, word["word_rank"])
+
+    return {
+        "content": [{
+            "type": "text",
+            "text": json.dumps({
+                "verse_key": f"{surah}:{ayah}",
+                "position_ms": position_ms,
+                "active_word": word
+            }, ensure_ascii=False, indent=2)
+        }]
+    }
+
+
+def _arabic_word(surah: int, ayah: int, word_rank: int) -> str:
+    """Ayetin Arapça metnindeki kelime (sıra 1'den başlar)."""
+    row = get_verse_index().get(surah, ayah)
+    words = row["arabic"].split() if row else []
+    return words[word_rank - 1] if 0 < word_rank <= len(words) else ""
+
+
 # ============= AGENT SETUP =============
 
 audio_server = create_sdk_mcp_server(
@@ -369,7 +403,8 @@ audio_server = create_sdk_mcp_server(
         get_audio_url,
         get_tajweed_rule,
         list_tajweed_rules,
-        get_word_timing
+        get_word_timing,
+        get_active_word
     ]
 )
 
@@ -399,6 +434,7 @@ SYSTEM_PROMPT = """Sen Kur'an tilaveti ve tecvid konusunda uzmanlaşmış bir as
 - get_tajweed_rule: Tecvid kuralı
 - list_tajweed_rules: Tüm kurallar
 - get_word_timing: Kelime zamanlaması
+- get_active_word: Verilen andaki aktif kelime
 
 Kullanıcıya sabırlı ve teşvik edici ol. Kur'an öğrenimi uzun bir yolculuktur."""
 
@@ -415,6 +451,7 @@ class AudioAgent:
                 "mcp__audio__get_tajweed_rule",
                 "mcp__audio__list_tajweed_rules",
                 "mcp__audio__get_word_timing",
+                "mcp__audio__get_active_word",
             ],
             permission_mode="acceptEdits",
             system_prompt=SYSTEM_PROMPT,
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Corpus Cache - src/data/quran JSON kaynaklarının mmap ile okunan ikili kopyası.
+
+JSON dosyaları asıl kaynak olarak kalır. Bu modül ayet indeksindeki metinleri
+(Arapça + tüm çeviriler) kompakt bir ikili dosyaya derler: her kaynak için
+UTF-8 metin bloğu + global ayet sırasına (0..6235) göre ofset dizisi. Dosya
+bellek eşlemesiyle (mmap) açılır; metinler yalnızca erişildiğinde çözülür ve
+aynı dosyayı açan tüm agent süreçleri işletim sisteminin sayfa önbelleğini
+paylaşır.
+
+Dosya düzeni (little-endian):
+    MAGIC (8 bayt) | başlık uzunluğu (u32) | başlık (JSON)
+    anahtarlar: ayet başına (sure u16, ayet u16)
+    her kaynak için: ofsetler (u32 x (N+1)) | UTF-8 metin bloğu
+
+Kullanım:
+    python corpus_cache.py            # ikili önbelleği derle
+    python corpus_cache.py --info     # önbellek bilgisini göster
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+CACHE_DIR = Path(__file__).parent / ".cache"
+CACHE_FILE = CACHE_DIR / "corpus.bin"
+MAGIC = b"QCORPUS1"
+CACHE_VERSION = 1
+
+
+def _align(n: int, to: int = 8) -> int:
+    return (n + to - 1) // to * to
+
+
+def compile_corpus(path: Path, signature: list, keys: list[tuple[int, int]],
+                   surahs: list[dict[str, Any]], fields: dict[str, list[str]]) -> int:
+    """
+    Metinleri ikili dosyaya yaz (atomik). Yazılan bayt sayısını döndürür.
+
+    fields: alan adı -> ayet sırasıyla metin listesi (len == len(keys))
+    """
+    count = len(keys)
+    sections: list[bytes] = []
+
+    keys_blob = struct.pack(f"<{2 * count}H", *(v for key in keys for v in key))
+    sections.append(keys_blob)
+
+    for field, texts in fields.items():
+        encoded = [t.encode("utf-8") for t in texts]
+        offsets = [0]
+        for b in encoded:
+            offsets.append(offsets[-1] + len(b))
+        sections.append(struct.pack(f"<{count + 1}I", *offsets))
+        sections.append(b"".join(encoded))
+
+    header = {
+        "version": CACHE_VERSION,
+        "signature": signature,
+        "verse_count": count,
+        "surahs": surahs,
+        "fields": list(fields),
+    }
+
+    # Başlık bölüm konumlarını içerdiğinden, konumlar sabit noktaya gelene kadar hesapla
+    header_bytes = b""
+    while True:
+        pos = _align(len(MAGIC) + 4 + len(header_bytes))
+        positions = []
+        for section in sections:
+            positions.append(pos)
+            pos = _align(pos + len(section))
+        header["keys_offset"] = positions[0]
+        for i, field in enumerate(fields):
+            header[f"offsets:{field}"] = positions[1 + 2 * i]
+            header[f"data:{field}"] = positions[2 + 2 * i]
+        new_header = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        if len(new_header) == len(header_bytes):
+            break
+        header_bytes = new_header
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        for section, start in zip(sections, positions):
+            f.write(b"\0" * (start - f.tell()))
+            f.write(section)
+        size = f.tell()
+    os.replace(tmp_path, path)
+    return size
+
+
+class CorpusCache:
+    """mmap ile açılmış ikili corpus; metinler erişildikçe çözülür."""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mm)
+
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"Geçersiz önbellek dosyası: {path}")
+        (header_len,) = struct.unpack_from("<I", view, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(view[start:start + header_len]).decode("utf-8"))
+
+        self.path = path
+        self.version = header["version"]
+        self.signature = header["signature"]
+        self.surahs = header["surahs"]
+        self.fields = header["fields"]
+        self.verse_count = count = header["verse_count"]
+
+        keys_offset = header["keys_offset"]
+        flat_keys = view[keys_offset:keys_offset + 4 * count].cast("H")
+        self.keys = [(flat_keys[2 * i], flat_keys[2 * i + 1]) for i in range(count)]
+
+        self._offsets: dict[str, memoryview] = {}
+        self._data: dict[str, memoryview] = {}
+        for field in self.fields:
+            off_pos = header[f"offsets:{field}"]
+            offsets = view[off_pos:off_pos + 4 * (count + 1)].cast("I")
+            data_pos = header[f"data:{field}"]
+            self._offsets[field] = offsets
+            self._data[field] = view[data_pos:data_pos + offsets[count]]
+
+    def text(self, doc_id: int, field: str) -> str:
+        """Bir ayetin verilen alandaki metni."""
+        offsets = self._offsets[field]
+        return str(self._data[field][offsets[doc_id]:offsets[doc_id + 1]], "utf-8")
+
+    def size(self) -> int:
+        return len(self._mm)
+
+
+class CachedVerseRow(Mapping):
+    """Ayet satırı; metin alanları mmap'ten erişim anında okunur."""
+
+    __slots__ = ("_cache", "_doc_id", "_meta")
+
+    def __init__(self, cache: CorpusCache, doc_id: int):
+        surah, ayah = cache.keys[doc_id]
+        self._cache = cache
+        self._doc_id = doc_id
+        self._meta = {"surah": surah, "ayah": ayah, "verse_key": f"{surah}:{ayah}"}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._meta:
+            return self._meta[key]
+        if key in self._cache._offsets:
+            return self._cache.text(self._doc_id, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._meta
+        yield from self._cache.fields
+
+    def __len__(self) -> int:
+        return len(self._meta) + len(self._cache.fields)
+
+
+def open_cache(signature: list, path: Path = CACHE_FILE) -> Optional[CorpusCache]:
+    """İmzası uyuşan önbelleği aç (yoksa/eskiyse None)."""
+    try:
+        cache = CorpusCache(path)
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+    if cache.version != CACHE_VERSION or cache.signature != signature:
+        return None
+    return cache
+
+
+def main():
+    from verse_index import build_verse_index, cache_signature, write_corpus_cache
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--info":
+        cache = open_cache(cache_signature())
+        if cache is None:
+            print(f"Önbellek yok veya güncel değil: {CACHE_FILE}")
+            return
+        print(f"Dosya: {cache.path}")
+        print(f"Boyut: {cache.size():,} bayt")
+        print(f"Ayet: {cache.verse_count}, sure: {len(cache.surahs)}")
+        print(f"Alanlar: {', '.join(cache.fields)}")
+        return
+
+    size = write_corpus_cache(build_verse_index(use_cache=False))
+    print(f"Derlendi: {CACHE_FILE} ({size:,} bayt)")
+
+
+if __name__ == "__main__":
+    main()
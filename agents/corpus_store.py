@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Corpus Store - Agent'lar arasında paylaşılan veri deposu.
+
+JSON kaynaklarını ilk erişimde bir kez yükler, süreç boyunca bellekte tutar
+ve dosyanın mtime/boyut bilgisi değiştiğinde yeniden yükler. Kaynaklardan
+türetilen yapılar (indeksler vb.) da aynı şekilde önbelleğe alınır.
+
+Kullanım:
+    from corpus_store import load_json, QURAN_DIR
+
+    arabic = load_json(QURAN_DIR / "quran_arabic.json") or []
+
+Not: Dönen nesneler paylaşılır; değiştirilmemeli (gerekirse kopyalayın).
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+# Paths
+DATA_DIR = Path(__file__).parent.parent / "src" / "data"
+QURAN_DIR = DATA_DIR / "quran"
+QURAN_MASTER_DIR = DATA_DIR / "quran-master"
+LEARNING_DIR = DATA_DIR / "learning"
+
+
+def file_signature(file_path: Path) -> Optional[tuple[int, int]]:
+    """Dosyanın (mtime_ns, size) imzası; dosya yoksa None."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class CorpusStore:
+    """Süreç ömrü boyunca yaşayan, mtime ile geçersiz kılınan JSON önbelleği."""
+
+    def __init__(self):
+        self._files: dict[Path, tuple[tuple[int, int], Any]] = {}
+        self._derived: dict[str, tuple[tuple, Any]] = {}
+        self._lock = threading.RLock()
+
+    def load(self, file_path: Path) -> Any:
+        """JSON dosyası yükle (önbellekten). Hata durumunda None döner."""
+        path = Path(file_path)
+        signature = file_signature(path)
+        if signature is None:
+            with self._lock:
+                self._files.pop(path, None)
+            return None
+
+        with self._lock:
+            cached = self._files.get(path)
+            if cached and cached[0] == signature:
+                return cached[1]
+
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception:
+                self._files.pop(path, None)
+                return None
+
+            self._files[path] = (signature, data)
+            return data
+
+    def derive(self, name: str, sources: Iterable[Path], builder: Callable[[], Any]) -> Any:
+        """
+        Kaynak dosyalardan türetilen bir yapıyı önbelleğe alarak döndür.
+
+        Kaynaklardan biri değiştiğinde (mtime/boyut) builder yeniden çağrılır.
+        """
+        sources = [Path(p) for p in sources]
+        signature = tuple(file_signature(p) for p in sources)
+
+        with self._lock:
+            cached = self._derived.get(name)
+            if cached and cached[0] == signature:
+                return cached[1]
+
+            value = builder()
+            self._derived[name] = (signature, value)
+            return value
+
+    def invalidate(self, file_path: Optional[Path] = None):
+        """Önbelleği temizle (dosya verilmezse tamamını)."""
+        with self._lock:
+            if file_path is None:
+                self._files.clear()
+                self._derived.clear()
+            else:
+                self._files.pop(Path(file_path), None)
+
+    def stats(self) -> dict[str, Any]:
+        """Önbellek durumu."""
+        with self._lock:
+            return {
+                "files": sorted(p.name for p in self._files),
+                "derived": sorted(self._derived),
+            }
+
+
+# Süreç genelinde tek örnek
+corpus = CorpusStore()
+
+
+def load_json(file_path: Path) -> Any:
+    """JSON dosyası yükle (paylaşılan önbellekten)."""
+    return corpus.load(file_path)
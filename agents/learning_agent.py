@@ -12,6 +12,7 @@ Kullanım:
     python learning_agent.py "bugün hangi kelimeleri çalışmalıyım?"
     python learning_agent.py --quiz
     python learning_agent.py --interactive
+    python learning_agent.py --user ayse --quiz    # öğrenci kimliği (varsayılan: LEARNING_USER)
 """
 
 import asyncio
@@ -33,37 +34,26 @@ from claude_agent_sdk import (
     ToolUseBlock
 )
 
-# Paths
-DATA_DIR = Path(__file__).parent.parent / "src" / "data"
-LEARNING_DIR = DATA_DIR / "learning"
-PROGRESS_FILE = Path(__file__).parent / "learning_progress.json"
-
-
-def load_json(file_path: Path) -> Any:
-    """JSON dosyası yükle."""
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return None
+# Kelime hazinesi (sıklığa göre sıralı listeler + kapsama eğrileri, bir kez yüklenir)
+import vocabulary
 
+# İlerleme deposu (SQLite, kullanıcı bölümlü; tekrarlar toplu yazılır)
+from progress_store import DEFAULT_USER, QUALITY, get_progress_store
 
-def save_json(file_path: Path, data: Any):
-    """JSON dosyası kaydet."""
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+# Vektörel SM-2 planlayıcı (iş yükü tahmini)
+import scheduler
 
+# Paths
+DATA_DIR = Path(__file__).parent.parent / "src" / "data"
+LEARNING_DIR = DATA_DIR / "learning"
 
-def load_progress() -> dict:
-    """Öğrenme ilerlemesini yükle."""
-    if PROGRESS_FILE.exists():
-        return load_json(PROGRESS_FILE) or {}
-    return {"cards": {}, "streak": 0, "last_study": None, "total_reviews": 0}
+# Öğrenci verilmediğinde kullanılan kimlik
+DEFAULT_LEARNER = os.environ.get("LEARNING_USER", DEFAULT_USER)
 
 
-def save_progress(progress: dict):
-    """İlerlemeyi kaydet."""
-    save_json(PROGRESS_FILE, progress)
+def learner(args: dict[str, Any]):
+    """Tool çağrısının öğrencisinin ilerlemesi (user_id agent'ın sunucusu tarafından eklenir)."""
+    return get_progress_store().user(args.get("user_id") or DEFAULT_LEARNER)
 
 
 # ============= LEARNING TOOLS =============
@@ -79,30 +69,22 @@ async def get_flashcards(args: dict[str, Any]) -> dict[str, Any]:
     count = args.get("count", 10)
 
     try:
-        if category == "words":
-            data = load_json(LEARNING_DIR / "words_300.json")
-        elif category == "twogram":
-            data = load_json(LEARNING_DIR / "twogram.json")
-        elif category == "threegram":
-            data = load_json(LEARNING_DIR / "threegram.json")
-        else:
+        vocab = vocabulary.get_vocabulary()
+        if category not in vocab.items:
             return {
                 "content": [{"type": "text", "text": "Geçersiz kategori"}],
                 "is_error": True
             }
 
-        if not data:
+        items = vocab.items[category]
+        if not items:
             return {
                 "content": [{"type": "text", "text": "Veri bulunamadı"}],
                 "is_error": True
             }
 
-        # Get items
-        items = list(data.values()) if isinstance(data, dict) else data
-
-        # Shuffle and select
-        random.shuffle(items)
-        selected = items[:count]
+        # Random selection (paylaşılan liste değiştirilmez)
+        selected = random.sample(items, min(count, len(items)))
 
         # Format as flashcards
         flashcards = []
@@ -139,23 +121,7 @@ async def get_flashcards(args: dict[str, Any]) -> dict[str, Any]:
 async def get_learning_stats(args: dict[str, Any]) -> dict[str, Any]:
     """İstatistik getir."""
     try:
-        progress = load_progress()
-
-        cards = progress.get("cards", {})
-        mastered = sum(1 for c in cards.values() if c.get("mastery", "") == "mastered")
-        learning = sum(1 for c in cards.values() if c.get("mastery", "") == "learning")
-        reviewing = sum(1 for c in cards.values() if c.get("mastery", "") == "reviewing")
-
-        stats = {
-            "total_cards": len(cards),
-            "mastered": mastered,
-            "learning": learning,
-            "reviewing": reviewing,
-            "new": len(cards) - mastered - learning - reviewing,
-            "streak": progress.get("streak", 0),
-            "total_reviews": progress.get("total_reviews", 0),
-            "last_study": progress.get("last_study"),
-        }
+        stats = learner(args).stats()
 
         return {
             "content": [{
@@ -181,62 +147,100 @@ async def record_review(args: dict[str, Any]) -> dict[str, Any]:
     rating = args["rating"]  # again, hard, good, easy
 
     try:
-        progress = load_progress()
-        cards = progress.setdefault("cards", {})
-
-        # Get or create card progress
-        card = cards.setdefault(card_id, {
-            "repetitions": 0,
-            "ease_factor": 2.5,
-            "interval": 1,
-            "mastery": "new"
-        })
-
-        # SM-2 algorithm
-        quality = {"again": 0, "hard": 1, "good": 4, "easy": 5}.get(rating, 3)
-
-        if quality < 3:
-            card["repetitions"] = 0
-            card["interval"] = 1
-        else:
-            if card["repetitions"] == 0:
-                card["interval"] = 1
-            elif card["repetitions"] == 1:
-                card["interval"] = 6
-            else:
-                card["interval"] = int(card["interval"] * card["ease_factor"])
+        card = learner(args).record_review(card_id, rating)
+
+        return {
+            "content": [{
+                "type": "text",
+                "text": json.dumps({
+                    "card_id": card_id,
+                    "new_interval": card["interval"],
+                    "mastery": card["mastery"],
+                    "message": f"Kart kaydedildi. Sonraki tekrar: {card['interval']} gün sonra"
+                }, ensure_ascii=False, indent=2)
+            }]
+        }
+    except Exception as e:
+        return {
+            "content": [{"type": "text", "text": f"Hata: {e}"}],
+            "is_error": True
+        }
 
-            card["repetitions"] += 1
 
-        # Update ease factor
-        card["ease_factor"] = max(1.3, card["ease_factor"] + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)))
+@tool(
+    "record_reviews",
+    "Bir çalışma oturumundaki tüm kart sonuçlarını tek seferde kaydeder",
+    {"reviews": list}
+)
+async def record_reviews(args: dict[str, Any]) -> dict[str, Any]:
+    """Toplu çalışma sonucu kaydet (tek işlem)."""
+    # [{"card_id": ..., "rating": ..., "reviewed_at": ...}] veya [[card_id, rating, reviewed_at]]
+    reviews = args.get("reviews") or []
 
-        # Update mastery
-        if card["repetitions"] == 0:
-            card["mastery"] = "new"
-        elif card["repetitions"] < 3:
-            card["mastery"] = "learning"
-        elif card["interval"] < 21:
-            card["mastery"] = "reviewing"
-        else:
-            card["mastery"] = "mastered"
+    try:
+        entries = []
+        for review in reviews:
+            if isinstance(review, dict):
+                review = (review.get("card_id"), review.get("rating"), review.get("reviewed_at"))
+            card_id, rating, *rest = review
+            reviewed_at = rest[0] if rest else None
+            if not card_id or rating not in QUALITY:
+                return {
+                    "content": [{"type": "text", "text": f"Geçersiz kayıt: {review}. Puanlar: {', '.join(QUALITY)}"}],
+                    "is_error": True
+                }
+            if reviewed_at:
+                datetime.fromisoformat(reviewed_at)
+            entries.append((card_id, rating, reviewed_at))
+
+        cards = learner(args).record_reviews(entries)
+
+        return {
+            "content": [{
+                "type": "text",
+                "text": json.dumps({
+                    "recorded": len(cards),
+                    "cards": [
+                        {"card_id": card_id, "new_interval": card["interval"], "mastery": card["mastery"]}
+                        for (card_id, _, _), card in zip(entries, cards)
+                    ]
+                }, ensure_ascii=False, indent=2)
+            }]
+        }
+    except Exception as e:
+        return {
+            "content": [{"type": "text", "text": f"Hata: {e}"}],
+            "is_error": True
+        }
 
-        card["last_review"] = datetime.now().isoformat()
 
-        # Update global stats
-        progress["total_reviews"] = progress.get("total_reviews", 0) + 1
-        progress["last_study"] = datetime.now().isoformat()[:10]
+@tool(
+    "get_next_words",
+    "Metin kapsamasını en çok artıracak, henüz öğrenilmemiş kelimeleri getirir",
+    {"count": int}
+)
+async def get_next_words(args: dict[str, Any]) -> dict[str, Any]:
+    """Kapsamaya göre sıradaki kelimeler."""
+    count = args.get("count", 10)
 
-        save_progress(progress)
+    try:
+        vocab = vocabulary.get_vocabulary()
+        # En az bir kez doğru bilinen kartlar öğrenilmiş sayılır
+        known = [card_id for card_id, card in learner(args).cards().items() if card["mastery"] != "new"]
+        words = vocab.next_words(known, count)
 
         return {
             "content": [{
                 "type": "text",
                 "text": json.dumps({
-                    "card_id": card_id,
-                    "new_interval": card["interval"],
-                    "mastery": card["mastery"],
-                    "message": f"Kart kaydedildi. Sonraki tekrar: {card['interval']} gün sonra"
+                    "current_coverage_percent": round(100 * vocab.coverage_of(known), 1),
+                    "words": [{
+                        "id": w.get("id", ""),
+                        "arabic": w.get("arabic", ""),
+                        "translations": w.get("translations", {}),
+                        "frequency": w.get("frequency", 0),
+                        "coverage_after_percent": round(100 * w["coverage_after"], 1)
+                    } for w in words]
                 }, ensure_ascii=False, indent=2)
             }]
         }
@@ -276,35 +280,15 @@ async def get_due_cards(args: dict[str, Any]) -> dict[str, Any]:
     limit = args.get("limit", 20)
 
     try:
-        progress = load_progress()
-        cards = progress.get("cards", {})
-
-        today = datetime.now().isoformat()[:10]
-        due_cards = []
-
-        for card_id, card_data in cards.items():
-            last_review = card_data.get("last_review", "")
-            if last_review:
-                last_date = datetime.fromisoformat(last_review[:10])
-                interval = card_data.get("interval", 1)
-                next_date = last_date.replace(day=last_date.day + interval)
-
-                if next_date.isoformat()[:10] <= today:
-                    due_cards.append({
-                        "id": card_id,
-                        "mastery": card_data.get("mastery"),
-                        "days_overdue": (datetime.now() - next_date).days
-                    })
-
-        # Sort by overdue days
-        due_cards.sort(key=lambda x: x.get("days_overdue", 0), reverse=True)
-        due_cards = due_cards[:limit]
+        progress = learner(args)
+        due_cards = progress.due_cards(limit)
 
         return {
             "content": [{
                 "type": "text",
                 "text": json.dumps({
                     "due_count": len(due_cards),
+                    "total_due": progress.due_count(),
                     "cards": due_cards
                 }, ensure_ascii=False, indent=2)
             }]
@@ -316,13 +300,52 @@ async def get_due_cards(args: dict[str, Any]) -> dict[str, Any]:
         }
 
 
+@tool(
+    "forecast_workload",
+    "Önümüzdeki günlerde günlük kaç tekrar yapılacağını tahmin eder",
+    {"days": int}
+)
+async def forecast_workload(args: dict[str, Any]) -> dict[str, Any]:
+    """Tekrar yükü tahmini (vektörel SM-2 simülasyonu)."""
+    days = min(max(int(args.get("days", 90)), 1), 365)
+
+    try:
+        forecast = scheduler.forecast_workload(learner(args), days)
+
+        return {
+            "content": [{
+                "type": "text",
+                "text": json.dumps(forecast, ensure_ascii=False, indent=2)
+            }]
+        }
+    except Exception as e:
+        return {
+            "content": [{"type": "text", "text": f"Hata: {e}"}],
+            "is_error": True
+        }
+
+
 # ============= AGENT SETUP =============
 
-learning_server = create_sdk_mcp_server(
-    name="learning",
-    version="1.0.0",
-    tools=[get_flashcards, get_learning_stats, record_review, explain_root, get_due_cards]
-)
+LEARNING_TOOLS = [
+    get_flashcards, get_next_words, get_learning_stats, record_review, record_reviews,
+    explain_root, get_due_cards, forecast_workload,
+]
+
+
+def create_learning_server(user_id: str):
+    """Tool'ları user_id öğrencisine bağlı learning sunucusu (her agent kendi sunucusunu kurar)."""
+    def bind(learning_tool):
+        async def handler(args: dict[str, Any]) -> dict[str, Any]:
+            return await learning_tool.handler({**args, "user_id": user_id})
+        return tool(learning_tool.name, learning_tool.description, learning_tool.input_schema)(handler)
+
+    return create_sdk_mcp_server(
+        name="learning",
+        version="1.0.0",
+        tools=[bind(learning_tool) for learning_tool in LEARNING_TOOLS]
+    )
+
 
 SYSTEM_PROMPT = """Sen Kur'an Arapçası öğrenme asistanısın.
 
@@ -341,10 +364,13 @@ SYSTEM_PROMPT = """Sen Kur'an Arapçası öğrenme asistanısın.
 
 ## Mevcut Tool'lar:
 - get_flashcards: Çalışılacak kartları getir
+- get_next_words: Kapsamayı en çok artıracak yeni kelimeler
 - get_learning_stats: İstatistikleri göster
 - record_review: Çalışma sonucu kaydet
+- record_reviews: Bir oturumdaki tüm sonuçları tek seferde kaydet (birden çok kart için bunu tercih et)
 - explain_root: Kelime kökü açıkla
 - get_due_cards: Bugün tekrar edilecek kartlar
+- forecast_workload: Önümüzdeki günlerin tekrar yükü tahmini
 
 ## Önemli:
 - Cesaretlendirici ve sabırlı ol
@@ -356,18 +382,22 @@ SYSTEM_PROMPT = """Sen Kur'an Arapçası öğrenme asistanısın.
 class LearningAgent:
     """Kur'an kelime öğrenme asistanı."""
 
-    def __init__(self):
+    def __init__(self, user_id: Optional[str] = None):
+        self.user_id = user_id or DEFAULT_LEARNER
         self.options = ClaudeAgentOptions(
             allowed_tools=[
                 "mcp__learning__get_flashcards",
+                "mcp__learning__get_next_words",
                 "mcp__learning__get_learning_stats",
                 "mcp__learning__record_review",
+                "mcp__learning__record_reviews",
                 "mcp__learning__explain_root",
                 "mcp__learning__get_due_cards",
+                "mcp__learning__forecast_workload",
             ],
             permission_mode="acceptEdits",
             system_prompt=SYSTEM_PROMPT,
-            mcp_servers={"learning": learning_server}
+            mcp_servers={"learning": create_learning_server(self.user_id)}
         )
 
     async def quiz_mode(self, count: int = 10):
@@ -377,16 +407,15 @@ class LearningAgent:
         print("=" * 60)
 
         # Load words
-        words_data = load_json(LEARNING_DIR / "words_300.json")
-        if not words_data:
+        items = vocabulary.get_vocabulary().items["words"]
+        if not items:
             print("Kelime verisi bulunamadı!")
             return
 
-        items = list(words_data.values()) if isinstance(words_data, dict) else words_data
-        random.shuffle(items)
-        selected = items[:count]
+        selected = random.sample(items, min(count, len(items)))
 
         correct = 0
+        reviews = []
         for i, word in enumerate(selected, 1):
             print(f"\n--- Soru {i}/{count} ---")
             print(f"\n📝 Arapça: {word.get('arabic', '')}")
@@ -400,12 +429,18 @@ class LearningAgent:
             rating = input("\nBildin mi? (e/h): ").strip().lower()
             if rating in ["e", "y", "evet", "yes"]:
                 correct += 1
+                reviews.append((word.get("id", ""), "good", datetime.now().isoformat()))
                 print("👍 Harika!")
             else:
+                reviews.append((word.get("id", ""), "again", datetime.now().isoformat()))
                 print("💪 Bir dahaki sefere!")
 
+        # Tüm sonuçlar tek işlemde kaydedilir
+        saved = get_progress_store().user(self.user_id).record_reviews([review for review in reviews if review[0]])
+
         print(f"\n{'=' * 60}")
         print(f"📊 Sonuç: {correct}/{count} ({100 * correct // count}%)")
+        print(f"💾 {len(saved)} kart ilerlemeye kaydedildi ({self.user_id})")
         print("=" * 60)
 
     async def interactive(self):
@@ -442,7 +477,13 @@ class LearningAgent:
 
 
 async def main():
-    agent = LearningAgent()
+    user_id = None
+    if "--user" in sys.argv:
+        i = sys.argv.index("--user")
+        user_id = sys.argv[i + 1] if i + 1 < len(sys.argv) else None
+        del sys.argv[i:i + 2]
+
+    agent = LearningAgent(user_id)
 
     if len(sys.argv) > 1:
         if sys.argv[1] in ["--quiz", "-q"]:
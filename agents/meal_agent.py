@@ -17,13 +17,19 @@ Kullanım:
   python meal_agent.py --surah 2 --ayah 255   # Ayetel Kürsi
   python meal_agent.py --range 1:1-7          # Fatiha 1-7
   python meal_agent.py --export all           # Tüm Kur'an'ı JSON olarak çıkar
+  python meal_agent.py --export jsonl         # Ayet başına bir satır (JSON Lines)
+  python meal_agent.py --export jsonl --resume  # Yarım kalan JSONL çıktısına devam et
 """
 
 import json
+import os
+import re
 import argparse
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Iterable
 
 # Veri dosyaları
 DATA_DIR = Path(__file__).parent.parent / "src" / "data" / "quran"
@@ -31,10 +37,34 @@ ELMALILI_TEFSIR_FILE = DATA_DIR / "elmalili_tefsir.json"
 HAYRAT_MEAL_FILE = DATA_DIR / "hayrat_meal.json"
 OUTPUT_DIR = Path(__file__).parent.parent / "src" / "data" / "quran"
 
-# quran.com API
-QURAN_API_BASE = "https://api.quran.com/api/v4"
+# quran.com API (yerel test sunucusu için QURAN_API_BASE ile değiştirilebilir)
+QURAN_API_BASE = os.environ.get("QURAN_API_BASE", "https://api.quran.com/api/v4")
 ELMALILI_TRANSLATION_ID = 52
 
+# Ham API yanıtlarının kalıcı önbelleği (sure başına bir dosya)
+ELMALILI_CACHE_DIR = Path(__file__).parent / ".cache" / "elmalili"
+FETCH_WORKERS = 8
+
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# Birleşik meal dosyasının üst bilgisi
+EXPORT_METADATA = {
+    "title": "Birleşik Türkçe Kur'an Meali",
+    "sources": [
+        {
+            "name": "Elmalılı Muhammed Hamdi Yazır",
+            "work": "Hak Dini Kur'an Dili",
+            "type": "Meal + Tefsir (Sure bazlı)"
+        },
+        {
+            "name": "Hayrat Neşriyat",
+            "work": "Kur'an-ı Kerim Meali",
+            "type": "Meal + Tefsir (Ayet bazlı, Risale-i Nur referansları)"
+        }
+    ],
+    "note": "Bu meal, iki farklı kaynaktan derlenmiştir. Tefsirler referans amaçlıdır.",
+}
+
 # Sure bilgileri
 SURAH_INFO = {
     1: {"name": "Fatiha", "name_ar": "الفاتحة", "ayah_count": 7},
@@ -58,6 +88,11 @@ class MealAgent:
         self.elmalili_tefsir = self._load_elmalili_tefsir()
         self.hayrat_data = self._load_hayrat_data()
         self._elmalili_meal_cache = {}
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=FETCH_WORKERS)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._cache_lock = threading.Lock()
 
     def _load_elmalili_tefsir(self) -> Dict:
         """Elmalılı tefsirini yükle"""
@@ -74,31 +109,17 @@ class MealAgent:
         return {"translations": {}, "tafsir": {}}
 
     def get_elmalili_meal(self, surah_id: int, ayah_id: Optional[int] = None) -> Dict[int, str]:
-        """quran.com API'den Elmalılı mealini çek"""
+        """quran.com API'den Elmalılı mealini çek (önce bellek, sonra disk önbelleği)"""
         cache_key = f"{surah_id}"
 
         if cache_key not in self._elmalili_meal_cache:
             try:
-                url = f"{QURAN_API_BASE}/verses/by_chapter/{surah_id}?translations={ELMALILI_TRANSLATION_ID}&per_page=300"
-                response = requests.get(url, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-
-                meals = {}
-                for verse in data.get("verses", []):
-                    verse_num = verse.get("verse_number")
-                    translations = verse.get("translations", [])
-                    if translations:
-                        text = translations[0].get("text", "")
-                        # HTML etiketlerini temizle
-                        import re
-                        text = re.sub(r'<[^>]+>', '', text)
-                        meals[verse_num] = text.strip()
-
-                self._elmalili_meal_cache[cache_key] = meals
+                meals = self._parse_elmalili(self._fetch_elmalili_raw(surah_id))
             except Exception as e:
                 print(f"[HATA] Elmalılı meali çekilemedi: {e}")
-                self._elmalili_meal_cache[cache_key] = {}
+                meals = {}
+            with self._cache_lock:
+                self._elmalili_meal_cache[cache_key] = meals
 
         result = self._elmalili_meal_cache[cache_key]
 
@@ -106,6 +127,64 @@ class MealAgent:
             return {ayah_id: result.get(ayah_id, "")}
         return result
 
+    def prefetch_elmalili(self, surah_ids: Iterable[int], workers: int = FETCH_WORKERS) -> int:
+        """
+        Disk önbelleğinde olmayan sureleri paralel indir (yalnızca önbelleğe
+        yazar, belleğe almaz). İndirilen sure sayısını döndürür.
+        """
+        missing = [sid for sid in surah_ids if not self._elmalili_cache_file(sid).exists()]
+        if not missing:
+            return 0
+
+        def fetch(surah_id: int) -> bool:
+            try:
+                self._fetch_elmalili_raw(surah_id)
+                return True
+            except Exception as e:
+                print(f"[HATA] Sure {surah_id} indirilemedi: {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return sum(executor.map(fetch, missing))
+
+    @staticmethod
+    def _elmalili_cache_file(surah_id: int) -> Path:
+        return ELMALILI_CACHE_DIR / f"chapter-{surah_id:03d}.json"
+
+    def _fetch_elmalili_raw(self, surah_id: int) -> bytes:
+        """Ham API yanıtı (disk önbelleğinden ya da ağdan; başarılı yanıt önbelleğe yazılır)"""
+        cache_file = self._elmalili_cache_file(surah_id)
+        try:
+            return cache_file.read_bytes()
+        except OSError:
+            pass
+
+        url = f"{QURAN_API_BASE}/verses/by_chapter/{surah_id}?translations={ELMALILI_TRANSLATION_ID}&per_page=300"
+        response = self._session.get(url, timeout=30)
+        response.raise_for_status()
+        raw = response.content
+        json.loads(raw)  # bozuk yanıt önbelleğe yazılmaz
+
+        try:
+            ELMALILI_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_name(f"{cache_file.name}.{threading.get_ident()}.tmp")
+            tmp_file.write_bytes(raw)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
+        return raw
+
+    @staticmethod
+    def _parse_elmalili(raw: bytes) -> Dict[int, str]:
+        """API yanıtından ayet -> meal (HTML etiketleri temizlenmiş)"""
+        meals = {}
+        for verse in json.loads(raw).get("verses", []):
+            translations = verse.get("translations", [])
+            if translations:
+                text = translations[0].get("text", "")
+                meals[verse.get("verse_number")] = HTML_TAG_RE.sub('', text).strip()
+        return meals
+
     def get_elmalili_tefsir(self, surah_id: int) -> str:
         """Elmalılı tefsirini getir (sure bazlı)"""
         surah_data = self.elmalili_tefsir.get("surahs", {}).get(str(surah_id), {})
@@ -217,48 +296,134 @@ class MealAgent:
 
         return "\n".join(lines)
 
-    def export_combined_meal(self, output_file: Optional[Path] = None) -> Dict:
-        """Tüm Kur'an için birleşik meal JSON dosyası oluştur"""
+    def export_combined_meal(self, output_file: Optional[Path] = None, fmt: str = "json",
+                             resume: bool = False) -> Dict:
+        """
+        Tüm Kur'an için birleşik meal dosyası oluştur (akış halinde).
+
+        Sureler üretildikçe dosyaya yazılır; bellekte aynı anda yalnızca bir
+        sure tutulur.
+        - json: {"metadata": ..., "surahs": {...}} - önce <dosya>.partial
+          dosyasına yazılır, tamamlanınca asıl adına taşınır
+        - jsonl: satır başına bir kayıt; her surenin önce "surah" kaydı
+          (Elmalılı tefsiri dahil), ardından ayet kayıtları. Her sure
+          yazıldıktan sonra diske aktarılır; resume=True ile yarım kalan
+          dosyaya kalınan yerden devam edilir.
+        """
         if output_file is None:
-            output_file = OUTPUT_DIR / "combined_turkish_meal.json"
-
-        result = {
-            "metadata": {
-                "title": "Birleşik Türkçe Kur'an Meali",
-                "sources": [
-                    {
-                        "name": "Elmalılı Muhammed Hamdi Yazır",
-                        "work": "Hak Dini Kur'an Dili",
-                        "type": "Meal + Tefsir (Sure bazlı)"
-                    },
-                    {
-                        "name": "Hayrat Neşriyat",
-                        "work": "Kur'an-ı Kerim Meali",
-                        "type": "Meal + Tefsir (Ayet bazlı, Risale-i Nur referansları)"
-                    }
-                ],
-                "note": "Bu meal, iki farklı kaynaktan derlenmiştir. Tefsirler referans amaçlıdır.",
-            },
-            "surahs": {}
-        }
+            suffix = "jsonl" if fmt == "jsonl" else "json"
+            output_file = OUTPUT_DIR / f"combined_turkish_meal.{suffix}"
+        output_file = Path(output_file)
 
         print("Birleşik meal oluşturuluyor...")
+        fetched = self.prefetch_elmalili(range(1, 115))
+        if fetched:
+            print(f"  {fetched} sure indirildi ({ELMALILI_CACHE_DIR})")
+
+        if fmt == "jsonl":
+            summary = self._export_jsonl(output_file, resume)
+        else:
+            summary = self._export_json(output_file)
+
+        print(f"\nKaydedildi: {output_file} ({summary['surahs']} sure, {summary['verses']} ayet)")
+        return summary
 
+    def _export_surahs(self, skip: Optional[set] = None):
+        """Sureleri sırayla üret (hatalı sureler atlanır)."""
         for surah_id in range(1, 115):
+            if skip and surah_id in skip:
+                continue
             print(f"  Sure {surah_id}...", end=" ", flush=True)
             try:
                 surah_data = self.get_surah(surah_id)
-                result["surahs"][str(surah_id)] = surah_data
-                print(f"{len(surah_data['verses'])} ayet")
             except Exception as e:
                 print(f"HATA: {e}")
-
-        # Kaydet
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
-
-        print(f"\nKaydedildi: {output_file}")
-        return result
+                continue
+            print(f"{len(surah_data['verses'])} ayet")
+            yield surah_id, surah_data
+            # Yazılan surenin meali bellekte tutulmaz
+            self._elmalili_meal_cache.pop(str(surah_id), None)
+
+    def _export_json(self, output_file: Path) -> Dict:
+        partial_file = output_file.with_name(output_file.name + ".partial")
+        summary = {"output": str(output_file), "surahs": 0, "verses": 0}
+
+        metadata = json.dumps(EXPORT_METADATA, ensure_ascii=False, indent=2)
+        with open(partial_file, 'w', encoding='utf-8') as f:
+            f.write('{\n  "metadata": ' + metadata.replace('\n', '\n  ') + ',\n  "surahs": {')
+            for surah_id, surah_data in self._export_surahs():
+                body = json.dumps(surah_data, ensure_ascii=False, indent=2).replace('\n', '\n    ')
+                f.write((',' if summary["surahs"] else '') + f'\n    "{surah_id}": {body}')
+                f.flush()
+                summary["surahs"] += 1
+                summary["verses"] += len(surah_data["verses"])
+            f.write('\n  }\n}\n' if summary["surahs"] else '}\n}\n')
+
+        os.replace(partial_file, output_file)
+        return summary
+
+    def _export_jsonl(self, output_file: Path, resume: bool) -> Dict:
+        done = self._completed_jsonl_surahs(output_file) if resume else {}
+        summary = {"output": str(output_file), "surahs": len(done), "verses": sum(done.values())}
+
+        with open(output_file, 'a' if resume else 'w', encoding='utf-8') as f:
+            if not done:
+                f.write(json.dumps({"type": "metadata", **EXPORT_METADATA}, ensure_ascii=False) + '\n')
+            for surah_id, surah_data in self._export_surahs(skip=set(done)):
+                verses = surah_data.pop("verses")
+                if not verses:
+                    # Ayetsiz sure (ör. API hatası) yazılmaz; resume ile yeniden denenir
+                    continue
+                lines = [json.dumps({"type": "surah", **surah_data}, ensure_ascii=False)]
+                lines += [
+                    json.dumps({"type": "verse", "surah_id": surah_id, **verse}, ensure_ascii=False)
+                    for verse in verses
+                ]
+                # Sure tek yazımda eklenir ve diske aktarılır
+                f.write('\n'.join(lines) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+                summary["surahs"] += 1
+                summary["verses"] += len(verses)
+
+        return summary
+
+    @staticmethod
+    def _completed_jsonl_surahs(output_file: Path) -> Dict[int, int]:
+        """
+        Yarım kalan JSONL dosyasında tamamlanmış sureler (sure -> ayet sayısı).
+        Son surenin kayıtları eksikse (ayet sayısı tutmuyorsa) o sure ve
+        sonrası dosyadan kesilir; tamamlanmış sure yoksa dosya boşaltılır.
+        """
+        if not output_file.exists():
+            return {}
+
+        done = {}
+        current, expected, seen = None, 0, 0
+        valid_end = 0
+        with open(output_file, 'rb') as f:
+            offset = 0
+            for raw in f:
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    break
+                offset += len(raw)
+                if not raw.endswith(b'\n'):
+                    break
+                kind = record.get("type")
+                if kind == "surah":
+                    current, expected, seen = record["surah_id"], record["ayah_count"], 0
+                elif kind == "verse" and record.get("surah_id") == current:
+                    seen += 1
+                if current is not None and seen == expected:
+                    done[current] = expected
+                    valid_end = offset
+                    current = None
+
+        with open(output_file, 'r+b') as f:
+            f.truncate(valid_end)
+        return done
 
 
 def main():
@@ -266,14 +431,18 @@ def main():
     parser.add_argument("--surah", type=int, help="Sure numarası (1-114)")
     parser.add_argument("--ayah", type=int, help="Ayet numarası")
     parser.add_argument("--range", type=str, help="Ayet aralığı (örn: 2:255-256)")
-    parser.add_argument("--export", type=str, help="Tümünü dışa aktar: 'all' veya 'json'")
+    parser.add_argument("--export", type=str, help="Tümünü dışa aktar: 'all', 'json' veya 'jsonl'")
+    parser.add_argument("--output", type=str, help="Dışa aktarma dosyası")
+    parser.add_argument("--resume", action="store_true", help="Yarım kalan JSONL dışa aktarmaya devam et")
     parser.add_argument("--format", type=str, default="markdown", choices=["markdown", "json"], help="Çıktı formatı")
 
     args = parser.parse_args()
     agent = MealAgent()
 
     if args.export:
-        agent.export_combined_meal()
+        fmt = "jsonl" if args.export == "jsonl" else "json"
+        output_file = Path(args.output) if args.output else None
+        agent.export_combined_meal(output_file, fmt=fmt, resume=args.resume)
         return
 
     if args.surah:
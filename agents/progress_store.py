@@ -0,0 +1,643 @@
+#!/usr/bin/env python3
+"""
+Progress Store - Learning agent ilerlemesi için çok kullanıcılı SQLite (WAL) deposu.
+
+Kart durumu kullanıcı kimliğine göre bölümlenir (cards, reviews ve meta
+tablolarında user_id):
+- reviews: yalnızca eklenen tekrar günlüğü (kullanıcı, kart, puan, zaman, sonuç)
+- cards: kartın güncel SM-2 durumu, (user_id, card_id) başına tek satır
+- meta: kullanıcı başına sayaçlar (total_reviews, last_study, streak)
+
+Aktif kullanıcıların kart tabloları bellekte bir LRU önbellekte tutulur
+(UserProgress). Tekrarlar önce bellekte uygulanır, sonra toplu olarak tek
+işlemde (transaction) yazılır: batch_size tekrar birikince, flush_interval
+saniye dolunca, kullanıcı önbellekten düşerken veya süreç kapanırken;
+record_reviews bir oturumun tüm tekrarlarını tek işlemde hemen yazar. WAL
+modu aynı anda çalışan oturumların (farklı süreçler dahil) güvenle yazmasını
+sağlar; bir kullanıcının oturumları ise aynı süreçten sunulmalıdır (kart
+önbelleği süreç içidir).
+
+Her kartın bir sonraki tekrar günü (next_due) ayrı bir sütunda tutulur ve
+(user_id, next_due) ile indekslenir; "bugün neler tekrar edilecek" sorusu
+indeks üzerinde bir aralık sorgusudur, tüm kartlar taranmaz.
+
+compact() WAL dosyasını ana veritabanına aktarıp sıfırlar ve istenirse eski
+günlük kayıtlarını siler. Eski learning_progress.json varsa ilk açılışta bir
+kez varsayılan kullanıcıya içe aktarılır.
+
+Kullanım:
+    from progress_store import get_progress_store
+
+    learner = get_progress_store().user("ayse")
+    learner.record_review("word_1", "good")
+    learner.record_reviews([("word_2", "easy"), ("word_3", "again", "2025-01-15T10:00:00")])
+    learner.due_cards(limit=20)
+    learner.stats()
+
+    python progress_store.py                   # özet (varsayılan kullanıcı)
+    python progress_store.py --user ayse       # özet (verilen kullanıcı)
+    python progress_store.py --users           # kullanıcılar
+    python progress_store.py --compact         # WAL checkpoint + VACUUM
+    python progress_store.py --export          # learning_progress.json anlık görüntüsü
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+DB_FILE = Path(__file__).parent / "learning_progress.db"
+LEGACY_FILE = Path(__file__).parent / "learning_progress.json"
+
+DEFAULT_USER = "default"
+
+# SM-2 kalite puanları
+QUALITY = {"again": 0, "hard": 1, "good": 4, "easy": 5}
+MASTERY_LEVELS = ("new", "learning", "reviewing", "mastered")
+
+# SM-2 parametreleri (kullanıcı başına meta "sm2_params" ile değiştirilebilir)
+SM2_DEFAULTS = {
+    "first_interval": 1,
+    "second_interval": 6,
+    "interval_modifier": 1.0,
+    "min_ease": 1.3,
+    "max_interval": None,  # gün; None: sınırsız
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    card_id TEXT PRIMARY KEY,
+    repetitions INTEGER NOT NULL DEFAULT 0,
+    ease_factor REAL NOT NULL DEFAULT 2.5,
+    interval INTEGER NOT NULL DEFAULT 1,
+    mastery TEXT NOT NULL DEFAULT 'new',
+    last_review TEXT
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    card_id TEXT NOT NULL,
+    rating TEXT NOT NULL,
+    reviewed_at TEXT NOT NULL,
+    interval INTEGER NOT NULL,
+    ease_factor REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Sıralı şema değişiklikleri (PRAGMA user_version = uygulanan adım sayısı)
+MIGRATIONS = (
+    # 1: next_due sütunu + indeks (last_review + interval gün)
+    (
+        "ALTER TABLE cards ADD COLUMN next_due TEXT",
+        "UPDATE cards SET next_due = date(last_review, '+' || interval || ' days') WHERE last_review IS NOT NULL",
+        "CREATE INDEX IF NOT EXISTS idx_cards_next_due ON cards(next_due)",
+    ),
+    # 2: kullanıcı bölümleri (mevcut ilerleme varsayılan kullanıcıya geçer)
+    (
+        """CREATE TABLE cards_by_user (
+            user_id TEXT NOT NULL,
+            card_id TEXT NOT NULL,
+            repetitions INTEGER NOT NULL DEFAULT 0,
+            ease_factor REAL NOT NULL DEFAULT 2.5,
+            interval INTEGER NOT NULL DEFAULT 1,
+            mastery TEXT NOT NULL DEFAULT 'new',
+            last_review TEXT,
+            next_due TEXT,
+            PRIMARY KEY (user_id, card_id)
+        )""",
+        f"INSERT INTO cards_by_user SELECT '{DEFAULT_USER}', card_id, repetitions, ease_factor, interval, "
+        "mastery, last_review, next_due FROM cards",
+        "DROP TABLE cards",
+        "ALTER TABLE cards_by_user RENAME TO cards",
+        "CREATE INDEX idx_cards_user_due ON cards(user_id, next_due)",
+        """CREATE TABLE meta_by_user (
+            user_id TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT,
+            PRIMARY KEY (user_id, key)
+        )""",
+        f"INSERT INTO meta_by_user SELECT '{DEFAULT_USER}', key, value FROM meta",
+        "DROP TABLE meta",
+        "ALTER TABLE meta_by_user RENAME TO meta",
+        f"ALTER TABLE reviews ADD COLUMN user_id TEXT NOT NULL DEFAULT '{DEFAULT_USER}'",
+        "CREATE INDEX idx_reviews_user ON reviews(user_id, reviewed_at)",
+    ),
+)
+
+CARD_COLUMNS = ("repetitions", "ease_factor", "interval", "mastery", "last_review")
+
+
+def new_card() -> dict[str, Any]:
+    """Hiç çalışılmamış kartın başlangıç durumu."""
+    return {"repetitions": 0, "ease_factor": 2.5, "interval": 1, "mastery": "new"}
+
+
+def due_date(last_review: str, interval: int) -> str:
+    """Sonraki tekrar günü (YYYY-MM-DD); ay/yıl taşmaları timedelta ile doğru."""
+    return (datetime.fromisoformat(last_review[:10]) + timedelta(days=interval)).date().isoformat()
+
+
+def apply_sm2(card: dict[str, Any], rating: str, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+    """SM-2 ile kartın yeni durumunu hesapla (girdi değiştirilmez)."""
+    params = {**SM2_DEFAULTS, **(params or {})}
+    card = dict(card)
+    quality = QUALITY.get(rating, 3)
+
+    if quality < 3:
+        card["repetitions"] = 0
+        card["interval"] = 1
+    else:
+        if card["repetitions"] == 0:
+            card["interval"] = params["first_interval"]
+        elif card["repetitions"] == 1:
+            card["interval"] = params["second_interval"]
+        else:
+            card["interval"] = int(card["interval"] * card["ease_factor"] * params["interval_modifier"])
+            if params["max_interval"]:
+                card["interval"] = min(card["interval"], params["max_interval"])
+
+        card["repetitions"] += 1
+
+    # Update ease factor
+    card["ease_factor"] = max(
+        params["min_ease"], card["ease_factor"] + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    )
+
+    # Update mastery
+    if card["repetitions"] == 0:
+        card["mastery"] = "new"
+    elif card["repetitions"] < 3:
+        card["mastery"] = "learning"
+    elif card["interval"] < 21:
+        card["mastery"] = "reviewing"
+    else:
+        card["mastery"] = "mastered"
+
+    return card
+
+
+def _checked_entries(reviews: Iterable[tuple]) -> list[tuple[str, str, str]]:
+    """(card_id, rating, reviewed_at) kayıtları; geçersiz ilk kayıtta ValueError."""
+    now = datetime.now().isoformat()
+    entries = []
+    for review in reviews:
+        card_id, rating, *rest = review
+        reviewed_at = (rest[0] if rest else None) or now
+        if not card_id or rating not in QUALITY:
+            raise ValueError(f"Geçersiz kayıt: {review!r} (puanlar: {', '.join(QUALITY)})")
+        try:
+            datetime.fromisoformat(reviewed_at)
+        except (TypeError, ValueError):
+            raise ValueError(f"Geçersiz tekrar zamanı: {review!r} (ISO 8601 bekleniyor)") from None
+        entries.append((card_id, rating, reviewed_at))
+    return entries
+
+
+class UserProgress:
+    """Bir kullanıcının bellekteki kart tablosu + yazılmayı bekleyen tekrarlar."""
+
+    def __init__(self, store: "ProgressStore", user_id: str):
+        self.store = store
+        self.user_id = user_id
+        self._cards: dict[str, dict[str, Any]] = {}
+        self._load()
+        # (card_id, rating, reviewed_at, interval, ease_factor)
+        self._pending: list[tuple[str, str, str, int, float]] = []
+        self._first_pending = 0.0
+        self._timer: Optional[threading.Timer] = None
+
+    def _load(self):
+        rows = self.store._query("SELECT * FROM cards WHERE user_id = ?", (self.user_id,))
+        self._cards = {row["card_id"]: ProgressStore._card_from_row(row) for row in rows}
+        self.params = {**SM2_DEFAULTS, **self.store._meta(self.user_id, "sm2_params", {})}
+
+    # ----- okuma -----
+
+    def card(self, card_id: str) -> Optional[dict[str, Any]]:
+        with self.store._lock:
+            card = self._cards.get(card_id)
+            return dict(card) if card else None
+
+    def cards(self) -> dict[str, dict[str, Any]]:
+        """Tüm kartlar (card_id -> durum)."""
+        with self.store._lock:
+            return {card_id: dict(card) for card_id, card in self._cards.items()}
+
+    def due_cards(self, limit: int = 20, today: Optional[str] = None) -> list[dict[str, Any]]:
+        """En çok geciken önce, günü gelmiş kartlar ((user_id, next_due) indeksi üzerinde)."""
+        self.flush()
+        today = today or datetime.now().date().isoformat()
+        rows = self.store._query(
+            "SELECT card_id, mastery, next_due FROM cards "
+            "WHERE user_id = ? AND next_due <= ? ORDER BY next_due, card_id LIMIT ?",
+            (self.user_id, today, limit),
+        )
+        today_date = datetime.fromisoformat(today).date()
+        return [
+            {
+                "id": row["card_id"],
+                "mastery": row["mastery"],
+                "next_due": row["next_due"],
+                "days_overdue": (today_date - datetime.fromisoformat(row["next_due"]).date()).days,
+            }
+            for row in rows
+        ]
+
+    def due_count(self, today: Optional[str] = None) -> int:
+        """Günü gelmiş toplam kart sayısı."""
+        self.flush()
+        today = today or datetime.now().date().isoformat()
+        rows = self.store._query(
+            "SELECT COUNT(*) AS n FROM cards WHERE user_id = ? AND next_due <= ?", (self.user_id, today)
+        )
+        return rows[0]["n"]
+
+    def meta(self, key: str, default: Any = None) -> Any:
+        self.flush()
+        return self.store._meta(self.user_id, key, default)
+
+    def stats(self) -> dict[str, Any]:
+        """Ustalık seviyelerine göre kart sayıları ve genel bilgiler."""
+        counts = dict.fromkeys(MASTERY_LEVELS, 0)
+        with self.store._lock:
+            for card in self._cards.values():
+                counts[card["mastery"]] = counts.get(card["mastery"], 0) + 1
+        total = sum(counts.values())
+        return {
+            "total_cards": total,
+            "mastered": counts["mastered"],
+            "learning": counts["learning"],
+            "reviewing": counts["reviewing"],
+            "new": total - counts["mastered"] - counts["learning"] - counts["reviewing"],
+            "streak": self.meta("streak", 0),
+            "total_reviews": self.meta("total_reviews", 0),
+            "last_study": self.meta("last_study"),
+        }
+
+    # ----- yazma -----
+
+    def record_review(self, card_id: str, rating: str, reviewed_at: Optional[str] = None) -> dict[str, Any]:
+        """Bir tekrarı bellekte uygula; yazma bir sonraki toplu işleme kalır."""
+        return self.record_reviews([(card_id, rating, reviewed_at)], flush=False)[0]
+
+    def record_reviews(self, reviews: Iterable[tuple], flush: bool = True) -> list[dict[str, Any]]:
+        """
+        (card_id, rating[, reviewed_at]) listesini sırayla uygula; flush=True
+        ise hepsi tek işlemde hemen yazılır. Kartların yeni durumlarını döndürür.
+
+        Geçersiz bir kayıt (bilinmeyen puan, ISO olmayan zaman) ValueError
+        verir ve hiçbir kayıt uygulanmaz.
+        """
+        with self.store._lock:
+            current = self.store._users.get(self.user_id)
+            if current is None:
+                # Önbellekten düşmüş ama hâlâ kullanılan örnek: güncel durumu okuyup geri al
+                self._load()
+                self.store._adopt(self)
+            elif current is not self:
+                return current.record_reviews(reviews, flush)
+
+            # Önce tümünü doğrula: hatalı bir kayıt kısmi uygulama bırakmaz
+            entries = _checked_entries(reviews)
+
+            results = []
+            for card_id, rating, reviewed_at in entries:
+                card = apply_sm2(self._cards.get(card_id) or new_card(), rating, self.params)
+                card["last_review"] = reviewed_at
+                self._cards[card_id] = card
+                if not self._pending:
+                    self._first_pending = time.monotonic()
+                self._pending.append((card_id, rating, reviewed_at, card["interval"], card["ease_factor"]))
+                results.append(dict(card))
+
+            if (flush or len(self._pending) >= self.store.batch_size
+                    or time.monotonic() - self._first_pending >= self.store.flush_interval):
+                self.flush()
+            elif self._pending and self._timer is None:
+                # Başka tekrar gelmese de bekleyenler flush_interval içinde yazılır
+                self._timer = threading.Timer(self.store.flush_interval, self._flush_later)
+                self._timer.daemon = True
+                self._timer.start()
+        return results
+
+    def flush(self) -> int:
+        """
+        Bekleyen tekrarları tek işlemde yaz; yazılan tekrar sayısını döndürür.
+        Yazma başarısız olursa tekrarlar bekleyenlerde kalır (sonraki flush'ta yeniden denenir).
+        """
+        with self.store._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return 0
+            pending = list(self._pending)
+            changed = dict.fromkeys(card_id for card_id, *_ in pending)
+
+            with self.store._transaction() as conn:
+                for card_id in changed:
+                    self.store._write_card(self.user_id, card_id, self._cards[card_id])
+                conn.executemany(
+                    "INSERT INTO reviews (user_id, card_id, rating, reviewed_at, interval, ease_factor) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(self.user_id, *row) for row in pending],
+                )
+                conn.execute(
+                    "INSERT INTO meta (user_id, key, value) VALUES (?, 'total_reviews', ?) "
+                    "ON CONFLICT(user_id, key) DO UPDATE SET value = CAST(value AS INTEGER) + excluded.value",
+                    (self.user_id, len(pending)),
+                )
+                # Geriye tarihli bir toplu kayıt son çalışma gününü geri almaz
+                last_study = max(row[2] for row in pending)[:10]
+                stored = self.store._meta(self.user_id, "last_study")
+                self.store._set_meta(self.user_id, "last_study", max(last_study, stored) if stored else last_study)
+            # Yalnızca COMMIT'ten sonra: bu arada eklenenler bekleyenlerde kalır
+            del self._pending[:len(pending)]
+            return len(pending)
+
+    def _flush_later(self):
+        """Zamanlayıcı iş parçacığından flush; hata yutulmaz, stderr'e yazılır."""
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"progress_store: {self.user_id} tekrarları yazılamadı, bekliyor: {e}", file=sys.stderr)
+
+    def update_cards(self, cards: dict[str, dict[str, Any]], params: Optional[dict[str, Any]] = None) -> int:
+        """
+        Kart durumlarını (ör. yeniden planlama sonrası) ve istenirse SM-2
+        parametrelerini tek işlemde yaz; günlüğe kayıt eklenmez.
+        """
+        with self.store._lock:
+            self.flush()
+            with self.store._transaction():
+                for card_id, card in cards.items():
+                    self._cards[card_id] = {**self._cards.get(card_id, new_card()), **card}
+                    self.store._write_card(self.user_id, card_id, self._cards[card_id])
+                if params is not None:
+                    self.params = {**SM2_DEFAULTS, **params}
+                    self.store._set_meta(self.user_id, "sm2_params", self.params)
+            return len(cards)
+
+
+class ProgressStore:
+    """Kullanıcı bölümlü kart durumu + tekrar günlüğü (SQLite, WAL)."""
+
+    def __init__(self, path: Path = DB_FILE, legacy_file: Optional[Path] = LEGACY_FILE,
+                 cache_size: int = 256, batch_size: int = 32, flush_interval: float = 2.0):
+        self.path = Path(path)
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._users: OrderedDict[str, UserProgress] = OrderedDict()
+        # isolation_level=None: işlemler BEGIN IMMEDIATE ile elle açılır
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+        if legacy_file is not None:
+            self._import_legacy(Path(legacy_file))
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._users.clear()
+            self._conn.close()
+
+    # ----- kullanıcılar -----
+
+    def user(self, user_id: str = DEFAULT_USER) -> UserProgress:
+        """Kullanıcının kart tablosu (LRU önbellekten; düşen kullanıcı önce yazılır)."""
+        with self._lock:
+            learner = self._users.get(user_id)
+            if learner is not None:
+                self._users.move_to_end(user_id)
+                return learner
+
+            return self._adopt(UserProgress(self, user_id))
+
+    def _adopt(self, learner: UserProgress) -> UserProgress:
+        """Kullanıcıyı LRU'ya ekle; sınır aşılırsa en eskileri yazıp çıkar."""
+        with self._lock:
+            self._users[learner.user_id] = learner
+            while len(self._users) > self.cache_size:
+                # Önce yaz, sonra çıkar: yazma başarısız olursa kullanıcı önbellekte kalır
+                next(iter(self._users.values())).flush()
+                self._users.popitem(last=False)
+            return learner
+
+    def users(self) -> list[str]:
+        """Kartı olan kullanıcılar."""
+        self.flush()
+        return [row["user_id"] for row in self._query("SELECT DISTINCT user_id FROM cards ORDER BY user_id")]
+
+    def flush(self) -> int:
+        """Önbellekteki tüm kullanıcıların bekleyen tekrarlarını yaz."""
+        with self._lock:
+            return sum(learner.flush() for learner in list(self._users.values()))
+
+    # Tek kullanıcılı kısayollar (user_id verilmezse varsayılan kullanıcı)
+
+    def card(self, card_id: str, user_id: str = DEFAULT_USER) -> Optional[dict[str, Any]]:
+        return self.user(user_id).card(card_id)
+
+    def cards(self, user_id: str = DEFAULT_USER) -> dict[str, dict[str, Any]]:
+        return self.user(user_id).cards()
+
+    def due_cards(self, limit: int = 20, today: Optional[str] = None,
+                  user_id: str = DEFAULT_USER) -> list[dict[str, Any]]:
+        return self.user(user_id).due_cards(limit, today)
+
+    def due_count(self, today: Optional[str] = None, user_id: str = DEFAULT_USER) -> int:
+        return self.user(user_id).due_count(today)
+
+    def meta(self, key: str, default: Any = None, user_id: str = DEFAULT_USER) -> Any:
+        return self.user(user_id).meta(key, default)
+
+    def stats(self, user_id: str = DEFAULT_USER) -> dict[str, Any]:
+        return self.user(user_id).stats()
+
+    def record_review(self, card_id: str, rating: str, reviewed_at: Optional[str] = None,
+                      user_id: str = DEFAULT_USER) -> dict[str, Any]:
+        return self.user(user_id).record_review(card_id, rating, reviewed_at)
+
+    def record_reviews(self, reviews: Iterable[tuple], user_id: str = DEFAULT_USER) -> list[dict[str, Any]]:
+        return self.user(user_id).record_reviews(reviews)
+
+    # ----- bakım -----
+
+    def compact(self, keep_days: Optional[int] = None) -> dict[str, int]:
+        """
+        WAL'ı ana dosyaya aktar ve sıfırla; keep_days verilirse daha eski
+        günlük kayıtlarını sil (kart durumları etkilenmez).
+        """
+        removed = 0
+        with self._lock:
+            self.flush()
+            if keep_days is not None:
+                cutoff = (datetime.now() - timedelta(days=keep_days)).isoformat()
+                with self._transaction():
+                    removed = self._conn.execute("DELETE FROM reviews WHERE reviewed_at < ?", (cutoff,)).rowcount
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.execute("VACUUM")
+        return {"removed_reviews": removed, "size_bytes": self.path.stat().st_size}
+
+    def export_json(self, path: Path = LEGACY_FILE, user_id: str = DEFAULT_USER):
+        """Bir kullanıcının ilerlemesini learning_progress.json biçiminde yaz."""
+        learner = self.user(user_id)
+        progress = {
+            "cards": learner.cards(),
+            "streak": learner.meta("streak", 0),
+            "last_study": learner.meta("last_study"),
+            "total_reviews": learner.meta("total_reviews", 0),
+        }
+        tmp_path = Path(path).with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(progress, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    # ----- yardımcılar -----
+
+    def _query(self, sql: str, params: tuple = ()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _transaction(self):
+        return _Transaction(self._conn, self._lock)
+
+    def _migrate(self):
+        """Eksik şema adımlarını sırayla uygula."""
+        with self._transaction():
+            # Sürüm yazma kilidi alındıktan sonra okunur (başka süreç geçirmiş olabilir)
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            for statements in MIGRATIONS[version:]:
+                for sql in statements:
+                    self._conn.execute(sql)
+            self._conn.execute(f"PRAGMA user_version = {len(MIGRATIONS)}")
+
+    @staticmethod
+    def _card_from_row(row: sqlite3.Row) -> dict[str, Any]:
+        card = {key: row[key] for key in CARD_COLUMNS}
+        if card["last_review"] is None:
+            del card["last_review"]
+        return card
+
+    def _write_card(self, user_id: str, card_id: str, card: dict[str, Any]):
+        last_review = card.get("last_review")
+        self._conn.execute(
+            "INSERT INTO cards (user_id, card_id, repetitions, ease_factor, interval, mastery, last_review, next_due) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(user_id, card_id) DO UPDATE SET repetitions = excluded.repetitions, "
+            "ease_factor = excluded.ease_factor, interval = excluded.interval, "
+            "mastery = excluded.mastery, last_review = excluded.last_review, next_due = excluded.next_due",
+            (user_id, card_id, card["repetitions"], card["ease_factor"], card["interval"],
+             card["mastery"], last_review, due_date(last_review, card["interval"]) if last_review else None),
+        )
+
+    def _meta(self, user_id: str, key: str, default: Any = None) -> Any:
+        rows = self._query("SELECT value FROM meta WHERE user_id = ? AND key = ?", (user_id, key))
+        return json.loads(rows[0]["value"]) if rows else default
+
+    def _set_meta(self, user_id: str, key: str, value: Any):
+        self._conn.execute(
+            "INSERT INTO meta (user_id, key, value) VALUES (?, ?, ?) "
+            "ON CONFLICT(user_id, key) DO UPDATE SET value = excluded.value",
+            (user_id, key, json.dumps(value)),
+        )
+
+    def _import_legacy(self, legacy_file: Path):
+        """Eski JSON ilerleme dosyasını (bir kez) varsayılan kullanıcıya aktar."""
+        if self._meta(DEFAULT_USER, "legacy_imported") or not legacy_file.exists():
+            return
+        try:
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                progress = json.load(f) or {}
+        except (OSError, ValueError):
+            return
+
+        with self._transaction():
+            for card_id, data in progress.get("cards", {}).items():
+                self._write_card(DEFAULT_USER, card_id, {**new_card(), **data})
+            for key in ("streak", "total_reviews", "last_study"):
+                if progress.get(key) is not None:
+                    self._set_meta(DEFAULT_USER, key, progress[key])
+            self._set_meta(DEFAULT_USER, "legacy_imported", True)
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK (yazma kilidi en başta alınır)."""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.RLock):
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock.acquire()
+        self._conn.execute("BEGIN IMMEDIATE")
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+
+
+_store: Optional[ProgressStore] = None
+_store_lock = threading.Lock()
+
+
+def get_progress_store() -> ProgressStore:
+    """Süreç genelinde tek depo örneği (çıkışta bekleyen tekrarlar yazılır)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ProgressStore()
+            atexit.register(_store.flush)
+        return _store
+
+
+def main():
+    store = get_progress_store()
+    args = sys.argv[1:]
+
+    user_id = DEFAULT_USER
+    if "--user" in args:
+        i = args.index("--user")
+        if i + 1 < len(args):
+            user_id = args[i + 1]
+        del args[i:i + 2]
+
+    if args and args[0] == "--compact":
+        result = store.compact()
+        print(f"Sıkıştırıldı: {store.path} ({result['size_bytes']:,} bayt)")
+        return
+    if args and args[0] == "--export":
+        store.export_json(user_id=user_id)
+        print(f"Dışa aktarıldı: {LEGACY_FILE} ({user_id})")
+        return
+    if args and args[0] == "--users":
+        for uid in store.users():
+            print(uid)
+        return
+
+    print(f"Veritabanı: {store.path}")
+    print(f"Kullanıcı: {user_id}")
+    print(json.dumps(store.stats(user_id=user_id), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
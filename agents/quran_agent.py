@@ -11,7 +11,6 @@ import asyncio
 import json
 import os
 import sys
-from pathlib import Path
 from typing import Any
 
 # Agent SDK imports
@@ -25,20 +24,11 @@ from claude_agent_sdk import (
     ToolUseBlock
 )
 
-# Data paths
-DATA_DIR = Path(__file__).parent.parent / "src" / "data"
-QURAN_DIR = DATA_DIR / "quran"
-QURAN_MASTER_DIR = DATA_DIR / "quran-master"
-LEARNING_DIR = DATA_DIR / "learning"
-
-
-def load_json(file_path: Path) -> Any:
-    """JSON dosyası yükle."""
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return None
+# Shared corpus store (data paths + cached JSON loading)
+from corpus_store import QURAN_MASTER_DIR, load_json
+from verse_index import get_verse_index
+from text_index import get_search_index
+import vocabulary
 
 
 # ============= QURAN TOOLS =============
@@ -54,48 +44,17 @@ async def get_verse(args: dict[str, Any]) -> dict[str, Any]:
     ayah = args["ayah"]
 
     try:
-        arabic = load_json(QURAN_DIR / "quran_arabic.json") or []
-        turkish = load_json(QURAN_DIR / "quran_turkish.json") or []
-        english = load_json(QURAN_DIR / "quran_english.json") or []
-        haleem = load_json(QURAN_DIR / "quran_haleem.json") or {}
-        clearquran = load_json(QURAN_DIR / "quran_clearquran.json") or {}
-        studyquran = load_json(QURAN_DIR / "quran_studyquran.json") or {}
-
-        # Arabic text
-        surah_data = next((s for s in arabic if s.get("id") == surah), None)
-        arabic_text = ""
-        if surah_data:
-            verse = next((v for v in surah_data.get("verses", []) if v.get("id") == ayah), None)
-            arabic_text = verse.get("text", "") if verse else ""
-
-        # Turkish
-        turkish_text = ""
-        tr_surah = next((s for s in turkish if s.get("id") == surah), None)
-        if tr_surah:
-            tr_verse = next((v for v in tr_surah.get("verses", []) if v.get("id") == ayah), None)
-            turkish_text = tr_verse.get("translation", "") if tr_verse else ""
-
-        # English
-        english_text = ""
-        en_surah = next((s for s in english if s.get("id") == surah), None)
-        if en_surah:
-            en_verse = next((v for v in en_surah.get("verses", []) if v.get("id") == ayah), None)
-            english_text = en_verse.get("translation", "") if en_verse else ""
-
-        # Flat format translations
-        haleem_text = haleem.get(str(surah), {}).get(str(ayah), "")
-        clearquran_text = clearquran.get(str(surah), {}).get(str(ayah), "")
-        studyquran_text = studyquran.get(str(surah), {}).get(str(ayah), "")
+        row = get_verse_index().get(surah, ayah) or {}
 
         result = {
             "verse_key": f"{surah}:{ayah}",
-            "arabic": arabic_text,
+            "arabic": row.get("arabic", ""),
             "translations": {
-                "turkish_diyanet": turkish_text,
-                "english_sahih": english_text,
-                "english_haleem": haleem_text,
-                "english_clearquran": clearquran_text,
-                "english_studyquran": studyquran_text,
+                "turkish_diyanet": row.get("turkish_diyanet", ""),
+                "english_sahih": row.get("english_sahih", ""),
+                "english_haleem": row.get("english_haleem", ""),
+                "english_clearquran": row.get("english_clearquran", ""),
+                "english_studyquran": row.get("english_studyquran", ""),
             }
         }
 
@@ -114,56 +73,45 @@ async def get_verse(args: dict[str, Any]) -> dict[str, Any]:
 
 @tool(
     "search_quran",
-    "Kur'an'da anahtar kelime araması yapar",
-    {"query": str, "limit": int}
+    "Kur'an'da anahtar kelime araması yapar (Arapça/Türkçe/İngilizce). "
+    "Boşluk = VE, OR = VEYA, \"ifade\" = ardışık kelimeler, kelime* = önek. "
+    "mode: 'ranked' (alaka skoruna göre, varsayılan) veya 'mushaf' (mushaf sırası)",
+    {"query": str, "limit": int, "mode": str}
 )
 async def search_quran(args: dict[str, Any]) -> dict[str, Any]:
     """Kur'an'da arama yap."""
-    query = args["query"].lower()
+    query = args["query"]
     limit = args.get("limit", 10)
+    mode = args.get("mode") or "ranked"
 
     try:
-        arabic = load_json(QURAN_DIR / "quran_arabic.json") or []
-        turkish = load_json(QURAN_DIR / "quran_turkish.json") or []
-        english = load_json(QURAN_DIR / "quran_english.json") or []
-
-        results = []
+        index = get_verse_index()
+        search_index = get_search_index()
 
-        for surah in arabic:
-            surah_id = surah.get("id")
-            tr_surah = next((s for s in turkish if s.get("id") == surah_id), {})
-            en_surah = next((s for s in english if s.get("id") == surah_id), {})
-
-            for verse in surah.get("verses", []):
-                ayah_id = verse.get("id")
-
-                tr_verse = next((v for v in tr_surah.get("verses", []) if v.get("id") == ayah_id), {})
-                en_verse = next((v for v in en_surah.get("verses", []) if v.get("id") == ayah_id), {})
-
-                search_text = " ".join([
-                    verse.get("text", ""),
-                    tr_verse.get("translation", ""),
-                    en_verse.get("translation", ""),
-                ]).lower()
-
-                if query in search_text:
-                    results.append({
-                        "verse_key": f"{surah_id}:{ayah_id}",
-                        "arabic": verse.get("text", ""),
-                        "turkish": tr_verse.get("translation", ""),
-                        "english": en_verse.get("translation", ""),
-                    })
+        if mode == "mushaf":
+            hits = [(doc_id, None) for doc_id in search_index.search(query)[:limit]]
+        else:
+            mode = "ranked"
+            hits = search_index.rank(query, limit)
 
-                    if len(results) >= limit:
-                        break
+        results = []
 
-            if len(results) >= limit:
-                break
+        for doc_id, score in hits:
+            row = index.get(*search_index.keys[doc_id])
+            result = {
+                "verse_key": row["verse_key"],
+                "arabic": row["arabic"],
+                "turkish": row["turkish_diyanet"],
+                "english": row["english_sahih"],
+            }
+            if score is not None:
+                result["score"] = round(score, 3)
+            results.append(result)
 
         return {
             "content": [{
                 "type": "text",
-                "text": json.dumps({"count": len(results), "results": results}, ensure_ascii=False, indent=2)
+                "text": json.dumps({"mode": mode, "count": len(results), "results": results}, ensure_ascii=False, indent=2)
             }]
         }
     except Exception as e:
@@ -239,34 +187,30 @@ async def get_vocabulary(args: dict[str, Any]) -> dict[str, Any]:
     limit = args.get("limit", 20)
 
     try:
-        if category == "words":
-            data = load_json(LEARNING_DIR / "words_300.json")
-        elif category == "twogram":
-            data = load_json(LEARNING_DIR / "twogram.json")
-        elif category == "threegram":
-            data = load_json(LEARNING_DIR / "threegram.json")
-        else:
+        vocab = vocabulary.get_vocabulary()
+        if category not in vocab.items:
             return {
                 "content": [{"type": "text", "text": "Geçersiz kategori. Seçenekler: words, twogram, threegram"}],
                 "is_error": True
             }
 
-        if not data:
+        items = vocab.top(category, limit)
+        if not items:
             return {
                 "content": [{"type": "text", "text": "Veri bulunamadı"}],
                 "is_error": True
             }
 
-        items = list(data.values())[:limit] if isinstance(data, dict) else data[:limit]
+        result = {"category": category, "count": len(items)}
+        if category == "words":
+            # Bu kelimeler bilindiğinde metnin anlaşılan yüzdesi
+            result["coverage_percent"] = round(100 * vocab.coverage_at(len(items)), 1)
+        result["items"] = items
 
         return {
             "content": [{
                 "type": "text",
-                "text": json.dumps({
-                    "category": category,
-                    "count": len(items),
-                    "items": items
-                }, ensure_ascii=False, indent=2)
+                "text": json.dumps(result, ensure_ascii=False, indent=2)
             }]
         }
     except Exception as e:
@@ -284,14 +228,15 @@ async def get_vocabulary(args: dict[str, Any]) -> dict[str, Any]:
 async def get_surah_list(args: dict[str, Any]) -> dict[str, Any]:
     """Sure listesi getir."""
     try:
-        arabic = load_json(QURAN_DIR / "quran_arabic.json") or []
+        index = get_verse_index()
 
         surahs = []
-        for s in arabic:
+        for surah_id in sorted(index.surahs):
+            info = index.surahs[surah_id]
             surahs.append({
-                "number": s.get("id"),
-                "name": s.get("name"),
-                "verse_count": len(s.get("verses", []))
+                "number": surah_id,
+                "name": info["name"],
+                "verse_count": info["verse_count"]
             })
 
         return {
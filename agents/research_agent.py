@@ -19,7 +19,6 @@ import asyncio
 import json
 import sys
 import re
-from pathlib import Path
 from typing import Any, List, Dict
 from collections import Counter
 
@@ -32,18 +31,13 @@ from claude_agent_sdk import (
     TextBlock,
 )
 
-# Paths
-DATA_DIR = Path(__file__).parent.parent / "src" / "data"
-QURAN_DIR = DATA_DIR / "quran"
-LEARNING_DIR = DATA_DIR / "learning"
-
-
-def load_json(file_path: Path) -> Any:
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return None
+# Paths + cached JSON loading
+from corpus_store import QURAN_DIR, load_json
+from verse_index import get_verse_index
+from text_index import get_search_index
+from similarity_index import BASES as SIMILARITY_BASES, get_similarity_matrix
+from root_index import get_root_index
+from vocabulary import get_vocabulary
 
 
 # Sure bilgileri
@@ -73,62 +67,53 @@ THEMES = {
 
 @tool(
     "search_by_theme",
-    "Belirli bir tema/konu ile ilgili ayetleri arar",
-    {"theme": str, "limit": int}
+    "Belirli bir tema/konu ile ilgili ayetleri arar. "
+    "mode: 'ranked' (alaka skoruna göre, varsayılan) veya 'mushaf' (mushaf sırası)",
+    {"theme": str, "limit": int, "mode": str}
 )
 async def search_by_theme(args: dict[str, Any]) -> dict[str, Any]:
     """Tematik arama yap."""
     theme = args["theme"].lower()
     limit = args.get("limit", 20)
+    mode = args.get("mode") or "ranked"
 
     # Tema anahtar kelimelerini bul
     keywords = THEMES.get(theme, [theme])
 
     results = []
 
-    # Tüm çevirilerde ara
-    arabic = load_json(QURAN_DIR / "quran_arabic.json") or []
-    turkish = load_json(QURAN_DIR / "quran_turkish.json") or []
-    english = load_json(QURAN_DIR / "quran_english.json") or []
-
-    for surah in arabic:
-        surah_id = surah.get("id")
-        tr_surah = next((s for s in turkish if s.get("id") == surah_id), {})
-        en_surah = next((s for s in english if s.get("id") == surah_id), {})
-
-        for verse in surah.get("verses", []):
-            ayah_id = verse.get("id")
-            tr_verse = next((v for v in tr_surah.get("verses", []) if v.get("id") == ayah_id), {})
-            en_verse = next((v for v in en_surah.get("verses", []) if v.get("id") == ayah_id), {})
-
-            # Tüm metinleri birleştir
-            all_text = " ".join([
-                verse.get("text", ""),
-                tr_verse.get("translation", ""),
-                en_verse.get("translation", "")
-            ]).lower()
-
-            # Anahtar kelime kontrolü
-            for keyword in keywords:
-                if keyword.lower() in all_text:
-                    results.append({
-                        "verse_key": f"{surah_id}:{ayah_id}",
-                        "arabic": verse.get("text", "")[:100],
-                        "turkish": tr_verse.get("translation", "")[:150],
-                        "matched_keyword": keyword
-                    })
-                    break
+    # Tüm dillerde ara (ters indeks üzerinden): anahtar kelimelerden herhangi biri.
+    # Kelimeler önek olarak aranır (iman* -> imanı, believe* -> believers)
+    index = get_verse_index()
+    search_index = get_search_index()
+    queries = [f"{keyword}*" for keyword in keywords]
+    keyword_docs = [(keyword, set(search_index.search(q))) for keyword, q in zip(keywords, queries)]
+    matched = set().union(*(docs for _, docs in keyword_docs))
 
-            if len(results) >= limit:
-                break
-        if len(results) >= limit:
-            break
+    if mode == "mushaf":
+        hits = [(doc_id, None) for doc_id in sorted(matched)[:limit]]
+    else:
+        mode = "ranked"
+        hits = search_index.rank(" OR ".join(queries), limit, docs=matched)
+
+    for doc_id, score in hits:
+        row = index.get(*search_index.keys[doc_id])
+        result = {
+            "verse_key": row["verse_key"],
+            "arabic": row["arabic"][:100],
+            "turkish": row["turkish_diyanet"][:150],
+            "matched_keyword": next(k for k, docs in keyword_docs if doc_id in docs)
+        }
+        if score is not None:
+            result["score"] = round(score, 3)
+        results.append(result)
 
     return {
         "content": [{
             "type": "text",
             "text": json.dumps({
                 "theme": theme,
+                "mode": mode,
                 "keywords_used": keywords,
                 "count": len(results),
                 "results": results
@@ -180,22 +165,24 @@ async def get_quran_statistics(args: dict[str, Any]) -> dict[str, Any]:
 
     elif stat_type in ["word", "kelime"]:
         # Kelime frekansı
-        words_data = load_json(LEARNING_DIR / "words_300.json")
-        if words_data:
-            items = list(words_data.values()) if isinstance(words_data, dict) else words_data
-            top_words = sorted(items, key=lambda x: x.get("frequency", 0), reverse=True)[:20]
-
+        vocab = get_vocabulary()
+        top_words = vocab.top("words", 20)
+        if top_words:
             return {
                 "content": [{
                     "type": "text",
                     "text": json.dumps({
                         "description": "En sık kullanılan 20 kelime",
+                        "total_words": vocab.total_tokens,
                         "words": [{
                             "arabic": w.get("arabic"),
                             "frequency": w.get("frequency"),
                             "meaning_tr": w.get("translations", {}).get("tr"),
                             "meaning_en": w.get("translations", {}).get("en")
-                        } for w in top_words]
+                        } for w in top_words],
+                        # İlk N kelime bilindiğinde metnin anlaşılan yüzdesi
+                        "coverage": vocab.curve(),
+                        "forms_for_50_percent": vocab.words_for_coverage(0.5)
                     }, ensure_ascii=False, indent=2)
                 }]
             }
@@ -227,56 +214,56 @@ async def get_quran_statistics(args: dict[str, Any]) -> dict[str, Any]:
 
 @tool(
     "find_similar_verses",
-    "Benzer ayetleri bulur (aynı kelime kökü veya tema)",
-    {"surah": int, "ayah": int}
+    "Benzer ayetleri bulur (ortak kelime/kök sayısına göre). "
+    "basis: 'words' (kelime, varsayılan), 'stems' (harekesiz kök), 'roots' (Arapça kök)",
+    {"surah": int, "ayah": int, "basis": str}
 )
 async def find_similar_verses(args: dict[str, Any]) -> dict[str, Any]:
     """Benzer ayetleri bul."""
     surah = args["surah"]
     ayah = args["ayah"]
+    basis = args.get("basis") or "words"
+
+    if basis not in SIMILARITY_BASES:
+        return {
+            "content": [{"type": "text", "text": f"Geçersiz taban. Seçenekler: {', '.join(SIMILARITY_BASES)}"}],
+            "is_error": True
+        }
 
     # Hedef ayeti al
-    arabic = load_json(QURAN_DIR / "quran_arabic.json") or []
-    surah_data = next((s for s in arabic if s.get("id") == surah), None)
+    index = get_verse_index()
 
-    if not surah_data:
+    if not index.surah(surah):
         return {"content": [{"type": "text", "text": "Sure bulunamadı"}], "is_error": True}
 
-    target_verse = next((v for v in surah_data.get("verses", []) if v.get("id") == ayah), None)
+    target_verse = index.get(surah, ayah)
 
     if not target_verse:
         return {"content": [{"type": "text", "text": "Ayet bulunamadı"}], "is_error": True}
 
-    target_text = target_verse.get("text", "")
-    target_words = set(target_text.split())
-
-    # Benzer ayetleri bul (ortak kelime sayısına göre)
-    similar = []
-
-    for s in arabic:
-        for v in s.get("verses", []):
-            if s.get("id") == surah and v.get("id") == ayah:
-                continue
+    matrix = get_similarity_matrix(basis)
 
-            verse_words = set(v.get("text", "").split())
-            common = target_words & verse_words
+    if matrix is None:
+        return {"content": [{"type": "text", "text": "Kök verisi bulunamadı (quran-master)"}], "is_error": True}
 
-            if len(common) >= 3:  # En az 3 ortak kelime
-                similar.append({
-                    "verse_key": f"{s.get('id')}:{v.get('id')}",
-                    "common_words": len(common),
-                    "text_preview": v.get("text", "")[:100]
-                })
+    # Benzer ayetleri bul (ortak kelime sayısına göre, en az 3 ortak kelime)
+    similar = []
 
-    # En çok ortak kelimesi olanları sırala
-    similar.sort(key=lambda x: x["common_words"], reverse=True)
+    for doc_id, common in matrix.top_similar(matrix.doc_ids[(surah, ayah)], k=10, min_common=3):
+        row = index.get(*matrix.keys[doc_id])
+        similar.append({
+            "verse_key": row["verse_key"],
+            "common_words": common,
+            "text_preview": row["arabic"][:100]
+        })
 
     return {
         "content": [{
             "type": "text",
             "text": json.dumps({
                 "target_verse": f"{surah}:{ayah}",
-                "similar_verses": similar[:10]
+                "basis": basis,
+                "similar_verses": similar
             }, ensure_ascii=False, indent=2)
         }]
     }
@@ -318,19 +305,21 @@ async def compare_surahs(args: dict[str, Any]) -> dict[str, Any]:
     surah1 = args["surah1"]
     surah2 = args["surah2"]
 
-    arabic = load_json(QURAN_DIR / "quran_arabic.json") or []
+    index = get_verse_index()
 
-    s1_data = next((s for s in arabic if s.get("id") == surah1), None)
-    s2_data = next((s for s in arabic if s.get("id") == surah2), None)
+    s1_data = index.surah(surah1)
+    s2_data = index.surah(surah2)
 
     if not s1_data or not s2_data:
         return {"content": [{"type": "text", "text": "Sure bulunamadı"}], "is_error": True}
 
-    def analyze_surah(data):
-        verses = data.get("verses", [])
+    s1_verses = index.surah_verses(surah1)
+    s2_verses = index.surah_verses(surah2)
+
+    def analyze_surah(data, verses):
         all_words = []
         for v in verses:
-            all_words.extend(v.get("text", "").split())
+            all_words.extend(v["arabic"].split())
 
         return {
             "name": data.get("name"),
@@ -341,17 +330,17 @@ async def compare_surahs(args: dict[str, Any]) -> dict[str, Any]:
         }
 
     comparison = {
-        "surah_1": {"number": surah1, **analyze_surah(s1_data)},
-        "surah_2": {"number": surah2, **analyze_surah(s2_data)},
+        "surah_1": {"number": surah1, **analyze_surah(s1_data, s1_verses)},
+        "surah_2": {"number": surah2, **analyze_surah(s2_data, s2_verses)},
     }
 
     # Ortak kelimeler
     words1 = set()
     words2 = set()
-    for v in s1_data.get("verses", []):
-        words1.update(v.get("text", "").split())
-    for v in s2_data.get("verses", []):
-        words2.update(v.get("text", "").split())
+    for v in s1_verses:
+        words1.update(v["arabic"].split())
+    for v in s2_verses:
+        words2.update(v["arabic"].split())
 
     comparison["common_unique_words"] = len(words1 & words2)
 
@@ -363,6 +352,40 @@ async def compare_surahs(args: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+@tool(
+    "get_root_occurrences",
+    "Bir Arapça kökün Kur'an'daki tüm geçişlerini getirir (kök, Latin kök veya kelime verilebilir)",
+    {"root": str, "limit": int}
+)
+async def get_root_occurrences(args: dict[str, Any]) -> dict[str, Any]:
+    """Kök geçişlerini getir."""
+    query = args["root"].strip()
+    limit = args.get("limit", 50)
+
+    root_index = get_root_index()
+
+    if root_index is None:
+        return {"content": [{"type": "text", "text": "Kök verisi bulunamadı (quran-master)"}], "is_error": True}
+
+    root = root_index.resolve(query)
+
+    if not root:
+        return {"content": [{"type": "text", "text": f"Kök bulunamadı: {query}"}], "is_error": True}
+
+    return {
+        "content": [{
+            "type": "text",
+            "text": json.dumps({
+                "root": root,
+                "root_latin": root_index.root_latin.get(root, ""),
+                "total_occurrences": root_index.occurrence_count(root),
+                "verse_count": len(root_index.verses_of(root)),
+                "occurrences": root_index.occurrences(root, limit)
+            }, ensure_ascii=False, indent=2)
+        }]
+    }
+
+
 # ============= AGENT SETUP =============
 
 research_server = create_sdk_mcp_server(
@@ -373,7 +396,8 @@ research_server = create_sdk_mcp_server(
         get_quran_statistics,
         find_similar_verses,
         get_available_themes,
-        compare_surahs
+        compare_surahs,
+        get_root_occurrences
     ]
 )
 
@@ -398,6 +422,7 @@ SYSTEM_PROMPT = """Sen Kur'an araştırmaları konusunda uzmanlaşmış bir asis
 - find_similar_verses: Benzer ayetler
 - get_available_themes: Mevcut temalar
 - compare_surahs: Sure karşılaştırma
+- get_root_occurrences: Bir kökün tüm geçişleri
 
 ## Önemli:
 - Verileri doğru yorumla
@@ -417,6 +442,7 @@ class ResearchAgent:
                 "mcp__research__find_similar_verses",
                 "mcp__research__get_available_themes",
                 "mcp__research__compare_surahs",
+                "mcp__research__get_root_occurrences",
             ],
             permission_mode="acceptEdits",
             system_prompt=SYSTEM_PROMPT,
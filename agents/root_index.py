@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Root Index - quran-master kelime verisinden kök -> geçiş yerleri indeksi.
+
+scripts/convert-quran-master.py çıktısındaki (surah-NNN.json) her kelimenin
+rootArabic/root alanlarından bir kez kurulur:
+- kök -> geçişler (ayet, kelime sırası, kelime, zamanlama)
+- kelime (harekesiz, kelime içi elifler düşürülmüş) -> kök(ler)
+
+Geçişler köke göre sıralı sütunlar (array) olarak tutulur; her kök bu
+sütunlarda bir dilimdir. İndeks agents/.cache altında saklanır ve yalnızca
+quran-master dosyaları değiştiğinde 114 dosya yeniden taranır.
+
+Kullanım:
+    from root_index import get_root_index
+
+    index = get_root_index()          # quran-master verisi yoksa None
+    index.occurrences("رحم")
+    index.roots_of("الرحمن")
+"""
+
+import json
+import os
+import pickle
+from array import array
+from pathlib import Path
+from typing import Any, Optional
+
+from corpus_store import QURAN_MASTER_DIR, corpus, file_signature
+from text_index import fold_alef, normalize_arabic
+
+CACHE_DIR = Path(__file__).parent / ".cache"
+INDEX_FILE = CACHE_DIR / "root_index.pickle"
+INDEX_VERSION = 2
+SURAH_COUNT = 114
+
+
+def master_paths() -> list[Path]:
+    """quran-master sure dosyaları."""
+    return [QURAN_MASTER_DIR / f"surah-{str(i).zfill(3)}.json" for i in range(1, SURAH_COUNT + 1)]
+
+
+class RootIndex:
+    """Kök -> geçişler (sütunlu) ve kelime -> kök eşlemesi."""
+
+    def __init__(self):
+        self.version = INDEX_VERSION
+        self.signature: tuple = ()
+        # Kök tablosu: kök -> (başlangıç, bitiş) dilimi
+        self.root_slices: dict[str, tuple[int, int]] = {}
+        self.root_latin: dict[str, str] = {}
+        # Geçiş sütunları (köke göre sıralı)
+        self.surah = array("B")
+        self.ayah = array("H")
+        self.word_rank = array("H")
+        self.surface_id = array("I")
+        self.start_ms = array("I")
+        self.end_ms = array("I")
+        # Kelime tablosu
+        self.surfaces: list[str] = []
+        self.surface_roots: dict[str, tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.surah)
+
+    def occurrence_count(self, root: str) -> int:
+        start, end = self.root_slices.get(root, (0, 0))
+        return end - start
+
+    def occurrences(self, root: str, limit: Optional[int] = None) -> list[dict[str, Any]]:
+        """Bir kökün Kur'an'daki tüm geçişleri (mushaf sırasıyla)."""
+        start, end = self.root_slices.get(root, (0, 0))
+        if limit is not None:
+            end = min(end, start + limit)
+        return [{
+            "verse_key": f"{self.surah[i]}:{self.ayah[i]}",
+            "word_rank": self.word_rank[i],
+            "arabic": self.surfaces[self.surface_id[i]],
+            "start_ms": self.start_ms[i],
+            "end_ms": self.end_ms[i],
+        } for i in range(start, end)]
+
+    def verses_of(self, root: str) -> list[tuple[int, int]]:
+        """Kökün geçtiği ayetler (tekrarsız, mushaf sırasıyla)."""
+        start, end = self.root_slices.get(root, (0, 0))
+        return sorted({(self.surah[i], self.ayah[i]) for i in range(start, end)})
+
+    def roots_of(self, word: str) -> tuple[str, ...]:
+        """Bir kelimenin (harekeli veya harekesiz) kök(ler)i."""
+        return self.surface_roots.get(fold_alef(normalize_arabic(word)), ())
+
+    def resolve(self, query: str) -> Optional[str]:
+        """Arapça kök, Latin kök veya kelimeden kökü bul."""
+        if query in self.root_slices:
+            return query
+        for root, latin in self.root_latin.items():
+            if latin == query:
+                return root
+        roots = self.roots_of(query)
+        return roots[0] if roots else None
+
+    def verse_roots(self) -> dict[tuple[int, int], list[str]]:
+        """Ayet -> köklerin listesi (benzerlik matrisi için)."""
+        result: dict[tuple[int, int], list[str]] = {}
+        for root, (start, end) in self.root_slices.items():
+            for i in range(start, end):
+                result.setdefault((self.surah[i], self.ayah[i]), []).append(root)
+        return result
+
+    def top_roots(self, limit: int = 20) -> list[tuple[str, int]]:
+        """En sık geçen kökler."""
+        counts = [(root, end - start) for root, (start, end) in self.root_slices.items()]
+        counts.sort(key=lambda x: x[1], reverse=True)
+        return counts[:limit]
+
+
+def build_root_index() -> Optional[RootIndex]:
+    """114 sure dosyasını bir kez tarayarak indeksi kur (veri yoksa None)."""
+    rows: list[tuple[str, int, int, int, int, int, int]] = []
+    root_latin: dict[str, str] = {}
+    surface_ids: dict[str, int] = {}
+    surface_roots: dict[str, dict[str, int]] = {}
+    found = False
+
+    for path in master_paths():
+        # Paylaşılan önbelleğe almadan oku: tam kelime verisi bellekte tutulmaz
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                surah_data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        found = True
+        surah_id = surah_data.get("surahId") or int(path.stem.split("-")[1])
+        for verse in surah_data.get("verses", []):
+            ayah_id = verse.get("verseNumber", 0)
+            for word in verse.get("words", []):
+                root = word.get("rootArabic") or ""
+                if not root:
+                    continue
+                if word.get("root"):
+                    root_latin.setdefault(root, word["root"])
+                surface = word.get("arabic", "")
+                sid = surface_ids.setdefault(surface, len(surface_ids))
+                counts = surface_roots.setdefault(fold_alef(normalize_arabic(surface)), {})
+                counts[root] = counts.get(root, 0) + 1
+                rows.append((root, surah_id, ayah_id, word.get("wordRank", 0), sid,
+                             word.get("startTime") or 0, word.get("endTime") or 0))
+
+    if not found:
+        return None
+
+    # Köke, sonra mushaf sırasına göre sırala
+    rows.sort()
+
+    index = RootIndex()
+    index.root_latin = root_latin
+    index.surfaces = list(surface_ids)
+    index.surface_roots = {
+        surface: tuple(sorted(counts, key=counts.get, reverse=True))
+        for surface, counts in surface_roots.items()
+    }
+
+    current, start = None, 0
+    for i, (root, surah_id, ayah_id, rank, sid, start_ms, end_ms) in enumerate(rows):
+        if root != current:
+            if current is not None:
+                index.root_slices[current] = (start, i)
+            current, start = root, i
+        index.surah.append(surah_id)
+        index.ayah.append(ayah_id)
+        index.word_rank.append(rank)
+        index.surface_id.append(sid)
+        index.start_ms.append(start_ms)
+        index.end_ms.append(end_ms)
+    if current is not None:
+        index.root_slices[current] = (start, len(rows))
+
+    return index
+
+
+def _load_or_build() -> Optional[RootIndex]:
+    signature = tuple(file_signature(p) for p in master_paths())
+    if not any(signature):
+        return None
+
+    try:
+        with open(INDEX_FILE, "rb") as f:
+            index = pickle.load(f)
+        if index.version == INDEX_VERSION and index.signature == signature:
+            return index
+    except Exception:
+        pass
+
+    index = build_root_index()
+    if index is None:
+        return None
+    index.signature = signature
+
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        tmp_file = INDEX_FILE.with_suffix(".tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, INDEX_FILE)
+    except OSError:
+        pass
+
+    return index
+
+
+def get_root_index() -> Optional[RootIndex]:
+    """Önbellekteki kök indeksi (quran-master verisi yoksa None)."""
+    return corpus.derive("root_index", master_paths(), _load_or_build)
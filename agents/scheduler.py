@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Scheduler - NumPy dizileri üzerinde vektörel SM-2 planlayıcı.
+
+Bir kullanıcının tüm kartları sütun dizilerine (tekrar sayısı, kolaylık
+katsayısı, aralık, son tekrar / sonraki tekrar günü) yazılır; SM-2 güncellemesi
+aynı gün tekrar edilen tüm kartlara tek seferde uygulanır. Böylece:
+
+- forecast(): önümüzdeki N gün için günlük tekrar sayısı (her gün, günü gelen
+  kartlar hatırlama oranına göre good/again ile tekrar edilmiş sayılır)
+- reschedule(): SM-2 parametreleri değişince tüm kartların aralık ve tekrar
+  günleri tek geçişte yeniden hesaplanır
+
+progress_store.apply_sm2 ile aynı kuralları uygular (varsayılan parametrelerle
+sonuçlar birebir aynıdır).
+
+Kullanım:
+    from scheduler import Deck, forecast_workload
+
+    deck = Deck.from_cards(get_progress_store().user("ayse").cards())
+    deck.forecast(days=90)                    # günlük tekrar sayıları (np.ndarray)
+
+    python scheduler.py --user ayse --days 90
+    python scheduler.py --user ayse --reschedule interval_modifier=0.8 min_ease=1.5
+"""
+
+import json
+import sys
+from datetime import date, datetime, timedelta
+from typing import Any, Optional
+
+import numpy as np
+
+from progress_store import DEFAULT_USER, MASTERY_LEVELS, QUALITY, SM2_DEFAULTS, UserProgress, get_progress_store
+
+GOOD = QUALITY["good"]
+AGAIN = QUALITY["again"]
+
+
+def _params(params: Optional[dict[str, Any]]) -> dict[str, Any]:
+    return {**SM2_DEFAULTS, **(params or {})}
+
+
+class Deck:
+    """Kartların SM-2 durumu (sütun dizileri; günler bugüne göre gün farkı)."""
+
+    def __init__(self, ids: list[str], repetitions: np.ndarray, ease: np.ndarray,
+                 interval: np.ndarray, last_day: np.ndarray, today: date):
+        self.ids = ids
+        self.today = today
+        self.repetitions = repetitions
+        self.ease = ease
+        self.interval = interval
+        # Hiç tekrar edilmemiş kartlar planlanmaz
+        self.scheduled = last_day != np.iinfo(np.int64).min
+        self.last_day = np.where(self.scheduled, last_day, 0)
+        self.due = self.last_day + interval
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_cards(cls, cards: dict[str, dict[str, Any]], today: Optional[date] = None) -> "Deck":
+        """card_id -> durum sözlüğünden (UserProgress.cards())."""
+        today = today or datetime.now().date()
+        ids = list(cards)
+        states = [cards[card_id] for card_id in ids]
+        last_review = np.array(
+            [(state.get("last_review") or "NaT")[:10] for state in states], dtype="datetime64[D]"
+        )
+        last_day = (last_review - np.datetime64(today, "D")).astype(np.int64)
+        return cls(
+            ids,
+            np.array([state["repetitions"] for state in states], dtype=np.int64),
+            np.array([state["ease_factor"] for state in states], dtype=np.float64),
+            np.array([state["interval"] for state in states], dtype=np.int64),
+            last_day,
+            today,
+        )
+
+    def copy(self) -> "Deck":
+        deck = Deck.__new__(Deck)
+        deck.ids = self.ids
+        deck.today = self.today
+        for name in ("repetitions", "ease", "interval", "scheduled", "last_day", "due"):
+            setattr(deck, name, getattr(self, name).copy())
+        return deck
+
+    def mastery(self) -> np.ndarray:
+        """Kart başına MASTERY_LEVELS indeksi."""
+        return np.select(
+            [self.repetitions == 0, self.repetitions < 3, self.interval < 21],
+            [0, 1, 2],
+            default=3,
+        )
+
+    def review(self, idx: np.ndarray, quality: np.ndarray, day: int = 0,
+               params: Optional[dict[str, Any]] = None):
+        """idx kartlarını verilen kalite puanlarıyla `day` gününde tekrar et (yerinde)."""
+        p = _params(params)
+        reps = self.repetitions[idx]
+        ease = self.ease[idx]
+        fail = quality < 3
+
+        grown = np.floor(self.interval[idx] * ease * p["interval_modifier"]).astype(np.int64)
+        if p["max_interval"]:
+            grown = np.minimum(grown, p["max_interval"])
+        interval = np.where(reps == 0, p["first_interval"], np.where(reps == 1, p["second_interval"], grown))
+
+        self.interval[idx] = np.where(fail, 1, interval)
+        self.repetitions[idx] = np.where(fail, 0, reps + 1)
+        q = 5 - quality
+        self.ease[idx] = np.maximum(p["min_ease"], ease + (0.1 - q * (0.08 + q * 0.02)))
+        self.last_day[idx] = day
+        self.scheduled[idx] = True
+        self.due[idx] = day + self.interval[idx]
+
+    def forecast(self, days: int = 90, retention: float = 0.9, seed: int = 0,
+                 params: Optional[dict[str, Any]] = None) -> np.ndarray:
+        """
+        Önümüzdeki `days` gün için günlük tekrar sayıları. Gecikmiş kartlar
+        bugüne sayılır; her tekrar `retention` olasılıkla good, yoksa again.
+        """
+        deck = self.copy()
+        rng = np.random.default_rng(seed)
+        counts = np.zeros(days, dtype=np.int64)
+        for day in range(days):
+            idx = np.flatnonzero(deck.scheduled & (deck.due <= day))
+            counts[day] = len(idx)
+            if len(idx):
+                quality = np.where(rng.random(len(idx)) < retention, GOOD, AGAIN)
+                deck.review(idx, quality, day, params)
+        return counts
+
+    def reschedule(self, old_params: Optional[dict[str, Any]], new_params: dict[str, Any]) -> np.ndarray:
+        """
+        Parametre değişikliğini tüm kartlara uygula (yerinde): ilk iki aralık
+        yeni değerlerine, sonrakiler interval_modifier oranında ölçeklenir,
+        kolaylık katsayısı yeni alt sınıra çekilir. Değişen kartların maskesi.
+        """
+        old, new = _params(old_params), _params(new_params)
+        before = (self.interval.copy(), self.ease.copy())
+
+        scaled = np.maximum(1, np.floor(self.interval * (new["interval_modifier"] / old["interval_modifier"])))
+        scaled = scaled.astype(np.int64)
+        if new["max_interval"]:
+            scaled = np.minimum(scaled, new["max_interval"])
+        self.interval = np.select(
+            [self.repetitions == 0, self.repetitions == 1, self.repetitions == 2],
+            [self.interval, new["first_interval"], new["second_interval"]],
+            default=scaled,
+        ).astype(np.int64)
+        self.ease = np.maximum(self.ease, new["min_ease"])
+        self.due = self.last_day + self.interval
+
+        return (self.interval != before[0]) | (self.ease != before[1])
+
+    def to_cards(self, mask: Optional[np.ndarray] = None) -> dict[str, dict[str, Any]]:
+        """Seçilen kartların durumları (progress_store biçiminde)."""
+        indices = np.flatnonzero(mask) if mask is not None else np.arange(len(self))
+        mastery = self.mastery()
+        return {
+            self.ids[i]: {
+                "repetitions": int(self.repetitions[i]),
+                "ease_factor": float(self.ease[i]),
+                "interval": int(self.interval[i]),
+                "mastery": MASTERY_LEVELS[mastery[i]],
+            }
+            for i in indices
+        }
+
+
+def forecast_workload(progress: UserProgress, days: int = 90, retention: float = 0.9) -> dict[str, Any]:
+    """Bir kullanıcının önümüzdeki günlerdeki tekrar yükü."""
+    deck = Deck.from_cards(progress.cards())
+    counts = deck.forecast(days, retention, params=progress.params)
+    peak = int(np.argmax(counts)) if days else 0
+    return {
+        "start_date": deck.today.isoformat(),
+        "days": days,
+        "retention": retention,
+        "cards": int(deck.scheduled.sum()),
+        "total_reviews": int(counts.sum()),
+        "average_per_day": round(float(counts.mean()), 1) if days else 0.0,
+        "peak": {
+            "date": (deck.today + timedelta(days=peak)).isoformat(),
+            "reviews": int(counts[peak]) if days else 0,
+        },
+        "daily": counts.tolist(),
+    }
+
+
+def reschedule(progress: UserProgress, **changes) -> int:
+    """SM-2 parametrelerini değiştir ve tüm kartları yeniden planla (tek işlem)."""
+    unknown = set(changes) - set(SM2_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Geçersiz parametre: {', '.join(sorted(unknown))}. Seçenekler: {', '.join(SM2_DEFAULTS)}")
+
+    new_params = {**progress.params, **changes}
+    deck = Deck.from_cards(progress.cards())
+    changed = deck.reschedule(progress.params, new_params)
+    return progress.update_cards(deck.to_cards(changed), params=new_params)
+
+
+def main():
+    args = sys.argv[1:]
+    user_id = DEFAULT_USER
+    days = 90
+
+    if "--user" in args:
+        i = args.index("--user")
+        user_id = args[i + 1]
+        del args[i:i + 2]
+    if "--days" in args:
+        i = args.index("--days")
+        days = int(args[i + 1])
+        del args[i:i + 2]
+
+    progress = get_progress_store().user(user_id)
+
+    if args and args[0] == "--reschedule":
+        changes = {}
+        for item in args[1:]:
+            key, _, value = item.partition("=")
+            changes[key] = None if value.lower() == "none" else float(value) if "." in value else int(value)
+        count = reschedule(progress, **changes)
+        print(f"{count} kart yeniden planlandı ({user_id})")
+        print(json.dumps(progress.params, ensure_ascii=False, indent=2))
+        return
+
+    print(json.dumps(forecast_workload(progress, days), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Similarity Index - Ayet x token seyrek (CSR) matrisi ile benzer ayet bulma.
+
+Her ayet, içerdiği benzersiz token'ların ikili satırıdır. Bir ayete benzer
+ayetler tek bir seyrek matris-vektör çarpımı (ortak token sayısı) ve en iyi
+k için argpartition ile bulunur. Tüm ayetler için benzerlik grafiği bir kez
+hesaplanıp önbelleğe alınabilir.
+
+Token tabanları:
+- words: Arapça metnin boşlukla ayrılmış kelimeleri (harekeli, olduğu gibi)
+- stems: text_index ile normalize edilmiş kökler (hareke/önek/sonek atılmış)
+- roots: quran-master kelime verisindeki kökler (root_index üzerinden)
+
+Kullanım:
+    from similarity_index import get_similarity_matrix
+
+    matrix = get_similarity_matrix("words")
+    matrix.top_similar(doc_id, k=10, min_common=3)
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from corpus_store import corpus
+from root_index import get_root_index, master_paths
+from text_index import tokenize
+from verse_index import get_verse_index, source_paths as verse_source_paths
+
+BASES = ("words", "stems", "roots")
+
+
+class VerseTokenMatrix:
+    """CSR biçiminde ikili ayet x token matrisi (ve hızlı sütun erişimi için CSC)."""
+
+    def __init__(self, keys: list[tuple[int, int]], rows: list[list[str]]):
+        self.keys = keys
+        self.doc_ids = {key: i for i, key in enumerate(keys)}
+
+        vocabulary: dict[str, int] = {}
+        indptr = [0]
+        indices: list[int] = []
+        for tokens in rows:
+            cols = {vocabulary.setdefault(t, len(vocabulary)) for t in tokens}
+            indices.extend(sorted(cols))
+            indptr.append(len(indices))
+
+        self.vocabulary = vocabulary
+        self.shape = (len(keys), len(vocabulary))
+
+        # CSR
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.row_of_nnz = np.repeat(np.arange(len(keys), dtype=np.int32), np.diff(self.indptr))
+
+        # CSC (M^T) - tüm çiftler hesabında satır başına yalnızca ilgili sütunlar
+        order = np.argsort(self.indices, kind="stable")
+        self.col_rows = self.row_of_nnz[order]
+        self.col_indptr = np.zeros(self.shape[1] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=self.shape[1]), out=self.col_indptr[1:])
+
+    def row(self, doc_id: int) -> np.ndarray:
+        """Ayetin token sütunları."""
+        return self.indices[self.indptr[doc_id]:self.indptr[doc_id + 1]]
+
+    def common_counts(self, doc_id: int) -> np.ndarray:
+        """Tüm ayetlerin hedef ayetle ortak token sayısı (M @ x)."""
+        x = np.zeros(self.shape[1], dtype=np.int32)
+        x[self.row(doc_id)] = 1
+        return np.bincount(self.row_of_nnz, weights=x[self.indices], minlength=self.shape[0]).astype(np.int32)
+
+    def _common_counts_csc(self, doc_id: int) -> np.ndarray:
+        """common_counts ile aynı sonuç; yalnızca hedefin sütunlarını dolaşır."""
+        starts = self.col_indptr[self.row(doc_id)]
+        ends = self.col_indptr[self.row(doc_id) + 1]
+        rows = np.concatenate([self.col_rows[s:e] for s, e in zip(starts, ends)]) if len(starts) else self.col_rows[:0]
+        return np.bincount(rows, minlength=self.shape[0])
+
+    @staticmethod
+    def _top_k(counts: np.ndarray, doc_id: int, k: int, min_common: int) -> list[tuple[int, int]]:
+        counts[doc_id] = 0
+        candidates = np.flatnonzero(counts >= min_common)
+        if len(candidates) > k:
+            # k. en büyük değere eşit olanları da al, sonra sıralamada mushaf sırası korunur
+            kth = np.partition(counts[candidates], len(candidates) - k)[len(candidates) - k]
+            candidates = candidates[counts[candidates] >= kth]
+        ranked = sorted(candidates.tolist(), key=lambda d: (-counts[d], d))[:k]
+        return [(d, int(counts[d])) for d in ranked]
+
+    def top_similar(self, doc_id: int, k: int = 10, min_common: int = 3) -> list[tuple[int, int]]:
+        """En çok ortak token'a sahip k ayet: [(ayet_no, ortak_sayı)]."""
+        return self._top_k(self.common_counts(doc_id), doc_id, k, min_common)
+
+    def similarity_graph(self, k: int = 10, min_common: int = 3) -> dict[int, list[tuple[int, int]]]:
+        """Tüm ayetler için benzer ayet listesi (komşuluk listesi)."""
+        graph = {}
+        for doc_id in range(self.shape[0]):
+            neighbours = self._top_k(self._common_counts_csc(doc_id), doc_id, k, min_common)
+            if neighbours:
+                graph[doc_id] = neighbours
+        return graph
+
+
+def build_similarity_matrix(basis: str) -> Optional[VerseTokenMatrix]:
+    """Verilen token tabanıyla matrisi kur (kök verisi yoksa None)."""
+    index = get_verse_index()
+    keys = list(index.order)
+
+    if basis == "words":
+        rows = [row["arabic"].split() for row in index]
+    elif basis == "stems":
+        rows = [tokenize("ar", row["arabic"]) for row in index]
+    elif basis == "roots":
+        root_index = get_root_index()
+        if root_index is None:
+            return None
+        verse_roots = root_index.verse_roots()
+        rows = [verse_roots.get(key, []) for key in keys]
+    else:
+        raise ValueError(f"Geçersiz taban: {basis}. Seçenekler: {', '.join(BASES)}")
+
+    return VerseTokenMatrix(keys, rows)
+
+
+def get_similarity_matrix(basis: str = "words") -> Optional[VerseTokenMatrix]:
+    """Önbellekteki matris (kaynaklar değiştiyse yeniden kurulur)."""
+    sources = verse_source_paths() + (master_paths() if basis == "roots" else [])
+    return corpus.derive(f"similarity_matrix:{basis}", sources, lambda: build_similarity_matrix(basis))
+
+
+def get_similarity_graph(basis: str = "words", k: int = 10, min_common: int = 3) -> dict[int, list[tuple[int, int]]]:
+    """Tüm ayetler için benzerlik grafiği (bir kez hesaplanır)."""
+    sources = verse_source_paths() + (master_paths() if basis == "roots" else [])
+
+    def build():
+        matrix = get_similarity_matrix(basis)
+        return matrix.similarity_graph(k, min_common) if matrix else {}
+
+    return corpus.derive(f"similarity_graph:{basis}:{k}:{min_common}", sources, build)
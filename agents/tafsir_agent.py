@@ -17,7 +17,6 @@ Kullanım:
 import asyncio
 import json
 import sys
-from pathlib import Path
 from typing import Any, Optional
 
 from claude_agent_sdk import (
@@ -30,18 +29,9 @@ from claude_agent_sdk import (
     ToolUseBlock
 )
 
-# Paths
-DATA_DIR = Path(__file__).parent.parent / "src" / "data"
-QURAN_DIR = DATA_DIR / "quran"
-
-
-def load_json(file_path: Path) -> Any:
-    """JSON dosyası yükle."""
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return None
+# Paths + cached JSON loading
+from corpus_store import DATA_DIR, QURAN_DIR, load_json
+from verse_index import TRANSLATION_LABELS, get_verse_index
 
 
 # ============= TAFSIR TOOLS =============
@@ -58,32 +48,26 @@ async def get_verse_with_context(args: dict[str, Any]) -> dict[str, Any]:
     context_size = args.get("context_size", 2)
 
     try:
-        arabic = load_json(QURAN_DIR / "quran_arabic.json") or []
-        turkish = load_json(QURAN_DIR / "quran_turkish.json") or []
+        index = get_verse_index()
 
-        surah_data = next((s for s in arabic if s.get("id") == surah), None)
+        surah_data = index.surah(surah)
         if not surah_data:
             return {"content": [{"type": "text", "text": "Sure bulunamadı"}], "is_error": True}
 
-        verses = surah_data.get("verses", [])
-        tr_surah = next((s for s in turkish if s.get("id") == surah), {})
-        tr_verses = tr_surah.get("verses", [])
-
         # Context range
         start_ayah = max(1, ayah - context_size)
-        end_ayah = min(len(verses), ayah + context_size)
+        end_ayah = min(surah_data["verse_count"], ayah + context_size)
 
         context_verses = []
         for i in range(start_ayah, end_ayah + 1):
-            verse = next((v for v in verses if v.get("id") == i), None)
-            tr_verse = next((v for v in tr_verses if v.get("id") == i), None)
+            verse = index.get(surah, i)
 
             if verse:
                 context_verses.append({
                     "verse_key": f"{surah}:{i}",
                     "is_target": i == ayah,
-                    "arabic": verse.get("text", ""),
-                    "turkish": tr_verse.get("translation", "") if tr_verse else ""
+                    "arabic": verse["arabic"],
+                    "turkish": verse["turkish_diyanet"]
                 })
 
         return {
@@ -173,8 +157,7 @@ async def get_surah_info(args: dict[str, Any]) -> dict[str, Any]:
         }
     else:
         # Temel bilgi
-        arabic = load_json(QURAN_DIR / "quran_arabic.json") or []
-        surah_data = next((s for s in arabic if s.get("id") == surah), None)
+        surah_data = get_verse_index().surah(surah)
 
         if surah_data:
             return {
@@ -183,7 +166,7 @@ async def get_surah_info(args: dict[str, Any]) -> dict[str, Any]:
                     "text": json.dumps({
                         "surah_number": surah,
                         "name": surah_data.get("name", ""),
-                        "verses": len(surah_data.get("verses", []))
+                        "verses": surah_data["verse_count"]
                     }, ensure_ascii=False, indent=2)
                 }]
             }
@@ -204,33 +187,13 @@ async def compare_translations(args: dict[str, Any]) -> dict[str, Any]:
     try:
         translations = {}
 
-        # Tüm çevirileri yükle
-        files = {
-            "Turkish (Diyanet)": "quran_turkish.json",
-            "English (Sahih)": "quran_english.json",
-            "English (Haleem)": "quran_haleem.json",
-            "English (Clear Quran)": "quran_clearquran.json",
-            "English (Study Quran)": "quran_studyquran.json",
-        }
+        # Tüm çeviriler ayet indeksinde birleştirilmiş durumda
+        row = get_verse_index().get(surah, ayah) or {}
 
-        for name, filename in files.items():
-            data = load_json(QURAN_DIR / filename)
-            if not data:
-                continue
-
-            # Array format
-            if isinstance(data, list):
-                surah_data = next((s for s in data if s.get("id") == surah), None)
-                if surah_data:
-                    verse = next((v for v in surah_data.get("verses", []) if v.get("id") == ayah), None)
-                    if verse:
-                        translations[name] = verse.get("translation", "")
-
-            # Flat format
-            elif isinstance(data, dict):
-                text = data.get(str(surah), {}).get(str(ayah), "")
-                if text:
-                    translations[name] = text
+        for name, field in TRANSLATION_LABELS.items():
+            text = row.get(field, "")
+            if text:
+                translations[name] = text
 
         return {
             "content": [{
@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Text Index - Kur'an araması için ters indeks (token -> ayet listesi).
+
+Her dil için ayrı indeks tutulur:
+- ar: Arapça (Uthmani) metin; harekeler/tecvid işaretleri silinir, elif
+      türleri birleştirilir (dagger elif -> ا, الصلوٰة -> الصلاة), yaygın
+      ön/son ekler (و، ال، بال، ين، ون...) atılır ve kelime içi elifler
+      düşürülür; düz yazımlı sorgular aynı token'lara iner
+- tr: Diyanet meali; Türkçe büyük/küçük harf dönüşümü (İ/ı), şapkalı harfler
+      sadeleştirilir, kesme işaretinden sonraki ek atılır; 3+ harfli terimler
+      önek olarak eşleşir (sabır -> sabırlı, sabırla...)
+- en: Sahih International; basit İngilizce kök bulma (patients -> patient)
+
+Sorgu dili:
+    sabır namaz          -> VE (her iki terim de geçmeli)
+    sabır OR namaz       -> VEYA (| de kullanılabilir)
+    "doğru yol"          -> ifade (ardışık terimler)
+    merhamet*            -> önek araması
+
+Sıralı mod (rank) eşleşen ayetleri BM25 skoruna göre döndürür; en iyi k
+sonuç tüm eşleşmeler sıralanmadan bir heap ile seçilir.
+
+İndeks diskte (agents/.cache) saklanır ve yalnızca kaynak dosyalar
+değiştiğinde yeniden kurulur.
+"""
+
+import heapq
+import math
+import os
+import pickle
+import re
+import sys
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from corpus_store import QURAN_DIR, corpus, file_signature
+from verse_index import LIST_SOURCES, get_verse_index
+
+CACHE_DIR = Path(__file__).parent / ".cache"
+INDEX_FILE = CACHE_DIR / "search_index.pickle"
+INDEX_VERSION = 3
+
+# Dil -> ayet satırındaki alan
+INDEXED_FIELDS = {
+    "ar": "arabic",
+    "tr": "turkish_diyanet",
+    "en": "english_sahih",
+}
+
+TOKEN_RE = re.compile(r"\w+")
+QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+# ============= NORMALIZATION =============
+
+# Harekeler, tecvid/vakf işaretleri, tatvil (dagger elif harf olarak kalır)
+ARABIC_MARKS_RE = re.compile("[\u0610-\u061A\u064B-\u065F\u06D6-\u06ED\u0640]")
+# Uthmani yazımda elif yerine vav: ٱلصَّلَوٰةَ / الصلوة -> الصلاة
+ARABIC_WAW_ALIF_RE = re.compile("و\u0670?ة")
+ARABIC_CHAR_MAP = str.maketrans({
+    "\u0670": "ا",  # dagger elif -> elif (ٱلْكِتَٰبُ -> الكتاب)
+    "ٱ": "ا",  # elif vasla -> elif
+    "أ": "ا",  # hemzeli elif -> elif
+    "إ": "ا",
+    "آ": "ا",  # medli elif -> elif
+    "ى": "ي",  # elif maksura -> ye
+    "ة": "ه",  # te merbuta -> he
+})
+ARABIC_PREFIXES = ("وال", "فال", "بال", "كال", "لل", "ال")
+# "ان"/"ات" yok: ek atılmadan önce kelime içindeki elifler düşürülür
+ARABIC_SUFFIXES = ("ها", "ون", "ين", "يه", "ه", "ي")
+
+TURKISH_CASE_MAP = str.maketrans({"I": "ı", "İ": "i"})
+TURKISH_CHAR_MAP = str.maketrans({"â": "a", "î": "i", "û": "u"})
+APOSTROPHE_SUFFIX_RE = re.compile(r"(\w)['’]\w*")
+
+TURKISH_PREFIX_MIN = 3
+
+# Normalizasyon regresyonları: (sorgu, dil, en az ayet sayısı) / (aynı sonucu vermesi gereken sorgular)
+REGRESSION_QUERIES = [
+    ("الصلاة", "ar", 50),          # ٱلصَّلَوٰةَ (vav + dagger elif)
+    ("الكتاب", "ar", 200),         # ٱلْكِتَٰبُ (dagger elif)
+    ('"رب العالمين"', "ar", 30),   # رَبِّ ٱلْعَٰلَمِينَ
+    ("الرحمن", "ar", 50),          # ٱلرَّحْمَٰنِ (düz yazımda elifsiz)
+]
+EQUIVALENT_QUERIES = [
+    (("believe", "believed", "believing"), "en"),
+    (("hope", "hoped"), "en"),
+    (("ibrahim", "İbrahim"), "tr"),
+]
+
+# BM25 parametreleri
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def normalize_arabic(text: str) -> str:
+    """
+    Harekeleri ve işaretleri sil, harf varyantlarını birleştir.
+
+    Uthmani metin ve düz yazımlı sorgular aynı biçime iner.
+    """
+    text = ARABIC_WAW_ALIF_RE.sub("اة", ARABIC_MARKS_RE.sub("", text))
+    return text.translate(ARABIC_CHAR_MAP)
+
+
+def fold_alef(token: str) -> str:
+    """
+    Kelime içindeki elifleri düşür (ilk ve son harf kalır).
+
+    Uthmani ve düz yazım farkları (الرحمن / ٱلرَّحْمَٰنِ, الكتاب / ٱلْكِتَٰبُ)
+    aynı biçime iner.
+    """
+    return token[0] + token[1:-1].replace("ا", "") + token[-1] if len(token) > 2 else token
+
+
+def stem_arabic(token: str, suffixes: bool = True) -> str:
+    """Hafif Arapça kök bulma (Light10 benzeri ön/son ek atma, elif katlama)."""
+    if len(token) >= 4 and token.startswith("و"):
+        token = token[1:]
+    for prefix in ARABIC_PREFIXES:
+        if token.startswith(prefix) and len(token) - len(prefix) >= 2:
+            token = token[len(prefix):]
+            break
+    token = fold_alef(token)
+    if not suffixes:
+        return token
+    for suffix in ARABIC_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+            token = token[:-len(suffix)]
+    return token
+
+
+def casefold_turkish(text: str) -> str:
+    """Türkçe'ye uygun küçük harfe çevirme (I -> ı, İ -> i)."""
+    return text.translate(TURKISH_CASE_MAP).lower().translate(TURKISH_CHAR_MAP)
+
+
+def stem_english(token: str) -> str:
+    """
+    Basit İngilizce kök bulma (çoğul, -ing, -ed).
+
+    Sondaki "e" her biçimde atılır: believe / believed / believing ve
+    hope / hoped aynı köke iner.
+    """
+    if len(token) <= 3:
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        token = token[:-3] + "y"
+    elif token.endswith("sses"):
+        token = token[:-2]
+    elif token.endswith(("ches", "shes", "xes", "zes")):
+        token = token[:-2]
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+    elif not token.endswith("eed"):
+        for suffix in ("ing", "ed"):
+            if token.endswith(suffix):
+                stem = token[:-len(suffix)]
+                if len(stem) >= 3 and re.search("[aeiouy]", stem):
+                    if len(stem) > 3 and stem[-1] == stem[-2] and stem[-1] not in "lsz":
+                        stem = stem[:-1]
+                    token = stem
+                break
+    if len(token) > 4 and token.endswith("eed"):  # agreed -> agree
+        token = token[:-1]
+    if len(token) > 3 and token.endswith("e") and not token.endswith("ee"):
+        token = token[:-1]
+    return token
+
+
+def tokenize(lang: str, text: str, stem: bool = True) -> list[str]:
+    """
+    Metni dile göre normalize edilmiş token listesine çevir.
+
+    stem=False önek sorguları içindir: son ekler atılmaz.
+    """
+    if lang == "ar":
+        return [stem_arabic(t, suffixes=stem) for t in TOKEN_RE.findall(normalize_arabic(text))]
+    if lang == "tr":
+        text = APOSTROPHE_SUFFIX_RE.sub(r"\1", casefold_turkish(text))
+        return TOKEN_RE.findall(text)
+    tokens = TOKEN_RE.findall(APOSTROPHE_SUFFIX_RE.sub(r"\1", text.lower()))
+    return [stem_english(t) for t in tokens] if stem else tokens
+
+
+# ============= INDEX =============
+
+class LanguageIndex:
+    """Tek dil için token -> {ayet_no: (pozisyonlar)} eşlemesi."""
+
+    def __init__(self, lang: str):
+        self.lang = lang
+        self.postings: dict[str, dict[int, tuple[int, ...]]] = {}
+        self.doc_lengths: list[int] = []
+        self._vocabulary: Optional[list[str]] = None
+        self._avg_doc_length: Optional[float] = None
+
+    def add(self, doc_id: int, tokens: list[str]):
+        positions: dict[str, list[int]] = {}
+        for pos, token in enumerate(tokens):
+            positions.setdefault(token, []).append(pos)
+        for token, pos_list in positions.items():
+            self.postings.setdefault(token, {})[doc_id] = tuple(pos_list)
+        self.doc_lengths.append(len(tokens))
+
+    @property
+    def vocabulary(self) -> list[str]:
+        """Sıralı token listesi (önek araması için)."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        return self._vocabulary
+
+    @property
+    def avg_doc_length(self) -> float:
+        if self._avg_doc_length is None:
+            self._avg_doc_length = sum(self.doc_lengths) / max(1, len(self.doc_lengths))
+        return self._avg_doc_length
+
+    def add_bm25_scores(self, postings: dict[int, tuple[int, ...]], docs: set[int], scores: dict[int, float]):
+        """Bir terimin BM25 katkısını docs içindeki ayetlere ekle."""
+        df = len(postings)
+        if not df:
+            return
+        n = len(self.doc_lengths)
+        idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        avgdl = self.avg_doc_length
+        lengths = self.doc_lengths
+        for doc, pos in postings.items():
+            if doc in docs:
+                tf = len(pos)
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc] / avgdl)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+    def expand(self, token: str, prefix: bool) -> list[str]:
+        """Terimin eşleştiği index token'ları."""
+        if not prefix:
+            return [token] if token in self.postings else []
+        vocab = self.vocabulary
+        matches = []
+        for i in range(bisect_left(vocab, token), len(vocab)):
+            if not vocab[i].startswith(token):
+                break
+            matches.append(vocab[i])
+        if self.lang == "en":
+            # İngilizce token'lar kök halinde: önekin kendi kökü de eşleşir (believe* -> believ)
+            stem = stem_english(token)
+            if stem != token and stem in self.postings:
+                matches.append(stem)
+        return matches
+
+    def term_postings(self, token: str, prefix: bool) -> dict[int, tuple[int, ...]]:
+        """Bir terimin (önek genişletilmiş) ayet -> pozisyonlar eşlemesi."""
+        tokens = self.expand(token, prefix)
+        if len(tokens) == 1:
+            return self.postings[tokens[0]]
+        merged: dict[int, tuple[int, ...]] = {}
+        for t in tokens:
+            for doc, pos in self.postings[t].items():
+                merged[doc] = merged.get(doc, ()) + pos
+        return merged
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_vocabulary"] = None
+        state["_avg_doc_length"] = None
+        return state
+
+
+class SearchIndex:
+    """Tüm diller için ters indeks; ayet numaraları mushaf sırasıdır."""
+
+    def __init__(self, keys: list[tuple[int, int]]):
+        self.version = INDEX_VERSION
+        self.signature: tuple = ()
+        self.keys = keys
+        self.languages: dict[str, LanguageIndex] = {}
+
+    def search(self, query: str, languages: Optional[Iterable[str]] = None) -> list[int]:
+        """Sorguyla eşleşen ayet numaraları (mushaf sırasıyla)."""
+        clauses = parse_query(query)
+        matched: set[int] = set()
+        for lang in (languages or self.languages):
+            index = self.languages.get(lang)
+            if index is None:
+                continue
+            for clause in clauses:
+                matched |= _evaluate_clause(index, clause)
+        return sorted(matched)
+
+    def rank(self, query: str, limit: int, languages: Optional[Iterable[str]] = None,
+             docs: Optional[set[int]] = None) -> list[tuple[int, float]]:
+        """
+        Sorguyla eşleşen ayetlerden BM25 skoru en yüksek `limit` tanesi.
+
+        Eşleşme kümesi search() ile aynıdır (docs verilirse onunla sınırlanır).
+        Her VE grubu yalnızca eşleştiği dillerde ve eşleştiği ayetlerde
+        skorlanır; böylece başka bir dilin tokenizer'ından çıkan parçalar
+        (ör. "İbrahim" -> "i", "brahim") sıralamayı etkilemez. Eşit
+        skorlarda mushaf sırası korunur.
+        """
+        if limit <= 0:
+            return []
+        clauses = parse_query(query)
+
+        scores: dict[int, float] = {}
+        for lang in (languages or self.languages):
+            index = self.languages.get(lang)
+            if index is None:
+                continue
+            for clause in clauses:
+                matched = _evaluate_clause(index, clause)
+                if docs is not None:
+                    matched &= docs
+                if not matched:
+                    continue
+                for kind, value in clause:
+                    words = value if kind == "phrase" else [value]
+                    for word in words:
+                        for token, prefix in _query_terms(lang, word):
+                            index.add_bm25_scores(index.term_postings(token, prefix), matched, scores)
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+
+
+def parse_query(query: str) -> list[list[tuple[str, Any]]]:
+    """
+    Sorguyu VEYA ile ayrılmış VE gruplarına böl.
+
+    Her terim ("term", kelime) ya da ("phrase", [kelimeler]) biçimindedir.
+    """
+    clauses: list[list[tuple[str, Any]]] = [[]]
+    for phrase, word in QUERY_RE.findall(query):
+        if word in ("OR", "|"):
+            if clauses[-1]:
+                clauses.append([])
+        elif phrase:
+            words = phrase.split()
+            if words:
+                clauses[-1].append(("phrase", words))
+        elif word:
+            clauses[-1].append(("term", word))
+    return [c for c in clauses if c]
+
+
+def _query_terms(lang: str, word: str) -> list[tuple[str, bool]]:
+    """Sorgu kelimesini (token, önek_mi) listesine çevir."""
+    prefix = word.endswith("*")
+    tokens = tokenize(lang, word.rstrip("*"), stem=not prefix)
+    if lang == "tr":
+        return [(t, prefix or len(t) >= TURKISH_PREFIX_MIN) for t in tokens]
+    return [(t, prefix) for t in tokens]
+
+
+def _evaluate_clause(index: LanguageIndex, clause: list[tuple[str, Any]]) -> set[int]:
+    """VE grubunu değerlendir: kesişim (kısa listeden başlayarak)."""
+    candidate_sets = []
+    for kind, value in clause:
+        words = value if kind == "phrase" else [value]
+        terms = [t for w in words for t in _query_terms(index.lang, w)]
+        if not terms:
+            continue
+        postings = [index.term_postings(token, prefix) for token, prefix in terms]
+        if any(not p for p in postings):
+            return set()
+        if kind == "phrase" and len(postings) > 1:
+            candidate_sets.append(_phrase_docs(postings))
+        else:
+            candidate_sets.extend(set(p) for p in postings)
+
+    if not candidate_sets:
+        return set()
+    candidate_sets.sort(key=len)
+    result = candidate_sets[0]
+    for s in candidate_sets[1:]:
+        result = result & s
+        if not result:
+            break
+    return result
+
+
+def _phrase_docs(postings: list[dict[int, tuple[int, ...]]]) -> set[int]:
+    """Terimlerin ardışık pozisyonlarda geçtiği ayetler."""
+    docs = set(postings[0])
+    for p in postings[1:]:
+        docs &= p.keys()
+    result = set()
+    for doc in docs:
+        for start in postings[0][doc]:
+            if all(start + i in p[doc] for i, p in enumerate(postings[1:], 1)):
+                result.add(doc)
+                break
+    return result
+
+
+# ============= BUILD / PERSIST =============
+
+def source_paths() -> list[Path]:
+    """İndekslenen kaynak dosyalar."""
+    return [QURAN_DIR / filename for filename, _ in LIST_SOURCES.values()]
+
+
+def build_search_index() -> SearchIndex:
+    """Ayet indeksinden ters indeksi kur."""
+    verses = get_verse_index()
+    index = SearchIndex(list(verses.order))
+    for lang in INDEXED_FIELDS:
+        index.languages[lang] = LanguageIndex(lang)
+
+    for doc_id, row in enumerate(verses):
+        for lang, field in INDEXED_FIELDS.items():
+            index.languages[lang].add(doc_id, tokenize(lang, row[field]))
+
+    return index
+
+
+def _load_or_build() -> SearchIndex:
+    signature = tuple(file_signature(p) for p in source_paths())
+
+    try:
+        with open(INDEX_FILE, "rb") as f:
+            index = pickle.load(f)
+        if index.version == INDEX_VERSION and index.signature == signature:
+            return index
+    except Exception:
+        pass
+
+    index = build_search_index()
+    index.signature = signature
+
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        tmp_file = INDEX_FILE.with_suffix(".tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, INDEX_FILE)
+    except OSError:
+        pass
+
+    return index
+
+
+def get_search_index() -> SearchIndex:
+    """Önbellekteki (bellek + disk) arama indeksi."""
+    return corpus.derive("search_index", source_paths(), _load_or_build)
+
+
+def check_regressions(index: SearchIndex) -> list[str]:
+    """Normalizasyon regresyonlarını çalıştır; başarısız olanların açıklamaları."""
+    failures = []
+    for query, lang, minimum in REGRESSION_QUERIES:
+        count = len(index.search(query, [lang]))
+        if count < minimum:
+            failures.append(f"{query} ({lang}): {count} ayet, beklenen >= {minimum}")
+    for queries, lang in EQUIVALENT_QUERIES:
+        results = {q: index.search(q, [lang]) for q in queries}
+        if any(r != results[queries[0]] for r in results.values()):
+            counts = ", ".join(f"{q}: {len(r)}" for q, r in results.items())
+            failures.append(f"{' / '.join(queries)} ({lang}) farklı sonuç veriyor ({counts})")
+        rankings = [index.rank(q, 20) for q in queries]
+        if any(r != rankings[0] for r in rankings):
+            failures.append(f"{' / '.join(queries)} farklı sıralama veriyor")
+    return failures
+
+
+def main():
+    index = get_search_index()
+    if len(sys.argv) > 1 and sys.argv[1] == "--check":
+        failures = check_regressions(index)
+        for failure in failures:
+            print(f"HATA: {failure}")
+        print(f"{len(REGRESSION_QUERIES) + 2 * len(EQUIVALENT_QUERIES) - len(failures)} kontrol geçti, {len(failures)} hata")
+        sys.exit(1 if failures else 0)
+
+    for lang, lang_index in index.languages.items():
+        print(f"{lang}: {len(lang_index.postings):,} token, {len(lang_index.doc_lengths):,} ayet")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Timing Store - Kelime zamanlamaları için kompakt depo ve ikili arama.
+
+quran-master/word-timing.json ({sure: {ayet: [{w, s, e}]}}) bir kez okunur ve
+tüm kelimeler üç düz int32 dizisine (kelime sırası, başlangıç, bitiş) yazılır;
+her ayet bu dizilerde bir dilimdir. word-timing.json yoksa surah-NNN.json
+dosyalarındaki startTime/endTime alanları kullanılır. Depo agents/.cache
+altında saklanır.
+
+Bir ayetin içinde verilen konumdaki (ms) aktif kelime başlangıç dizisinde
+bisect ile bulunur; tilavet sırasında kelime vurgulama için yüksek sıklıkta
+çağrılabilir.
+
+Kullanım:
+    from timing_store import get_timing_store
+
+    store = get_timing_store()            # zamanlama verisi yoksa None
+    store.active_word(1, 2, 1350)         # {"word_rank": 2, "start_ms": ..., ...}
+"""
+
+import json
+import os
+import pickle
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Optional
+
+from corpus_store import QURAN_MASTER_DIR, corpus, file_signature
+from root_index import master_paths
+
+CACHE_DIR = Path(__file__).parent / ".cache"
+STORE_FILE = CACHE_DIR / "timing_store.pickle"
+STORE_VERSION = 1
+TIMING_FILE = QURAN_MASTER_DIR / "word-timing.json"
+
+
+def source_paths() -> list[Path]:
+    """Deponun bağlı olduğu dosyalar (word-timing.json, yoksa sure dosyaları)."""
+    if file_signature(TIMING_FILE) is not None:
+        return [TIMING_FILE]
+    return master_paths()
+
+
+class TimingStore:
+    """Ayet -> kelime zamanlamaları (düz int32 dizilerinde dilimler)."""
+
+    def __init__(self):
+        self.version = STORE_VERSION
+        self.signature: tuple = ()
+        # (sure, ayet) -> (başlangıç, bitiş) dilimi
+        self.verses: dict[tuple[int, int], tuple[int, int]] = {}
+        # Ayet içinde başlangıç zamanına göre sıralı
+        self.word_rank = array("i")
+        self.start_ms = array("i")
+        self.end_ms = array("i")
+
+    def __len__(self) -> int:
+        return len(self.word_rank)
+
+    def _word(self, i: int) -> dict[str, int]:
+        return {
+            "word_rank": self.word_rank[i],
+            "start_ms": self.start_ms[i],
+            "end_ms": self.end_ms[i],
+        }
+
+    def verse_words(self, surah: int, ayah: int) -> Optional[list[dict[str, int]]]:
+        """Ayetin tüm kelime zamanlamaları (ayet yoksa None)."""
+        span = self.verses.get((surah, ayah))
+        if span is None:
+            return None
+        return [self._word(i) for i in range(*span)]
+
+    def verse_duration(self, surah: int, ayah: int) -> int:
+        """İlk kelimenin başlangıcından son kelimenin bitişine süre (ms)."""
+        start, end = self.verses.get((surah, ayah), (0, 0))
+        if start == end:
+            return 0
+        return max(self.end_ms[start:end]) - self.start_ms[start]
+
+    def active_index(self, surah: int, ayah: int, position_ms: int) -> Optional[int]:
+        """Konumdaki kelimenin dizideki yeri (kelime yoksa veya arada ise None)."""
+        span = self.verses.get((surah, ayah))
+        if span is None:
+            return None
+        start, end = span
+        i = bisect_right(self.start_ms, position_ms, start, end) - 1
+        if i < start or position_ms >= self.end_ms[i]:
+            return None
+        return i
+
+    def active_word(self, surah: int, ayah: int, position_ms: int) -> Optional[dict[str, int]]:
+        """Verilen konumda (ms) okunan kelime."""
+        i = self.active_index(surah, ayah, position_ms)
+        return None if i is None else self._word(i)
+
+
+def _timing_rows() -> Optional[dict[tuple[int, int], list[tuple[int, int, int]]]]:
+    """(sure, ayet) -> [(kelime sırası, başlangıç, bitiş)]; veri yoksa None."""
+    rows: dict[tuple[int, int], list[tuple[int, int, int]]] = {}
+
+    # Paylaşılan önbelleğe almadan oku: ham JSON bellekte tutulmaz
+    try:
+        with open(TIMING_FILE, "r", encoding="utf-8") as f:
+            timing = json.load(f)
+    except (OSError, ValueError):
+        timing = None
+
+    if timing is not None:
+        for surah_key, verses in timing.items():
+            for ayah_key, words in verses.items():
+                rows[(int(surah_key), int(ayah_key))] = [
+                    (w.get("w") or 0, w.get("s") or 0, w.get("e") or 0) for w in words
+                ]
+        return rows
+
+    found = False
+    for path in master_paths():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                surah_data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        found = True
+        surah_id = surah_data.get("surahId") or int(path.stem.split("-")[1])
+        for verse in surah_data.get("verses", []):
+            rows[(surah_id, verse.get("verseNumber", 0))] = [
+                (w.get("wordRank") or 0, w.get("startTime") or 0, w.get("endTime") or 0)
+                for w in verse.get("words", [])
+            ]
+    return rows if found else None
+
+
+def build_timing_store() -> Optional[TimingStore]:
+    """Zamanlama verisinden depoyu kur (veri yoksa None)."""
+    rows = _timing_rows()
+    if rows is None:
+        return None
+
+    store = TimingStore()
+    for key in sorted(rows):
+        # bisect için ayet içinde başlangıca göre sırala
+        words = sorted(rows[key], key=lambda w: (w[1], w[0]))
+        start = len(store.word_rank)
+        for rank, start_ms, end_ms in words:
+            store.word_rank.append(rank)
+            store.start_ms.append(start_ms)
+            store.end_ms.append(end_ms)
+        store.verses[key] = (start, len(store.word_rank))
+
+    return store
+
+
+def _load_or_build() -> Optional[TimingStore]:
+    signature = tuple(file_signature(p) for p in source_paths())
+    if not any(signature):
+        return None
+
+    try:
+        with open(STORE_FILE, "rb") as f:
+            store = pickle.load(f)
+        if store.version == STORE_VERSION and store.signature == signature:
+            return store
+    except Exception:
+        pass
+
+    store = build_timing_store()
+    if store is None:
+        return None
+    store.signature = signature
+
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        tmp_file = STORE_FILE.with_suffix(".tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump(store, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, STORE_FILE)
+    except OSError:
+        pass
+
+    return store
+
+
+def get_timing_store() -> Optional[TimingStore]:
+    """Önbellekteki zamanlama deposu (veri yoksa None)."""
+    return corpus.derive("timing_store", source_paths(), _load_or_build)
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Validation - Veri dosyaları için tek geçişli doğrulama motoru.
+
+Her kaynak dosya bir kez yüklenir ve ayet kayıtları (bölüm, "sure:ayet",
+metin) olarak tek seferde dolaşılır; kayıtlı tüm kontroller (CHECKS) her
+kaydı aynı geçişte görür. Liste biçiminde sure düzeyindeki metin alanları
+("surah" bölümü, "[i].alan") da dolaşılır; bunlara yalnızca encoding
+kontrolü bakar. Desenler modül yüklenirken derlenir; HTML ve
+encoding kontrolleri metin başına tek bir birleşik desenle çalışır.
+
+Desteklenen dosya biçimleri otomatik tanınır:
+- Hayrat:  {"translations": {"1:1": ...}, "tafsir": {"1:1": ...}}
+- Tefsir:  {"metadata": {...}, "commentary": {"1:1": "..."}}  (Kur'an Yolu, Study Quran)
+- Liste:   [{"id": 1, "verses": [{"id": 1, "translation"/"text": ...}]}]
+- İç içe:  {"1": {"1": "..."}}
+- Düz:     {"1:1": "..."}
+
+Kullanım:
+    from validation import validate
+
+    report = validate("hayrat")                      # tüm kontroller
+    report = validate("turkish", ["coverage"])
+    report["checks"]["html"]["span_tag_issues"]
+
+    python validation.py hayrat turkish
+    python validation.py all --workers 4             # mevcut tüm kaynaklar
+    python validation.py --check                     # biçim tanıma regresyonları
+
+validate_all() her dosyayı bir kez ayrıştırır; büyük dosyaların kayıtlarını
+sure parçalarına bölüp bir süreç havuzunda tarar. Her kontrol parçalardaki
+durumları birleştirebilir (merge), böylece rapor sıralı doğrulamayla birebir
+aynıdır.
+"""
+
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from corpus_store import QURAN_DIR, load_json
+
+# Beklenen ayet sayıları (Kur'an'da 6236 ayet var)
+EXPECTED_VERSE_COUNTS = {
+    1: 7, 2: 286, 3: 200, 4: 176, 5: 120, 6: 165, 7: 206, 8: 75, 9: 129, 10: 109,
+    11: 123, 12: 111, 13: 43, 14: 52, 15: 99, 16: 128, 17: 111, 18: 110, 19: 98, 20: 135,
+    21: 112, 22: 78, 23: 118, 24: 64, 25: 77, 26: 227, 27: 93, 28: 88, 29: 69, 30: 60,
+    31: 34, 32: 30, 33: 73, 34: 54, 35: 45, 36: 83, 37: 182, 38: 88, 39: 75, 40: 85,
+    41: 54, 42: 53, 43: 89, 44: 59, 45: 37, 46: 35, 47: 38, 48: 29, 49: 18, 50: 45,
+    51: 60, 52: 49, 53: 62, 54: 55, 55: 78, 56: 96, 57: 29, 58: 22, 59: 24, 60: 13,
+    61: 14, 62: 11, 63: 11, 64: 18, 65: 12, 66: 12, 67: 30, 68: 52, 69: 52, 70: 44,
+    71: 28, 72: 28, 73: 20, 74: 56, 75: 40, 76: 31, 77: 50, 78: 40, 79: 46, 80: 42,
+    81: 29, 82: 19, 83: 36, 84: 25, 85: 22, 86: 17, 87: 19, 88: 26, 89: 30, 90: 20,
+    91: 15, 92: 21, 93: 11, 94: 8, 95: 8, 96: 19, 97: 5, 98: 8, 99: 8, 100: 11,
+    101: 11, 102: 8, 103: 3, 104: 9, 105: 5, 106: 4, 107: 7, 108: 3, 109: 6, 110: 3,
+    111: 5, 112: 4, 113: 5, 114: 6
+}
+
+TOTAL_VERSES = 6236
+
+# Mushaf sırasıyla beklenen tüm anahtarlar
+EXPECTED_KEYS = [
+    f"{surah_id}:{verse_num}"
+    for surah_id, verse_count in EXPECTED_VERSE_COUNTS.items()
+    for verse_num in range(1, verse_count + 1)
+]
+
+# Kaynak adı -> dosya (QURAN_DIR altında)
+SOURCES = {
+    "hayrat": "hayrat_meal.json",
+    "kuranyolu": "kuranyolu_commentary.json",
+    "studyquran": "studyquran_commentary.json",
+    "arabic": "quran_arabic.json",
+    "turkish": "quran_turkish.json",
+    "english": "quran_english.json",
+    "haleem": "quran_haleem.json",
+    "clearquran": "quran_clearquran.json",
+    "studyquran_translation": "quran_studyquran.json",
+}
+
+# Hayrat bölümleri (anahtar -> rapordaki önek)
+HAYRAT_SECTIONS = {"translations": "trans", "tafsir": "tafsir"}
+
+# Liste biçiminde sure düzeyindeki alanların bölümü (ayet kaydı değildir)
+FIELD_SECTION = "surah"
+
+# Raporlarda bölümlerin sırası (dosyadaki sırayla aynı)
+SECTION_ORDER = (FIELD_SECTION, "text", "trans", "tafsir")
+
+# Etiket başlangıcı (<span, </div, <p ...) veya HTML varlığı (&nbsp;)
+HTML_RE = re.compile(r"<(/?)([a-z]+)|&[a-z]+;", re.IGNORECASE)
+
+# UTF-8 metnin Latin-1 olarak okunması (Ã, Ä, Å) veya yer tutucu karakter
+ENCODING_RE = re.compile("(?P<possible_utf8_as_latin1>[ÃÄÅ])|(?P<replacement_character>\ufffd)")
+
+# Hayrat mealindeki dipnot referansları: (12)
+REF_RE = re.compile(r"\((\d+)\)")
+
+SAMPLE_SIZE = 20
+
+# validate_all: bu boyutu aşan her dilim için kaynak bir sure parçasına daha bölünür
+CHUNK_BYTES = 512 * 1024
+
+
+def resolve_source(source: str) -> Path:
+    """Kaynak adı (SOURCES) veya QURAN_DIR altındaki dosya adı (uzantısız)."""
+    return QURAN_DIR / SOURCES.get(source, f"{source}.json")
+
+
+def iter_records(data: Any) -> Iterator[tuple[str, str, str]]:
+    """Dosya içeriğinden (bölüm, "sure:ayet", metin) kayıtları (+ liste biçiminde sure alanları)."""
+    if isinstance(data, list):
+        for i, surah in enumerate(data):
+            if not isinstance(surah, dict):
+                continue
+            for field, value in surah.items():
+                if isinstance(value, str):
+                    yield FIELD_SECTION, f"[{i}].{field}", value
+            surah_id = surah.get("id")
+            for verse in surah.get("verses", []):
+                text = verse.get("translation", verse.get("text"))
+                yield "text", f"{surah_id}:{verse.get('id')}", text if isinstance(text, str) else ""
+    elif isinstance(data, dict) and "translations" in data:
+        for name, section in HAYRAT_SECTIONS.items():
+            for key, text in data.get(name, {}).items():
+                yield section, key, text if isinstance(text, str) else ""
+    elif isinstance(data, dict) and isinstance(data.get("commentary"), dict):
+        # Tefsir dosyaları: metadata atlanır, ayetler düz "sure:ayet" anahtarlarıdır
+        for key, text in data["commentary"].items():
+            yield "text", key, text if isinstance(text, str) else ""
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(value, dict):
+                for verse_num, text in value.items():
+                    yield "text", f"{key}:{verse_num}", text if isinstance(text, str) else ""
+            elif isinstance(value, str):
+                yield "text", key, value
+
+
+def _label(section: str, key: str) -> str:
+    return key if section in ("text", FIELD_SECTION) else f"{section}.{key}"
+
+
+def _in_section_order(by_section: dict[str, list]) -> list:
+    """Bölüm listelerini dosyadaki sırayla birleştir (parçaların sırasından bağımsız)."""
+    return [item for section in sorted(by_section, key=SECTION_ORDER.index) for item in by_section[section]]
+
+
+def _merge_lists(target: dict[str, list], other: dict[str, list]):
+    for section, items in other.items():
+        target.setdefault(section, []).extend(items)
+
+
+class CoverageCheck:
+    """Bölüm başına ayet kapsamı (eksik ayetler)."""
+
+    def __init__(self):
+        self.keys: dict[str, set[str]] = {}
+
+    def visit(self, section: str, key: str, text: str):
+        if section != FIELD_SECTION:
+            self.keys.setdefault(section, set()).add(key)
+
+    def merge(self, other: "CoverageCheck"):
+        for section, keys in other.keys.items():
+            self.keys.setdefault(section, set()).update(keys)
+
+    def report(self) -> dict[str, Any]:
+        sections = {}
+        for section in sorted(self.keys, key=SECTION_ORDER.index):
+            keys = self.keys[section]
+            missing = [key for key in EXPECTED_KEYS if key not in keys]
+            sections[section] = {
+                "total_expected": TOTAL_VERSES,
+                "found": len(keys),
+                "missing_count": len(missing),
+                "coverage_percent": round((len(keys) / TOTAL_VERSES) * 100, 2),
+                "missing_sample": missing[:SAMPLE_SIZE],
+            }
+        return {"sections": sections}
+
+
+class HtmlCheck:
+    """HTML artıkları: span/div etiketleri, varlıklar, diğer açılış etiketleri."""
+
+    KINDS = ("span", "div", "entities", "other")
+
+    def __init__(self):
+        # tür -> bölüm -> anahtarlar
+        self.issues: dict[str, dict[str, list[str]]] = {kind: {} for kind in self.KINDS}
+
+    def visit(self, section: str, key: str, text: str):
+        if section == FIELD_SECTION or ("<" not in text and "&" not in text):
+            return
+        found = set()
+        for match in HTML_RE.finditer(text):
+            tag = match.group(2)
+            if tag is None:
+                found.add("entities")
+                continue
+            tag = tag.lower()
+            if tag.startswith("span"):
+                found.add("span")
+            elif tag.startswith("div"):
+                found.add("div")
+            if not match.group(1) and text.find(">", match.end()) != -1:
+                found.add("other")
+            if len(found) == len(self.KINDS):
+                break
+        label = _label(section, key)
+        for kind in found:
+            self.issues[kind].setdefault(section, []).append(label)
+
+    def merge(self, other: "HtmlCheck"):
+        for kind, by_section in other.issues.items():
+            _merge_lists(self.issues[kind], by_section)
+
+    def report(self) -> dict[str, Any]:
+        issues = {kind: _in_section_order(by_section) for kind, by_section in self.issues.items()}
+        return {
+            "span_tag_issues": len(issues["span"]),
+            "div_tag_issues": len(issues["div"]),
+            "entity_issues": len(issues["entities"]),
+            "other_tag_issues": len(issues["other"]),
+            "samples": {kind: keys[:5] for kind, keys in issues.items()},
+        }
+
+
+class EncodingCheck:
+    """Bozuk karakter kodlaması belirtileri (ayet metinleri ve sure alanları)."""
+
+    def __init__(self):
+        self.issues: dict[str, list[dict[str, str]]] = {}
+
+    def visit(self, section: str, key: str, text: str):
+        found = {match.lastgroup for match in ENCODING_RE.finditer(text)}
+        for issue in sorted(found):
+            self.issues.setdefault(section, []).append({"key": _label(section, key), "issue": issue})
+
+    def merge(self, other: "EncodingCheck"):
+        _merge_lists(self.issues, other.issues)
+
+    def report(self) -> dict[str, Any]:
+        issues = _in_section_order(self.issues)
+        return {"encoding_issues": len(issues), "issues": issues[:SAMPLE_SIZE]}
+
+
+class ReferenceCheck:
+    """Referans içeren meal ayetlerinin tefsir karşılığı (yalnızca Hayrat)."""
+
+    def __init__(self):
+        self.refs: dict[str, list[str]] = {}
+        self.tafsir: set[str] = set()
+        self.translations = 0
+
+    def visit(self, section: str, key: str, text: str):
+        if section == "tafsir":
+            self.tafsir.add(key)
+        elif section == "trans":
+            self.translations += 1
+            refs = REF_RE.findall(text)
+            if refs:
+                self.refs[key] = refs
+
+    def merge(self, other: "ReferenceCheck"):
+        self.refs.update(other.refs)
+        self.tafsir |= other.tafsir
+        self.translations += other.translations
+
+    def report(self) -> Optional[dict[str, Any]]:
+        if not self.translations:
+            return None
+        orphans = [{"key": key, "refs": refs} for key, refs in self.refs.items() if key not in self.tafsir]
+        with_tafsir = len(self.refs) - len(orphans)
+        return {
+            "total_translations": self.translations,
+            "translations_with_references": len(self.refs),
+            "translations_with_tafsir": with_tafsir,
+            "match_rate": round((with_tafsir / max(1, len(self.refs))) * 100, 2),
+            "orphan_refs_count": len(orphans),
+            "orphan_samples": orphans[:10],
+        }
+
+
+# Kontrol adı -> sınıf (visit(bölüm, anahtar, metin), merge(diğer), report())
+CHECKS = {
+    "coverage": CoverageCheck,
+    "html": HtmlCheck,
+    "encoding": EncodingCheck,
+    "references": ReferenceCheck,
+}
+
+
+def _check_names(checks: Optional[Iterable[str]]) -> list[str]:
+    names = list(checks) if checks is not None else list(CHECKS)
+    unknown = [name for name in names if name not in CHECKS]
+    if unknown:
+        raise ValueError(f"Geçersiz kontrol: {', '.join(unknown)}. Seçenekler: {', '.join(CHECKS)}")
+    return names
+
+
+def scan(records: Iterable[tuple[str, str, str]], checks: Optional[Iterable[str]] = None) -> tuple[int, dict[str, Any]]:
+    """Kayıtları tek geçişte kontrollerden geçir: (kayıt sayısı, ad -> kontrol durumu)."""
+    active = {name: CHECKS[name]() for name in _check_names(checks)}
+    visitors = [check.visit for check in active.values()]
+    count = 0
+    for section, key, text in records:
+        if section != FIELD_SECTION:
+            count += 1
+        for visit in visitors:
+            visit(section, key, text)
+    return count, active
+
+
+def _report(count: int, active: dict[str, Any]) -> dict[str, Any]:
+    reports = {name: check.report() for name, check in active.items()}
+    return {"records": count, "checks": {name: report for name, report in reports.items() if report is not None}}
+
+
+def run_checks(records: Iterable[tuple[str, str, str]], checks: Optional[Iterable[str]] = None) -> dict[str, Any]:
+    """Kayıtları tek geçişte seçilen kontrollerden geçir."""
+    return _report(*scan(records, checks))
+
+
+def _load(source: str) -> tuple[Path, Any]:
+    path = resolve_source(source)
+    if not path.exists():
+        raise FileNotFoundError(f"Dosya bulunamadı: {path}")
+    data = load_json(path)
+    if not data:
+        raise ValueError(f"Veri yüklenemedi: {path}")
+    return path, data
+
+
+def validate(source: str, checks: Optional[Iterable[str]] = None) -> dict[str, Any]:
+    """Bir kaynağı yükle ve tüm kontrolleri tek geçişte çalıştır."""
+    path, data = _load(source)
+    return {"source": source, "file": path.name, **run_checks(iter_records(data), checks)}
+
+
+def available_sources() -> list[str]:
+    """Dosyası mevcut olan kaynaklar."""
+    return [source for source in SOURCES if resolve_source(source).exists()]
+
+
+def surah_chunks(chunks: int) -> dict[str, int]:
+    """Sure no (str) -> parça indeksi; parçalar ardışık ve ayet sayısına göre dengeli."""
+    result = {}
+    before = 0
+    for surah_id, verse_count in EXPECTED_VERSE_COUNTS.items():
+        result[str(surah_id)] = min(chunks - 1, before * chunks // TOTAL_VERSES)
+        before += verse_count
+    return result
+
+
+def split_records(records: Iterable[tuple[str, str, str]], chunks: int) -> list[list[tuple[str, str, str]]]:
+    """
+    Kayıtları ardışık sure aralıklarına böl. Sure numarası taşımayan kayıtlar
+    (liste biçiminde sure alanları) kendinden önceki kaydın parçasında kalır;
+    böylece her bölümün sırası parçalar boyunca korunur.
+    """
+    owner = surah_chunks(chunks)
+    parts: list[list[tuple[str, str, str]]] = [[] for _ in range(chunks)]
+    chunk = 0
+    for record in records:
+        chunk = owner.get(record[1].partition(":")[0], chunk)
+        parts[chunk].append(record)
+    return parts
+
+
+def plan_chunks(source: str, workers: int) -> int:
+    """Kaynağın kaç sure parçasına bölüneceği (dosya boyutuna göre)."""
+    try:
+        size = resolve_source(source).stat().st_size
+    except OSError:
+        return 1
+    return max(1, min(workers, size // CHUNK_BYTES))
+
+
+def _merged_report(parts: list[tuple[int, dict[str, Any]]]) -> dict[str, Any]:
+    count, active = parts[0]
+    for part_count, part in parts[1:]:
+        count += part_count
+        for name, check in part.items():
+            active[name].merge(check)
+    return _report(count, active)
+
+
+def validate_all(sources: Optional[Iterable[str]] = None, checks: Optional[Iterable[str]] = None,
+                 workers: Optional[int] = None) -> dict[str, Any]:
+    """
+    Kaynakları doğrula; her dosya ana süreçte bir kez ayrıştırılır. Büyük
+    kaynakların kayıtları sure parçalarına bölünüp süreç havuzunda taranır,
+    parçaların durumları birleştirilip tek rapor üretilir (sonuç sıralı
+    doğrulamayla aynıdır). Küçük kaynaklar (tek parça) ana süreçte taranır:
+    kayıtları işçiye göndermek taramadan pahalıdır.
+    """
+    sources = list(sources) if sources is not None else available_sources()
+    names = _check_names(checks)
+    workers = workers or os.cpu_count() or 1
+
+    results: dict[str, Any] = {}
+    pending: dict[str, tuple[Path, list]] = {}
+    pool: Optional[ProcessPoolExecutor] = None
+    try:
+        for source in sources:
+            try:
+                path, data = _load(source)
+            except (OSError, ValueError) as e:
+                results[source] = {"source": source, "error": str(e)}
+                continue
+            records = iter_records(data)
+            chunks = plan_chunks(source, workers)
+            if chunks == 1:
+                results[source] = {"source": source, "file": path.name, **run_checks(records, names)}
+                continue
+            if pool is None:
+                pool = ProcessPoolExecutor(max_workers=workers)
+            # Parçalar havuzda taranırken sıradaki kaynak ayrıştırılır
+            pending[source] = (path, [pool.submit(scan, part, names) for part in split_records(records, chunks)])
+
+        for source, (path, futures) in pending.items():
+            results[source] = {
+                "source": source, "file": path.name,
+                **_merged_report([future.result() for future in futures]),
+            }
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return {source: results[source] for source in sources}
+
+
+def layout_samples() -> dict[str, Any]:
+    """Her desteklenen biçimde tam kapsamlı örnek veri (biçim adı -> içerik)."""
+    flat = {key: f"metin {key}" for key in EXPECTED_KEYS}
+    nested: dict[str, dict[str, str]] = {}
+    for key in EXPECTED_KEYS:
+        surah, verse = key.split(":")
+        nested.setdefault(surah, {})[verse] = f"metin {key}"
+    return {
+        "hayrat": {"translations": flat, "tafsir": flat},
+        "commentary": {"metadata": {"source": "örnek", "type": "commentary", "total": TOTAL_VERSES},
+                       "commentary": flat},
+        "list": [
+            {"id": int(surah), "name": f"Sure {surah}",
+             "verses": [{"id": int(v), "translation": text} for v, text in verses.items()]}
+            for surah, verses in nested.items()
+        ],
+        "nested": nested,
+        "flat": flat,
+    }
+
+
+def check_layouts() -> list[str]:
+    """Biçim tanıma regresyonları: her örnek tam kapsam vermeli; başarısız olanların açıklamaları."""
+    failures = []
+    for layout, data in layout_samples().items():
+        report = run_checks(iter_records(data), ["coverage"])
+        expected_records = TOTAL_VERSES * (2 if layout == "hayrat" else 1)
+        if report["records"] != expected_records:
+            failures.append(f"{layout}: {report['records']} kayıt, beklenen {expected_records}")
+        for section, coverage in report["checks"]["coverage"]["sections"].items():
+            if coverage["found"] != TOTAL_VERSES or coverage["missing_count"]:
+                failures.append(
+                    f"{layout}/{section}: {coverage['found']} bulundu, {coverage['missing_count']} eksik "
+                    f"(%{coverage['coverage_percent']})"
+                )
+    return failures
+
+
+def main():
+    args = sys.argv[1:]
+    if args == ["--check"]:
+        failures = check_layouts()
+        for failure in failures:
+            print(f"HATA: {failure}")
+        print(f"{len(layout_samples())} biçim kontrol edildi, {len(failures)} hata")
+        sys.exit(1 if failures else 0)
+
+    workers = None
+    if "--workers" in args:
+        i = args.index("--workers")
+        workers = int(args[i + 1])
+        del args[i:i + 2]
+
+    sources = [source for source in args if source != "all"] or None
+    print(json.dumps(validate_all(sources, workers=workers), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
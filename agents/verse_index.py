@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Verse Index - Tüm çeviri kaynaklarını (surah, ayah) anahtarıyla birleştiren indeks.
+
+Liste formatındaki dosyalar (quran_arabic/turkish/english) ile düz sözlük
+formatındaki dosyalar (quran_haleem/clearquran/studyquran, hayrat_meal) tek
+geçişte ayet başına bir satırda birleştirilir. İndeks corpus_store üzerinden
+önbelleğe alınır ve kaynak dosyalardan biri değiştiğinde yeniden kurulur.
+
+İndeks ilk kurulduğunda metinler corpus_cache ile ikili bir dosyaya derlenir;
+sonraki süreçler JSON ayrıştırmak yerine bu dosyayı mmap ile açar (JSON
+dosyaları değişmediği sürece).
+
+Kullanım:
+    from verse_index import get_verse_index
+
+    index = get_verse_index()
+    row = index.get(2, 255)
+    row["arabic"], row["turkish_diyanet"], row["english_haleem"]
+"""
+
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from corpus_cache import CACHE_FILE, CachedVerseRow, compile_corpus, open_cache
+from corpus_store import QURAN_DIR, corpus, file_signature
+
+# Liste formatı: [{"id": 1, "verses": [{"id": 1, "text"/"translation": ...}]}]
+LIST_SOURCES = {
+    "arabic": ("quran_arabic.json", "text"),
+    "turkish_diyanet": ("quran_turkish.json", "translation"),
+    "english_sahih": ("quran_english.json", "translation"),
+}
+
+# Düz format: {"1": {"1": "..."}}
+FLAT_SOURCES = {
+    "english_haleem": "quran_haleem.json",
+    "english_clearquran": "quran_clearquran.json",
+    "english_studyquran": "quran_studyquran.json",
+}
+
+# Hayrat formatı: {"translations": {"1:1": "..."}}
+HAYRAT_SOURCE = ("turkish_hayrat", "hayrat_meal.json")
+
+# Satırdaki metin alanları
+TEXT_FIELDS = list(LIST_SOURCES) + list(FLAT_SOURCES) + [HAYRAT_SOURCE[0]]
+
+# Çeviri alanları (görünen ad -> alan)
+TRANSLATION_LABELS = {
+    "Turkish (Diyanet)": "turkish_diyanet",
+    "Turkish (Hayrat)": "turkish_hayrat",
+    "English (Sahih)": "english_sahih",
+    "English (Haleem)": "english_haleem",
+    "English (Clear Quran)": "english_clearquran",
+    "English (Study Quran)": "english_studyquran",
+}
+
+
+def source_paths() -> list[Path]:
+    """İndeksin bağlı olduğu kaynak dosyalar."""
+    paths = [QURAN_DIR / filename for filename, _ in LIST_SOURCES.values()]
+    paths += [QURAN_DIR / filename for filename in FLAT_SOURCES.values()]
+    paths.append(QURAN_DIR / HAYRAT_SOURCE[1])
+    return paths
+
+
+class VerseIndex:
+    """(surah, ayah) -> ayet satırı eşlemesi, mushaf sırasıyla."""
+
+    def __init__(self):
+        self.rows: dict[tuple[int, int], dict[str, Any]] = {}
+        self.order: list[tuple[int, int]] = []
+        self.surahs: dict[int, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """Tüm ayetler, mushaf sırasıyla."""
+        rows = self.rows
+        for key in self.order:
+            yield rows[key]
+
+    def get(self, surah: int, ayah: int) -> Optional[dict[str, Any]]:
+        """Tek ayet satırı (yoksa None)."""
+        return self.rows.get((surah, ayah))
+
+    def surah(self, surah: int) -> Optional[dict[str, Any]]:
+        """Sure bilgisi: id, name, transliteration, type, verse_count."""
+        return self.surahs.get(surah)
+
+    def surah_verses(self, surah: int) -> list[dict[str, Any]]:
+        """Bir surenin tüm ayet satırları."""
+        info = self.surahs.get(surah)
+        if not info:
+            return []
+        rows = self.rows
+        return [rows[(surah, ayah)] for ayah in info["ayahs"]]
+
+    def _row(self, surah: int, ayah: int) -> dict[str, Any]:
+        key = (surah, ayah)
+        row = self.rows.get(key)
+        if row is None:
+            row = {"surah": surah, "ayah": ayah, "verse_key": f"{surah}:{ayah}"}
+            row.update((field, "") for field in TEXT_FIELDS)
+            self.rows[key] = row
+            self.order.append(key)
+        return row
+
+
+def cache_signature() -> list:
+    """İkili önbelleğin geçerliliğini belirleyen kaynak imzaları (JSON uyumlu)."""
+    return [list(sig) if sig else None for sig in map(file_signature, source_paths())]
+
+
+def write_corpus_cache(index: VerseIndex) -> int:
+    """İndeksi ikili önbelleğe derle; yazılan bayt sayısını döndürür."""
+    surahs = [index.surahs[surah_id] for surah_id in sorted(index.surahs)]
+    fields = {field: [row[field] for row in index] for field in TEXT_FIELDS}
+    return compile_corpus(CACHE_FILE, cache_signature(), index.order, surahs, fields)
+
+
+def _index_from_cache(cache) -> VerseIndex:
+    index = VerseIndex()
+    index.order = list(cache.keys)
+    index.rows = {key: CachedVerseRow(cache, doc_id) for doc_id, key in enumerate(cache.keys)}
+    index.surahs = {info["id"]: info for info in cache.surahs}
+    return index
+
+
+def build_verse_index(use_cache: bool = True) -> VerseIndex:
+    """
+    Tüm kaynakları tek geçişte birleştir.
+
+    use_cache=True iken güncel ikili önbellek varsa ondan açılır, yoksa JSON'dan
+    kurulup önbellek yazılır.
+    """
+    if use_cache:
+        cache = open_cache(cache_signature())
+        if cache is not None:
+            return _index_from_cache(cache)
+
+    index = VerseIndex()
+
+    for field, (filename, text_key) in LIST_SOURCES.items():
+        data = corpus.load(QURAN_DIR / filename) or []
+        for surah in data:
+            surah_id = surah.get("id")
+            if surah_id is None:
+                continue
+            info = index.surahs.get(surah_id)
+            if info is None:
+                info = index.surahs[surah_id] = {
+                    "id": surah_id,
+                    "name": surah.get("name", ""),
+                    "transliteration": surah.get("transliteration", ""),
+                    "type": surah.get("type", ""),
+                    "ayahs": [],
+                }
+            for verse in surah.get("verses", []):
+                ayah_id = verse.get("id")
+                if ayah_id is None:
+                    continue
+                if (surah_id, ayah_id) not in index.rows:
+                    info["ayahs"].append(ayah_id)
+                index._row(surah_id, ayah_id)[field] = verse.get(text_key, "")
+
+    for field, filename in FLAT_SOURCES.items():
+        data = corpus.load(QURAN_DIR / filename) or {}
+        for surah_key, verses in data.items():
+            if not surah_key.isdigit() or not isinstance(verses, dict):
+                continue
+            surah_id = int(surah_key)
+            for ayah_key, text in verses.items():
+                if ayah_key.isdigit():
+                    row = index.rows.get((surah_id, int(ayah_key)))
+                    if row is not None:
+                        row[field] = text
+
+    field, filename = HAYRAT_SOURCE
+    hayrat = corpus.load(QURAN_DIR / filename) or {}
+    for key, text in hayrat.get("translations", {}).items():
+        surah_key, _, ayah_key = key.partition(":")
+        if surah_key.isdigit() and ayah_key.isdigit():
+            row = index.rows.get((int(surah_key), int(ayah_key)))
+            if row is not None:
+                row[field] = text
+
+    index.order.sort()
+    for info in index.surahs.values():
+        info["ayahs"].sort()
+        info["verse_count"] = len(info["ayahs"])
+
+    if use_cache:
+        try:
+            write_corpus_cache(index)
+        except OSError:
+            pass
+
+    return index
+
+
+def get_verse_index() -> VerseIndex:
+    """Önbellekteki indeks (kaynaklar değiştiyse yeniden kurulur)."""
+    return corpus.derive("verse_index", source_paths(), build_verse_index)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Vocabulary - Sıklığa göre sıralı öğrenme kelimeleri ve kapsama eğrileri.
+
+words_300.json, twogram.json ve threegram.json bir kez yüklenir ve sıklığa
+göre sıralı tutulur. Kur'an'daki toplam kelime sayısı quran-master kelime
+verisinden (yoksa Arapça metinden) alınır ve iki kümülatif kapsama eğrisi
+önceden hesaplanır:
+
+- words: listedeki ilk N kelime bilindiğinde metindeki kelimelerin yüzde kaçı
+  anlaşılır (kelimelerin `frequency` alanı üzerinden)
+- corpus: metindeki en sık N kelime biçimi (harekesiz) ile ulaşılabilecek
+  en yüksek kapsama
+
+Kapsama sorguları sabit zamanlıdır. Kelimelerin katkıları birbirinden bağımsız
+olduğundan, bilinmeyen kelimeler arasında sıklığa göre ilk k kelime kapsamayı
+en çok artıran k kelimedir (next_words).
+
+Kullanım:
+    from vocabulary import get_vocabulary
+
+    vocab = get_vocabulary()
+    vocab.top("words", 20)
+    vocab.coverage_at(100)                      # 0.38...
+    vocab.next_words(known_ids, count=10)
+"""
+
+import json
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from corpus_store import LEARNING_DIR, corpus, file_signature, load_json
+from root_index import master_paths
+from text_index import normalize_arabic
+from verse_index import get_verse_index, source_paths as verse_source_paths
+
+CATEGORIES = {
+    "words": "words_300.json",
+    "twogram": "twogram.json",
+    "threegram": "threegram.json",
+}
+
+
+def source_paths() -> list[Path]:
+    """Kelime listeleri + kelime sayımı kaynakları (quran-master, yoksa ayet metinleri)."""
+    paths = [LEARNING_DIR / filename for filename in CATEGORIES.values()]
+    if any(file_signature(p) for p in master_paths()):
+        return paths + master_paths()
+    return paths + verse_source_paths()
+
+
+def corpus_word_counts() -> Counter:
+    """Metindeki kelime biçimlerinin (harekesiz) sayıları."""
+    counts: Counter = Counter()
+    found = False
+    for path in master_paths():
+        # Paylaşılan önbelleğe almadan oku: tam kelime verisi bellekte tutulmaz
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                surah_data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        found = True
+        for verse in surah_data.get("verses", []):
+            counts.update(normalize_arabic(word.get("arabic", "")) for word in verse.get("words", []))
+    if found:
+        return counts
+
+    for row in get_verse_index():
+        counts.update(normalize_arabic(token) for token in row["arabic"].split())
+    return counts
+
+
+class Vocabulary:
+    """Sıralı kelime listeleri + önceden hesaplanmış kapsama eğrileri."""
+
+    def __init__(self, lists: dict[str, list[dict[str, Any]]], word_counts: Counter):
+        # Sıklığa göre azalan (eşitlikte dosyadaki sıra korunur)
+        self.items = {
+            category: sorted(items, key=lambda x: x.get("frequency", 0), reverse=True)
+            for category, items in lists.items()
+        }
+        self.by_id = {
+            item["id"]: item for items in self.items.values() for item in items if item.get("id")
+        }
+        self.total_tokens = sum(word_counts.values())
+
+        total = self.total_tokens or 1
+        # words[i]: ilk i+1 kelimenin kapsaması
+        self.word_coverage = [
+            n / total for n in accumulate(item.get("frequency", 0) for item in self.items.get("words", []))
+        ]
+        # corpus[i]: en sık i+1 biçimin kapsaması
+        self.corpus_coverage = [n / total for n in accumulate(sorted(word_counts.values(), reverse=True))]
+
+    def top(self, category: str, limit: int = 20, offset: int = 0) -> list[dict[str, Any]]:
+        """Kategorideki en sık öğeler (geçersiz kategoride KeyError)."""
+        return self.items[category][offset:offset + limit]
+
+    def coverage_at(self, n: int) -> float:
+        """Listedeki ilk n kelimenin metin kapsaması (0-1)."""
+        n = min(n, len(self.word_coverage))
+        return self.word_coverage[n - 1] if n > 0 else 0.0
+
+    def corpus_coverage_at(self, n: int) -> float:
+        """Metindeki en sık n kelime biçiminin kapsaması (0-1)."""
+        n = min(n, len(self.corpus_coverage))
+        return self.corpus_coverage[n - 1] if n > 0 else 0.0
+
+    def words_for_coverage(self, target: float) -> Optional[int]:
+        """Hedef kapsamaya ulaşmak için gereken en az kelime biçimi sayısı."""
+        i = bisect_left(self.corpus_coverage, target)
+        return i + 1 if i < len(self.corpus_coverage) else None
+
+    def coverage_of(self, known_ids: Iterable[str]) -> float:
+        """Bilinen kelimelerin toplam kapsaması."""
+        known = set(known_ids)
+        return sum(
+            item.get("frequency", 0) for item in self.items.get("words", []) if item.get("id") in known
+        ) / (self.total_tokens or 1)
+
+    def next_words(self, known_ids: Iterable[str], count: int = 10) -> list[dict[str, Any]]:
+        """Kapsamayı en çok artıracak, henüz bilinmeyen count kelime."""
+        known = set(known_ids)
+        coverage = self.coverage_of(known)
+        result = []
+        for item in self.items.get("words", []):
+            if len(result) >= count:
+                break
+            if item.get("id") in known:
+                continue
+            gain = item.get("frequency", 0) / (self.total_tokens or 1)
+            coverage += gain
+            result.append({**item, "coverage_gain": gain, "coverage_after": coverage})
+        return result
+
+    def curve(self, points: Iterable[int] = (10, 50, 100, 200, 300)) -> list[dict[str, Any]]:
+        """Seçilen N değerlerinde liste ve metin kapsaması (yüzde)."""
+        return [{
+            "top_n": n,
+            "list_coverage_percent": round(100 * self.coverage_at(n), 1),
+            "corpus_best_percent": round(100 * self.corpus_coverage_at(n), 1),
+        } for n in points]
+
+
+def build_vocabulary() -> Vocabulary:
+    lists = {}
+    for category, filename in CATEGORIES.items():
+        data = load_json(LEARNING_DIR / filename) or []
+        lists[category] = list(data.values()) if isinstance(data, dict) else list(data)
+    return Vocabulary(lists, corpus_word_counts())
+
+
+def get_vocabulary() -> Vocabulary:
+    """Önbellekteki kelime hazinesi (kaynaklar değiştiyse yeniden kurulur)."""
+    return corpus.derive("vocabulary", source_paths(), build_vocabulary)
@@ -1,75 +1,71 @@
-import openpyxl
+#!/usr/bin/env python3
+"""
+Convert the Quran Master Excel export into the app's quran-master data.
+
+Rows are streamed from the workbook (read-only mode) and grouped by surah;
+as soon as a surah's rows end it is flushed: its surah-NNN.json file is
+handed to a pool of writer processes (written in-process with a single
+worker) and its words are appended to the
+columnar store. Only the surah being read and the few being written are
+held in memory, plus the compact columns.
+
+Outputs (OUTPUT_DIR):
+    surah-NNN.json        full word data per surah (magnifier feature)
+    word-timing.json      {surah: {ayah: [{w, s, e}]}} for audio sync
+    index.json            surah names, verse and word counts
+    words-columnar.json   every word in mushaf order as per-field arrays;
+                          string fields are dictionary-encoded (column of
+                          ids into a per-field table of unique values)
+
+Reading the columnar store:
+    store = json.load(f)
+    i = ...                                          # word index
+    root = store["dictionaries"]["root"][store["columns"]["root"][i]]
+    en = store["dictionaries"]["translations.en"][store["columns"]["translations.en"][i]]
+    start, end = store["surahs"]["114"]              # word index range of a surah
+
+Usage:
+    python convert-quran-master.py [excel_path] [output_dir] [--workers N]
+"""
+
 import json
 import os
 import sys
+from array import array
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
 
 sys.stdout.reconfigure(encoding='utf-8')
 
 # Source file
 EXCEL_PATH = r'C:\Kitaplar\Modernways\Quran\Quran_Master_17052022.xlsx'
-OUTPUT_DIR = r'C:\Users\aydin\OneDrive\Masaüstü\ClaudeCode\Test\next-linear-quran\src\data\quran-master'
-
-# Create output directory
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-print(f"Loading Excel file: {EXCEL_PATH}")
-wb = openpyxl.load_workbook(EXCEL_PATH, read_only=True)
-ws = wb.active
+OUTPUT_DIR = Path(__file__).parent.parent / 'src' / 'data' / 'quran-master'
 
-# Get headers
-headers = []
-for col in range(1, ws.max_column + 1):
-    headers.append(ws.cell(row=1, column=col).value)
+COLUMNAR_FILE = 'words-columnar.json'
+COLUMNAR_VERSION = 1
 
-print(f"Columns: {len(headers)}")
-print(f"Total rows: {ws.max_row}")
-
-# Process data by surah
-surahs_data = {}
-word_timing_data = {}
-
-print("\nProcessing rows...")
-row_count = 0
-
-for row in ws.iter_rows(min_row=2, values_only=True):
-    row_count += 1
-    if row_count % 10000 == 0:
-        print(f"  Processed {row_count} rows...")
-
-    surah = row[0]  # surah
-    ayah = row[1]   # ayah
-    word_rank = row[2]  # word rank
-
-    if surah is None:
-        continue
+# Translation columns (0-indexed) by language
+TRANSLATION_COLUMNS = {
+    "en": 27,  # translate_english
+    "tr": 32,  # translate_turkish
+    "ur": 28,  # translate_urdu
+    "hi": 29,  # translate_hindi
+    "id": 30,  # translate_indonesian
+    "bn": 31,  # translate_bangla
+    "ru": 33,  # translate_russian
+}
 
-    surah = int(surah)
-    ayah = int(ayah) if ayah else 0
-    word_rank = int(word_rank) if word_rank else 0
+# Columnar store: integer fields and dictionary-encoded string fields
+INT_FIELDS = ("surah", "ayah", "wordRank", "startTime", "endTime")
+STRING_FIELDS = ("arabic", "tanzilClean", "root", "rootArabic", "level1", "level2", "level3", "level4") + tuple(
+    f"translations.{lang}" for lang in TRANSLATION_COLUMNS
+)
 
-    # Initialize surah data
-    if surah not in surahs_data:
-        surahs_data[surah] = {
-            "surahId": surah,
-            "surahArabic": row[5] if row[5] else "",
-            "surahLatin": row[6] if row[6] else "",
-            "verses": {}
-        }
-        word_timing_data[surah] = {}
-
-    # Initialize verse data
-    verse_key = f"{surah}:{ayah}"
-    if ayah not in surahs_data[surah]["verses"]:
-        surahs_data[surah]["verses"][ayah] = {
-            "verseNumber": ayah,
-            "verseKey": verse_key,
-            "wordCount": row[7] if row[7] else 0,
-            "words": []
-        }
-        word_timing_data[surah][ayah] = []
 
-    # Word data
-    word_data = {
+def word_from_row(row, word_rank: int) -> dict:
+    """Word entry of a surah file."""
+    return {
         "wordRank": word_rank,
         "arabic": row[26] if row[26] else "",  # arabic column (27 - 1 for 0-index)
         "tanzilClean": row[9] if row[9] else "",  # tanzil_clean
@@ -82,84 +78,219 @@ for row in ws.iter_rows(min_row=2, values_only=True):
         "level3": row[18] if row[18] else None,  # level 3
         "level4": row[19] if row[19] else None,  # level 4
         "translations": {
-            "en": row[27] if row[27] else "",  # translate_english
-            "tr": row[32] if row[32] else "",  # translate_turkish
-            "ur": row[28] if row[28] else "",  # translate_urdu
-            "hi": row[29] if row[29] else "",  # translate_hindi
-            "id": row[30] if row[30] else "",  # translate_indonesian
-            "bn": row[31] if row[31] else "",  # translate_bangla
-            "ru": row[33] if row[33] else "",  # translate_russian
+            lang: row[col] if row[col] else "" for lang, col in TRANSLATION_COLUMNS.items()
         }
     }
 
-    surahs_data[surah]["verses"][ayah]["words"].append(word_data)
-
-    # Simplified timing data
-    word_timing_data[surah][ayah].append({
-        "w": word_rank,
-        "s": word_data["startTime"],
-        "e": word_data["endTime"]
-    })
-
-print(f"\nTotal rows processed: {row_count}")
-print(f"Total surahs: {len(surahs_data)}")
-
-# Save timing data (compact format for quick loading)
-print("\nSaving word timing data...")
-timing_output = {}
-for surah_id, verses in word_timing_data.items():
-    timing_output[surah_id] = {}
-    for ayah, words in verses.items():
-        timing_output[surah_id][ayah] = words
-
-with open(os.path.join(OUTPUT_DIR, 'word-timing.json'), 'w', encoding='utf-8') as f:
-    json.dump(timing_output, f, ensure_ascii=False)
-print(f"  Saved: word-timing.json")
-
-# Save full word data per surah (for magnifier feature)
-print("\nSaving surah word data...")
-for surah_id, surah_data in surahs_data.items():
-    # Convert verses dict to list
-    verses_list = []
-    for ayah_num in sorted(surah_data["verses"].keys()):
-        verses_list.append(surah_data["verses"][ayah_num])
-
-    output_data = {
-        "surahId": surah_data["surahId"],
-        "surahArabic": surah_data["surahArabic"],
-        "surahLatin": surah_data["surahLatin"],
-        "verses": verses_list
-    }
 
-    filename = f'surah-{surah_id:03d}.json'
-    with open(os.path.join(OUTPUT_DIR, filename), 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+def write_surah(output_dir: str, surah_data: dict) -> str:
+    """Write one surah file (runs in a writer process)."""
+    filename = f'surah-{surah_data["surahId"]:03d}.json'
+    with open(os.path.join(output_dir, filename), 'w', encoding='utf-8') as f:
+        json.dump(surah_data, f, ensure_ascii=False, indent=2)
+    return filename
 
-print(f"  Saved {len(surahs_data)} surah files")
 
-# Create index file
-print("\nCreating index file...")
-index_data = {
-    "totalSurahs": len(surahs_data),
-    "surahs": []
-}
+class ColumnarStore:
+    """Per-field word columns; strings are stored once per field."""
+
+    def __init__(self):
+        self.columns = {field: array('l') for field in INT_FIELDS + STRING_FIELDS}
+        self.dictionaries = {field: [] for field in STRING_FIELDS}
+        self._ids = {field: {} for field in STRING_FIELDS}
+        self.surahs = {}
+
+    def _encode(self, field: str, value) -> int:
+        ids = self._ids[field]
+        if value not in ids:
+            ids[value] = len(ids)
+            self.dictionaries[field].append(value)
+        return ids[value]
+
+    def add_surah(self, surah_data: dict):
+        start = len(self)
+        columns = self.columns
+        for verse in surah_data["verses"]:
+            for word in verse["words"]:
+                columns["surah"].append(surah_data["surahId"])
+                columns["ayah"].append(verse["verseNumber"])
+                for field in INT_FIELDS[2:]:
+                    columns[field].append(word[field])
+                for field in STRING_FIELDS:
+                    if field.startswith("translations."):
+                        value = word["translations"][field.split(".", 1)[1]]
+                    else:
+                        value = word[field]
+                    columns[field].append(self._encode(field, value))
+        self.surahs[str(surah_data["surahId"])] = [start, len(self)]
+
+    def __len__(self) -> int:
+        return len(self.columns["surah"])
+
+    def write(self, path):
+        """Write the store as compact JSON, one column at a time."""
+        def dumps(value):
+            return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f'{{"version":{COLUMNAR_VERSION},"count":{len(self)},"surahs":{dumps(self.surahs)},"columns":{{')
+            f.write(','.join(f'{dumps(field)}:{dumps(column.tolist())}' for field, column in self.columns.items()))
+            f.write(f'}},"dictionaries":{dumps(self.dictionaries)}}}')
+
+
+def read_rows(excel_path: str):
+    """Stream data rows (header skipped) from the workbook."""
+    import openpyxl
+
+    print(f"Loading Excel file: {excel_path}")
+    wb = openpyxl.load_workbook(excel_path, read_only=True)
+    ws = wb.active
+    print(f"Total rows: {ws.max_row}")
+    try:
+        yield from ws.iter_rows(min_row=2, values_only=True)
+    finally:
+        wb.close()
+
+
+def convert(rows, output_dir, workers=None) -> dict:
+    """
+    Convert streamed rows into output_dir; returns the index data.
+
+    Rows must be grouped by surah (as in the export); a surah that
+    reappears after its rows ended raises ValueError.
+    """
+    output_dir = str(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    store = ColumnarStore()
+    index_data = {"totalSurahs": 0, "surahs": []}
+    flushed = set()
+    current = None  # surah being read: {"surahId", "surahArabic", "surahLatin", "verses": {ayah: verse}}
+    pending = set()
+
+    def flush(pool, timing_file):
+        surah_id = current["surahId"]
+        verses_list = [current["verses"][ayah] for ayah in sorted(current["verses"])]
+        surah_data = {
+            "surahId": surah_id,
+            "surahArabic": current["surahArabic"],
+            "surahLatin": current["surahLatin"],
+            "verses": verses_list
+        }
+
+        # Timing keeps the row order of verses, like the surah JSON keys did
+        timing = {
+            ayah: [{"w": w["wordRank"], "s": w["startTime"], "e": w["endTime"]} for w in verse["words"]]
+            for ayah, verse in current["verses"].items()
+        }
+        if flushed:
+            timing_file.write(', ')
+        timing_file.write(f'{json.dumps(str(surah_id))}: {json.dumps(timing, ensure_ascii=False)}')
+
+        store.add_surah(surah_data)
+        index_data["surahs"].append({
+            "id": surah_id,
+            "nameArabic": current["surahArabic"],
+            "nameLatin": current["surahLatin"],
+            "verseCount": len(verses_list),
+            "wordCount": sum(len(v["words"]) for v in verses_list)
+        })
+        flushed.add(surah_id)
+
+        if pool is None:
+            write_surah(output_dir, surah_data)
+            return
+        # Keep at most `workers` surahs queued so memory stays bounded
+        while len(pending) >= workers:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                future.result()
+        pending.add(pool.submit(write_surah, output_dir, surah_data))
+
+    print("\nProcessing rows...")
+    row_count = 0
+    with open(os.path.join(output_dir, 'word-timing.json'), 'w', encoding='utf-8') as timing_file, \
+            (ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext()) as pool:
+        timing_file.write('{')
+        for row in rows:
+            row_count += 1
+            if row_count % 10000 == 0:
+                print(f"  Processed {row_count} rows...")
+
+            surah = row[0]  # surah
+            ayah = row[1]   # ayah
+            word_rank = row[2]  # word rank
+
+            if surah is None:
+                continue
+
+            surah = int(surah)
+            ayah = int(ayah) if ayah else 0
+            word_rank = int(word_rank) if word_rank else 0
+
+            if current is None or current["surahId"] != surah:
+                if current is not None:
+                    flush(pool, timing_file)
+                if surah in flushed:
+                    raise ValueError(f"Rows of surah {surah} are not contiguous (row {row_count + 1})")
+                current = {
+                    "surahId": surah,
+                    "surahArabic": row[5] if row[5] else "",
+                    "surahLatin": row[6] if row[6] else "",
+                    "verses": {}
+                }
+
+            # Initialize verse data
+            verses = current["verses"]
+            if ayah not in verses:
+                verses[ayah] = {
+                    "verseNumber": ayah,
+                    "verseKey": f"{surah}:{ayah}",
+                    "wordCount": row[7] if row[7] else 0,
+                    "words": []
+                }
+            verses[ayah]["words"].append(word_from_row(row, word_rank))
+
+        if current is not None:
+            flush(pool, timing_file)
+        for future in pending:
+            future.result()
+        timing_file.write('}')
+
+    print(f"\nTotal rows processed: {row_count}")
+    print(f"Total surahs: {len(flushed)}")
+    print(f"  Saved {len(flushed)} surah files")
+    print("  Saved: word-timing.json")
+
+    store.write(os.path.join(output_dir, COLUMNAR_FILE))
+    print(f"  Saved: {COLUMNAR_FILE} ({len(store)} words)")
+
+    index_data["surahs"].sort(key=lambda s: s["id"])
+    index_data["totalSurahs"] = len(index_data["surahs"])
+    with open(os.path.join(output_dir, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump(index_data, f, ensure_ascii=False, indent=2)
+    print("  Saved: index.json")
+    return index_data
+
+
+def main():
+    args = sys.argv[1:]
+    workers = None
+    if "--workers" in args:
+        i = args.index("--workers")
+        workers = int(args[i + 1])
+        del args[i:i + 2]
+
+    excel_path = args[0] if args else EXCEL_PATH
+    output_dir = Path(args[1]) if len(args) > 1 else OUTPUT_DIR
+
+    convert(read_rows(excel_path), output_dir, workers=workers)
+
+    print("\nConversion complete!")
+    print(f"Output directory: {output_dir}")
+
 
-for surah_id in sorted(surahs_data.keys()):
-    surah = surahs_data[surah_id]
-    verse_count = len(surah["verses"])
-    word_count = sum(len(v["words"]) for v in surah["verses"].values())
-
-    index_data["surahs"].append({
-        "id": surah_id,
-        "nameArabic": surah["surahArabic"],
-        "nameLatin": surah["surahLatin"],
-        "verseCount": verse_count,
-        "wordCount": word_count
-    })
-
-with open(os.path.join(OUTPUT_DIR, 'index.json'), 'w', encoding='utf-8') as f:
-    json.dump(index_data, f, ensure_ascii=False, indent=2)
-print("  Saved: index.json")
-
-print("\nConversion complete!")
-print(f"Output directory: {OUTPUT_DIR}")
+if __name__ == "__main__":
+    main()
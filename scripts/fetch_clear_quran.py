@@ -1,18 +1,17 @@
 import json
-import urllib.request
 import os
 import re
 
+from http_cache import cached_get
+
 # Download Clear Quran TXT from archive.org
 TXT_URL = "https://archive.org/download/the-clear-quran-a-thematic-english-translation-allah-edition-dr.-mustafa-khattab-2017-bc-2-c-0-ddb/The_Clear_Quran_A_Thematic_English_Translation_Allah_edition_--_Dr._Mustafa_Khattab_2017_BC2C0DDB_djvu.txt"
 
 print("Downloading Clear Quran TXT file...")
 
 try:
-    # Download the file
-    req = urllib.request.Request(TXT_URL, headers={'User-Agent': 'Mozilla/5.0'})
-    with urllib.request.urlopen(req) as response:
-        content = response.read().decode('utf-8', errors='ignore')
+    # Download the file (shared HTTP cache)
+    content = cached_get(TXT_URL, timeout=120).decode('utf-8', errors='ignore')
 
     print(f"Downloaded {len(content)} characters")
 
@@ -4,18 +4,16 @@ Elmalılı Hamdi Yazır Tefsiri Scraper
 Kaynak: enfal.de (kuranikerim.com mirror)
 """
 
-import requests
 import json
 import re
-import time
-import os
 from bs4 import BeautifulSoup
 from pathlib import Path
 
+from http_cache import DEFAULT_TTL, cached_get
+
 # Çıktı dizini
 OUTPUT_DIR = Path(__file__).parent.parent / "src" / "data" / "quran"
 OUTPUT_FILE = OUTPUT_DIR / "elmalili_tefsir.json"
-CACHE_DIR = Path(__file__).parent / "cache_elmalili"
 
 # Site bilgileri
 BASE_URL = "http://www.enfal.de/telmalili"
@@ -194,32 +192,12 @@ def clean_text(text: str) -> str:
 
 
 def fetch_page(url: str, use_cache: bool = True) -> str:
-    """Sayfayı indir veya cache'den oku"""
-    # Cache dosya adı
-    cache_file = CACHE_DIR / url.split('/')[-1]
-
-    if use_cache and cache_file.exists():
-        print(f"  [CACHE] {url}")
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            return f.read()
-
-    print(f"  [FETCH] {url}")
+    """Sayfayı paylaşılan HTTP önbelleği üzerinden indir"""
+    print(f"  [GET] {url}")
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-
-        # Decode
-        html = decode_windows1254(response.content)
-
-        # Cache'e kaydet
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            f.write(html)
-
-        # Rate limiting
-        time.sleep(0.2)
-
-        return html
+        # Önbellek güncelse istek atılmaz; eskiyse koşullu GET ile doğrulanır
+        content = cached_get(url, ttl=DEFAULT_TTL if use_cache else 0, min_interval=0.2)
+        return decode_windows1254(content)
     except Exception as e:
         print(f"  [ERROR] {url}: {e}")
         return ""
@@ -6,11 +6,12 @@ Source: https://archive.org/details/ElmaliliKuranTefsiri
 
 import json
 import time
-import urllib.request
-import urllib.error
+import urllib.parse
 import re
 import os
 
+from http_cache import cached_get
+
 # Archive.org item identifier
 ITEM_ID = "ElmaliliKuranTefsiri"
 
@@ -40,13 +41,10 @@ def fetch_text_file(surah_num: int) -> str:
     ]
 
     for pattern in patterns:
-        url = f"https://archive.org/download/{ITEM_ID}/{urllib.request.quote(pattern)}"
+        url = f"https://archive.org/download/{ITEM_ID}/{urllib.parse.quote(pattern)}"
         try:
-            req = urllib.request.Request(url, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
-            with urllib.request.urlopen(req, timeout=30) as response:
-                return response.read().decode('utf-8', errors='replace')
+            # Shared HTTP cache; real requests spaced 0.5s apart
+            return cached_get(url, min_interval=0.5).decode('utf-8', errors='replace')
         except Exception as e:
             continue
 
@@ -57,11 +55,7 @@ def fetch_full_text() -> str:
     # Try to get the combined text file
     url = f"https://archive.org/download/{ITEM_ID}/{ITEM_ID}_djvu.txt"
     try:
-        req = urllib.request.Request(url, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        with urllib.request.urlopen(req, timeout=120) as response:
-            return response.read().decode('utf-8', errors='replace')
+        return cached_get(url, timeout=120).decode('utf-8', errors='replace')
     except Exception as e:
         print(f"Error fetching full text: {e}")
         return ""
@@ -192,8 +186,6 @@ def main():
                     "tefsir": clean_text(text)
                 }
 
-            time.sleep(0.5)
-
         # Save
         output_path = "src/data/quran/elmalili_tefsir_new.json"
         with open(output_path, 'w', encoding='utf-8') as f:
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Shared async fetch engine for the scraper scripts.
+
+- Bounded concurrency (asyncio.Semaphore)
+- Per-host token-bucket rate limiting
+- Retry with jittered exponential backoff (errors, 429, 5xx)
+- Keep-alive connection reuse (one pool of http.client connections per host)
+- Optional shared HTTP cache (http_cache): fresh pages cost no request,
+  stale ones are revalidated with a conditional GET
+
+Only the standard library is used; blocking socket I/O runs in a small
+thread pool sized to the concurrency limit.
+
+Usage:
+    from fetch_engine import FetchEngine, decode_html
+
+    async with FetchEngine(concurrency=6, rate=3.0, cache=default_cache) as engine:
+        results = await engine.fetch_many(urls)
+
+    # or from synchronous code
+    results = fetch_all(urls, concurrency=6, rate=3.0)
+    pages = fetch_pages(urls, concurrency=6, rate=3.0, cache=default_cache)
+"""
+
+import asyncio
+import gzip
+import http.client
+import random
+import ssl
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlsplit
+
+from http_cache import DEFAULT_TTL, HttpCache
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Language': 'tr-TR,tr;q=0.9',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+# Status codes worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a single fetch (status 0 means the request never completed)."""
+    url: str
+    status: int = 0
+    headers: dict = field(default_factory=dict)
+    body: bytes = b""
+    error: str = ""
+    attempts: int = 0
+    from_cache: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def text(self) -> str:
+        return decode_html(self.body)
+
+
+def decode_html(raw_bytes: bytes) -> str:
+    """Decode as UTF-8, falling back to ISO-8859-9 (Turkish)."""
+    try:
+        return raw_bytes.decode('utf-8')
+    except UnicodeDecodeError:
+        return raw_bytes.decode('iso-8859-9')
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, up to `burst` at once."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class _ConnectionPool:
+    """Idle keep-alive connections per (scheme, host)."""
+
+    def __init__(self, timeout: float, ssl_context: Optional[ssl.SSLContext]):
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self._idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def acquire(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop()
+            self.created += 1
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout, context=self.ssl_context)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def release(self, scheme: str, netloc: str, conn: http.client.HTTPConnection):
+        with self._lock:
+            self._idle.setdefault((scheme, netloc), []).append(conn)
+
+    def close(self):
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+            self._idle.clear()
+
+
+class FetchEngine:
+    """Concurrent, rate-limited HTTP GET client."""
+
+    def __init__(self, concurrency: int = 4, rate: float = 2.0, burst: int = 1,
+                 retries: int = 3, backoff: float = 1.0, timeout: float = 30,
+                 headers: Optional[dict] = None, verify_ssl: bool = True,
+                 cache: Optional[HttpCache] = None, ttl: Optional[float] = DEFAULT_TTL):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.cache = cache
+        self.ttl = ttl
+
+        ctx = ssl.create_default_context()
+        if not verify_ssl:
+            ctx.check_hostname = False
+            ctx.verify_mode = ssl.CERT_NONE
+
+        self._pool = _ConnectionPool(timeout, ctx)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._buckets: dict[str, TokenBucket] = {}
+        self.requests = 0
+        self.cache_hits = 0
+        self.revalidated = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._pool.close()
+
+    @property
+    def connections_opened(self) -> int:
+        return self._pool.created
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    def _request(self, url: str, headers: dict) -> tuple[int, dict, bytes]:
+        """Blocking GET on a pooled connection (runs in the thread pool)."""
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        conn = self._pool.acquire(parts.scheme, parts.netloc)
+        reused = conn.sock is not None
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if not reused:
+                raise
+            # Stale keep-alive connection: retry once on a fresh one
+            return self._request(url, headers)
+        except Exception:
+            conn.close()
+            raise
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._pool.release(parts.scheme, parts.netloc, conn)
+
+        encoding = (response.getheader('Content-Encoding') or '').lower()
+        if encoding == 'gzip':
+            body = gzip.decompress(body)
+        elif encoding == 'deflate':
+            body = zlib.decompress(body)
+
+        return response.status, {k.lower(): v for k, v in response.getheaders()}, body
+
+    def _delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Backoff before the next attempt: Retry-After if given, else jittered exponential."""
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    def _from_cache(self, url: str, entry) -> FetchResult:
+        headers = {'content-type': entry.content_type} if entry.content_type else {}
+        return FetchResult(url=url, status=200, headers=headers, body=self.cache.body(entry), from_cache=True)
+
+    async def fetch(self, url: str, headers: Optional[dict] = None) -> FetchResult:
+        """GET a URL with rate limiting and retries (through the cache if set)."""
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry is not None and entry.is_fresh(self.ttl):
+            self.cache_hits += 1
+            return self._from_cache(url, entry)
+
+        result = await self._fetch(url, {**(headers or {}), **HttpCache.conditional_headers(entry)})
+
+        if self.cache is not None:
+            if result.status == 304 and entry is not None:
+                self.revalidated += 1
+                self.cache.touch(entry, result.headers)
+                return self._from_cache(url, entry)
+            if result.ok:
+                self.cache.store(url, result.body, result.headers)
+        return result
+
+    async def _fetch(self, url: str, headers: dict) -> FetchResult:
+        loop = asyncio.get_running_loop()
+        request_headers = {**self.headers, **headers}
+        host = urlsplit(url).netloc
+        result = FetchResult(url=url)
+
+        for attempt in range(self.retries):
+            result.attempts = attempt + 1
+            retry_after = None
+            async with self._semaphore:
+                await self._bucket(host).acquire()
+                self.requests += 1
+                try:
+                    status, response_headers, body = await loop.run_in_executor(
+                        self._executor, self._request, url, request_headers)
+                except Exception as e:
+                    result.error = str(e) or e.__class__.__name__
+                else:
+                    result.status, result.headers, result.body = status, response_headers, body
+                    result.error = ""
+                    if status not in RETRY_STATUSES:
+                        return result
+                    result.error = f"HTTP {status}"
+                    retry_after = response_headers.get('retry-after')
+
+            if attempt < self.retries - 1:
+                await asyncio.sleep(self._delay(attempt, retry_after))
+
+        return result
+
+    async def fetch_many(self, urls: list[str], headers: Optional[dict] = None) -> list[FetchResult]:
+        """Fetch all URLs concurrently; results are in input order."""
+        return await asyncio.gather(*(self.fetch(url, headers) for url in urls))
+
+
+def fetch_all(urls: list[str], **options) -> list[FetchResult]:
+    """Synchronous wrapper around FetchEngine.fetch_many."""
+    async def run():
+        async with FetchEngine(**options) as engine:
+            return await engine.fetch_many(urls)
+
+    return asyncio.run(run())
+
+
+async def fetch_page(engine: FetchEngine, url: str) -> str:
+    """Fetch a page as text ("" on failure)."""
+    result = await engine.fetch(url)
+    if not result.ok:
+        print(f"  Failed: {url} ({result.error or result.status})")
+        return ""
+    return result.text()
+
+
+def fetch_pages(urls: list[str], **options) -> list[str]:
+    """Fetch pages concurrently as text; results are in input order."""
+    async def run():
+        async with FetchEngine(**options) as engine:
+            return await asyncio.gather(*(fetch_page(engine, url) for url in urls))
+
+    return asyncio.run(run())
@@ -1,8 +1,8 @@
 import json
-import urllib.request
 import os
 import re
-import time
+
+from http_cache import cached_get
 
 # Fetch Abdel Haleem translation from Quran.com API (surah by surah)
 BASE_URL = "https://api.quran.com/api/v4/verses/by_chapter"
@@ -16,8 +16,8 @@ for surah_id in range(1, 115):  # 114 surahs
     url = f"{BASE_URL}/{surah_id}?translations={TRANSLATION_ID}&per_page=300"
 
     try:
-        with urllib.request.urlopen(url) as response:
-            data = json.loads(response.read().decode())
+        # Shared HTTP cache; at least 0.1s between real requests to avoid rate limiting
+        data = json.loads(cached_get(url, min_interval=0.1).decode())
 
         verses = data.get("verses", [])
         all_translations[surah_id] = {}
@@ -36,9 +36,6 @@ for surah_id in range(1, 115):  # 114 surahs
 
         print(f"Surah {surah_id}: {len(verses)} verses")
 
-        # Small delay to avoid rate limiting
-        time.sleep(0.1)
-
     except Exception as e:
         print(f"Error fetching surah {surah_id}: {e}")
 
@@ -2,23 +2,28 @@
 """
 Kur'an Yolu Tefsiri Fetcher
 Scrapes Kur'an Yolu Tefsiri from kuran.diyanet.gov.tr
+(surahs fetched concurrently through the shared rate-limited fetch_engine)
 
 Output: kuranyolu_commentary.json
 """
 
+import asyncio
 import json
 import re
-import os
-import time
-import urllib.request
 from pathlib import Path
 from html import unescape
 
+from fetch_engine import FetchEngine, fetch_page
+from http_cache import default_cache
+
 # Configuration
 SCRIPT_DIR = Path(__file__).parent
 OUTPUT_DIR = SCRIPT_DIR.parent / "src" / "data" / "quran"
 OUTPUT_FILE = OUTPUT_DIR / "kuranyolu_commentary.json"
-CACHE_DIR = SCRIPT_DIR / "cache_kuranyolu"
+
+# Politeness: parallel requests and requests/second per host
+FETCH_CONCURRENCY = 6
+FETCH_RATE = 3.0
 
 # Diyanet URL template
 # Example: https://kuran.diyanet.gov.tr/mushaf/kuran-tefsir-1/fatiha-suresi-1/ayet-1/diyanet-isleri-baskanligi-meali-1
@@ -156,31 +161,6 @@ def clean_html(text: str) -> str:
     return text.strip()
 
 
-def fetch_page(url: str, cache_file: Path) -> str:
-    """Fetch page content with caching."""
-    if cache_file.exists():
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            return f.read()
-
-    try:
-        req = urllib.request.Request(url, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
-        })
-        with urllib.request.urlopen(req, timeout=30) as response:
-            content = response.read().decode('utf-8')
-
-        cache_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            f.write(content)
-
-        return content
-    except Exception as e:
-        print(f"Error fetching {url}: {e}")
-        return ""
-
-
 def extract_tefsir_from_page(html: str) -> dict:
     """Extract tefsir data from page HTML."""
     tefsir_data = {}
@@ -215,16 +195,15 @@ def extract_tefsir_from_page(html: str) -> dict:
     return tefsir_data
 
 
-def fetch_surah_tefsir(surah_id: int, surah_slug: str, verse_count: int) -> dict:
+async def fetch_surah_tefsir(engine: FetchEngine, surah_id: int, surah_slug: str, verse_count: int) -> dict:
     """Fetch all tefsir for a surah."""
     tefsir = {}
 
     # Fetch first verse page to get all tefsir (usually all verses are on page)
     url = BASE_URL.format(surah_slug=surah_slug, surah_id=surah_id, verse_id=1)
-    cache_file = CACHE_DIR / f"surah_{surah_id:03d}.html"
 
     print(f"  Fetching surah {surah_id} ({surah_slug})...")
-    html = fetch_page(url, cache_file)
+    html = await fetch_page(engine, url)
 
     if html:
         tefsir = extract_tefsir_from_page(html)
@@ -235,15 +214,12 @@ def fetch_surah_tefsir(surah_id: int, surah_slug: str, verse_count: int) -> dict
         for verse_id in range(1, verse_count + 1):
             if str(verse_id) not in tefsir:
                 url = BASE_URL.format(surah_slug=surah_slug, surah_id=surah_id, verse_id=verse_id)
-                cache_file = CACHE_DIR / f"surah_{surah_id:03d}_verse_{verse_id:03d}.html"
 
-                html = fetch_page(url, cache_file)
+                html = await fetch_page(engine, url)
                 if html:
                     verse_tefsir = extract_tefsir_from_page(html)
                     tefsir.update(verse_tefsir)
 
-                time.sleep(0.5)  # Be polite to the server
-
     return tefsir
 
 
@@ -267,34 +243,37 @@ def create_output(commentary: dict) -> dict:
     }
 
 
-def main():
-    print("=" * 60)
-    print("Kur'an Yolu Tefsiri Fetcher (from kuran.diyanet.gov.tr)")
-    print("=" * 60)
-
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-
-    all_commentary = {}
-    total_verses = 0
+async def fetch_all_surahs(all_commentary: dict):
+    """Fetch every surah concurrently through one shared engine."""
+    total_verses = sum(verse_count for _, _, _, verse_count in SURAHS)
     found_verses = 0
 
-    for surah_id, surah_slug, surah_name, verse_count in SURAHS:
-        total_verses += verse_count
+    async def fetch_one(surah_id, surah_slug, surah_name, verse_count):
         print(f"\nProcessing {surah_id}. {surah_name} ({verse_count} verses)...")
+        return surah_id, await fetch_surah_tefsir(engine, surah_id, surah_slug, verse_count)
+
+    async with FetchEngine(concurrency=FETCH_CONCURRENCY, rate=FETCH_RATE, cache=default_cache) as engine:
+        tasks = [fetch_one(*s) for s in SURAHS]
+        for done, task in enumerate(asyncio.as_completed(tasks), 1):
+            surah_id, tefsir = await task
 
-        tefsir = fetch_surah_tefsir(surah_id, surah_slug, verse_count)
+            for verse_num, text in tefsir.items():
+                key = f"{surah_id}:{verse_num}"
+                all_commentary[key] = text
+                found_verses += 1
 
-        for verse_num, text in tefsir.items():
-            key = f"{surah_id}:{verse_num}"
-            all_commentary[key] = text
-            found_verses += 1
+            # Progress update
+            progress = (done / 114) * 100
+            print(f"  Progress: {progress:.1f}% ({found_verses}/{total_verses} verses)")
 
-        # Progress update
-        progress = (surah_id / 114) * 100
-        print(f"  Progress: {progress:.1f}% ({found_verses}/{total_verses} verses)")
 
-        # Small delay between surahs
-        time.sleep(0.3)
+def main():
+    print("=" * 60)
+    print("Kur'an Yolu Tefsiri Fetcher (from kuran.diyanet.gov.tr)")
+    print("=" * 60)
+
+    all_commentary = {}
+    asyncio.run(fetch_all_surahs(all_commentary))
 
     # Create output
     output = create_output(all_commentary)
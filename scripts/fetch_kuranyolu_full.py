@@ -2,23 +2,29 @@
 """
 Kur'an Yolu Tefsiri Fetcher - Full Version
 Fetches multiple pages per surah to get complete tefsir data.
+Surahs are fetched concurrently (pages within a surah stay sequential)
+through the shared rate-limited fetch_engine.
 
 Output: kuranyolu_commentary.json
 """
 
+import asyncio
 import json
 import re
-import time
-import urllib.request
-import ssl
 from pathlib import Path
 from html import unescape
 
+from fetch_engine import FetchEngine, fetch_page
+from http_cache import default_cache
+
 # Configuration
 SCRIPT_DIR = Path(__file__).parent
 OUTPUT_DIR = SCRIPT_DIR.parent / "src" / "data" / "quran"
 OUTPUT_FILE = OUTPUT_DIR / "kuranyolu_commentary.json"
-CACHE_DIR = SCRIPT_DIR / "cache_kuranyolu_full"
+
+# Politeness: parallel requests and requests/second per host
+FETCH_CONCURRENCY = 6
+FETCH_RATE = 3.0
 
 # URL pattern - fetches tefsir for specific verse
 BASE_URL = "https://kuran.diyanet.gov.tr/mushaf/kuran-tefsir-1/{surah_slug}-suresi-{surah_id}/ayet-{verse_id}/diyanet-isleri-baskanligi-meali-1"
@@ -156,45 +162,6 @@ def clean_html(text: str) -> str:
     return text.strip()
 
 
-def fetch_page(url: str, cache_file: Path, retries: int = 3) -> str:
-    """Fetch page with retries and proper encoding."""
-    if cache_file.exists():
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            return f.read()
-
-    ctx = ssl.create_default_context()
-    ctx.check_hostname = False
-    ctx.verify_mode = ssl.CERT_NONE
-
-    for attempt in range(retries):
-        try:
-            req = urllib.request.Request(url, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'text/html,application/xhtml+xml',
-                'Accept-Language': 'tr-TR,tr;q=0.9',
-                'Connection': 'keep-alive',
-            })
-
-            with urllib.request.urlopen(req, timeout=30, context=ctx) as response:
-                raw_bytes = response.read()
-                try:
-                    content = raw_bytes.decode('utf-8')
-                except UnicodeDecodeError:
-                    content = raw_bytes.decode('iso-8859-9')
-
-            cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                f.write(content)
-
-            return content
-
-        except Exception as e:
-            if attempt < retries - 1:
-                time.sleep(2 ** attempt)
-
-    return ""
-
-
 def extract_tefsir(html: str, surah_id: int) -> dict:
     """Extract tefsir data from HTML."""
     tefsir = {}
@@ -240,7 +207,7 @@ def parse_verse_key(key: str) -> list:
         return []
 
 
-def fetch_surah_complete(surah_id: int, slug: str, name: str, verse_count: int, all_commentary: dict) -> int:
+async def fetch_surah_complete(engine: FetchEngine, surah_id: int, slug: str, name: str, verse_count: int, all_commentary: dict) -> int:
     """Fetch complete tefsir for a surah by fetching multiple pages."""
     found_verses = set()
 
@@ -266,9 +233,8 @@ def fetch_surah_complete(surah_id: int, slug: str, name: str, verse_count: int,
             continue
 
         url = BASE_URL.format(surah_slug=slug, surah_id=surah_id, verse_id=verse_id)
-        cache_file = CACHE_DIR / f"surah_{surah_id:03d}_v{verse_id:03d}.html"
 
-        html = fetch_page(url, cache_file)
+        html = await fetch_page(engine, url)
         if html:
             tefsir = extract_tefsir(html, surah_id)
             for key, text in tefsir.items():
@@ -278,8 +244,6 @@ def fetch_surah_complete(surah_id: int, slug: str, name: str, verse_count: int,
                         found_verses.add(v)
                     new_count += 1
 
-        time.sleep(0.5)  # Be nice to server
-
     return new_count
 
 
@@ -306,13 +270,31 @@ def save_progress(all_commentary: dict, surahs_done: int):
         json.dump(output, f, ensure_ascii=False, indent=2)
 
 
+async def fetch_pending(pending: list, all_commentary: dict):
+    """Fetch the given surahs concurrently, saving progress every 5 finished surahs."""
+    async def fetch_one(i, surah_id, slug, name, verse_count):
+        new_count = await fetch_surah_complete(engine, surah_id, slug, name, verse_count, all_commentary)
+        return i, surah_id, name, verse_count, new_count
+
+    async with FetchEngine(concurrency=FETCH_CONCURRENCY, rate=FETCH_RATE, verify_ssl=False, cache=default_cache) as engine:
+        tasks = [fetch_one(*surah) for surah in pending]
+        for done, task in enumerate(asyncio.as_completed(tasks), 1):
+            i, surah_id, name, verse_count, new_count = await task
+
+            total_for_surah = sum(1 for k in all_commentary if k.startswith(f"{surah_id}:"))
+            print(f"[{i+1}/114] {surah_id}. {name}: {total_for_surah}/{verse_count} verses (+{new_count} new)")
+
+            # Save progress every 5 surahs
+            if done % 5 == 0:
+                save_progress(all_commentary, done)
+                print(f"  [Saved: {len(all_commentary)} total verses]")
+
+
 def main():
     print("=" * 60)
     print("Kur'an Yolu Tefsiri - Full Fetcher")
     print("=" * 60)
 
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-
     # Load existing data
     all_commentary = {}
     if OUTPUT_FILE.exists():
@@ -326,6 +308,7 @@ def main():
 
     initial_count = len(all_commentary)
 
+    pending = []
     for i, (surah_id, slug, name, verse_count) in enumerate(SURAHS):
         # Count existing verses for this surah
         existing = sum(1 for k in all_commentary if k.startswith(f"{surah_id}:"))
@@ -334,17 +317,10 @@ def main():
             print(f"[{i+1}/114] {surah_id}. {name}: {existing}/{verse_count} (skipped)")
             continue
 
-        print(f"[{i+1}/114] {surah_id}. {name}...", end=" ", flush=True)
-
-        new_count = fetch_surah_complete(surah_id, slug, name, verse_count, all_commentary)
-
-        total_for_surah = sum(1 for k in all_commentary if k.startswith(f"{surah_id}:"))
-        print(f"{total_for_surah}/{verse_count} verses (+{new_count} new)")
+        pending.append((i, surah_id, slug, name, verse_count))
 
-        # Save progress every 5 surahs
-        if (i + 1) % 5 == 0:
-            save_progress(all_commentary, i + 1)
-            print(f"  [Saved: {len(all_commentary)} total verses]")
+    print(f"\nFetching {len(pending)} surahs ({FETCH_CONCURRENCY} parallel, {FETCH_RATE}/s)...")
+    asyncio.run(fetch_pending(pending, all_commentary))
 
     # Final save
     save_progress(all_commentary, 114)
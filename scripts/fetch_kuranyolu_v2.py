@@ -1,25 +1,28 @@
 #!/usr/bin/env python3
 """
 Kur'an Yolu Tefsiri Fetcher v2
-Faster version using concurrent requests and proper encoding.
+Faster version using concurrent, rate-limited requests (fetch_engine).
 
 Output: kuranyolu_commentary.json
 """
 
+import asyncio
 import json
 import re
-import os
-import time
-import urllib.request
 from pathlib import Path
 from html import unescape
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from fetch_engine import FetchEngine, fetch_page
+from http_cache import default_cache
 
 # Configuration
 SCRIPT_DIR = Path(__file__).parent
 OUTPUT_DIR = SCRIPT_DIR.parent / "src" / "data" / "quran"
 OUTPUT_FILE = OUTPUT_DIR / "kuranyolu_commentary.json"
-CACHE_DIR = SCRIPT_DIR / "cache_kuranyolu_v2"
+
+# Politeness: parallel requests and requests/second per host
+FETCH_CONCURRENCY = 6
+FETCH_RATE = 3.0
 
 # Base URL - tefsir mode
 BASE_URL = "https://kuran.diyanet.gov.tr/mushaf/kuran-tefsir-1/{surah_slug}-suresi-{surah_id}/ayet-1/diyanet-isleri-baskanligi-meali-1"
@@ -160,38 +163,6 @@ def clean_html(text: str) -> str:
     return text.strip()
 
 
-def fetch_page(url: str, cache_file: Path) -> str:
-    """Fetch page content with caching and proper encoding."""
-    if cache_file.exists():
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            return f.read()
-
-    try:
-        req = urllib.request.Request(url, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-            'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'identity',  # No compression to avoid encoding issues
-        })
-        with urllib.request.urlopen(req, timeout=30) as response:
-            # Read as bytes first
-            raw_bytes = response.read()
-            # Try UTF-8 first, fallback to ISO-8859-9 (Turkish)
-            try:
-                content = raw_bytes.decode('utf-8')
-            except UnicodeDecodeError:
-                content = raw_bytes.decode('iso-8859-9')
-
-        cache_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            f.write(content)
-
-        return content
-    except Exception as e:
-        print(f"Error fetching {url}: {e}")
-        return ""
-
-
 def extract_tefsir_from_page(html: str, surah_id: int) -> dict:
     """Extract tefsir data from page HTML."""
     tefsir_data = {}
@@ -225,15 +196,13 @@ def extract_tefsir_from_page(html: str, surah_id: int) -> dict:
     return tefsir_data
 
 
-def fetch_surah_tefsir(surah_info: tuple) -> dict:
+async def fetch_surah_tefsir(engine: FetchEngine, surah_info: tuple) -> dict:
     """Fetch all tefsir for a surah."""
     surah_id, surah_slug, surah_name, verse_count = surah_info
     tefsir = {}
 
     url = BASE_URL.format(surah_slug=surah_slug, surah_id=surah_id)
-    cache_file = CACHE_DIR / f"surah_{surah_id:03d}.html"
-
-    html = fetch_page(url, cache_file)
+    html = await fetch_page(engine, url)
     if html:
         tefsir = extract_tefsir_from_page(html, surah_id)
 
@@ -261,23 +230,23 @@ def create_output(commentary: dict) -> dict:
     }
 
 
+async def fetch_all_surahs() -> dict:
+    """Fetch every surah concurrently through one shared engine."""
+    all_commentary = {}
+    async with FetchEngine(concurrency=FETCH_CONCURRENCY, rate=FETCH_RATE, cache=default_cache) as engine:
+        tasks = [fetch_surah_tefsir(engine, s) for s in SURAHS]
+        for tefsir in asyncio.as_completed(tasks):
+            all_commentary.update(await tefsir)
+    return all_commentary
+
+
 def main():
     print("=" * 60)
     print("Kur'an Yolu Tefsiri Fetcher v2")
     print("=" * 60)
 
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-
-    all_commentary = {}
-
-    # Use thread pool for concurrent fetching
-    print("\nFetching surahs concurrently...")
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        futures = {executor.submit(fetch_surah_tefsir, s): s for s in SURAHS}
-
-        for future in as_completed(futures):
-            tefsir = future.result()
-            all_commentary.update(tefsir)
+    print(f"\nFetching surahs concurrently ({FETCH_CONCURRENCY} parallel, {FETCH_RATE}/s)...")
+    all_commentary = asyncio.run(fetch_all_surahs())
 
     # Ensure output directory exists
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
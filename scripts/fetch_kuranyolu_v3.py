@@ -1,24 +1,27 @@
 #!/usr/bin/env python3
 """
 Kur'an Yolu Tefsiri Fetcher v3
-Sequential fetching with proper delays.
+Concurrent, rate-limited fetching via fetch_engine.
 
 Output: kuranyolu_commentary.json
 """
 
 import json
 import re
-import time
-import urllib.request
-import ssl
 from pathlib import Path
 from html import unescape
 
+from fetch_engine import fetch_pages
+from http_cache import default_cache
+
 # Configuration
 SCRIPT_DIR = Path(__file__).parent
 OUTPUT_DIR = SCRIPT_DIR.parent / "src" / "data" / "quran"
 OUTPUT_FILE = OUTPUT_DIR / "kuranyolu_commentary.json"
-CACHE_DIR = SCRIPT_DIR / "cache_kuranyolu_v3"
+
+# Politeness: parallel requests and requests/second per host
+FETCH_CONCURRENCY = 6
+FETCH_RATE = 3.0
 
 # Base URL - tefsir mode
 BASE_URL = "https://kuran.diyanet.gov.tr/mushaf/kuran-tefsir-1/{surah_slug}-suresi-{surah_id}/ayet-1/diyanet-isleri-baskanligi-meali-1"
@@ -156,47 +159,6 @@ def clean_html(text: str) -> str:
     return text.strip()
 
 
-def fetch_page(url: str, cache_file: Path, retries: int = 3) -> str:
-    """Fetch page with retries and proper encoding."""
-    if cache_file.exists():
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            return f.read()
-
-    # Create SSL context that doesn't verify
-    ctx = ssl.create_default_context()
-    ctx.check_hostname = False
-    ctx.verify_mode = ssl.CERT_NONE
-
-    for attempt in range(retries):
-        try:
-            req = urllib.request.Request(url, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'text/html,application/xhtml+xml',
-                'Accept-Language': 'tr-TR,tr;q=0.9',
-                'Connection': 'keep-alive',
-            })
-
-            with urllib.request.urlopen(req, timeout=30, context=ctx) as response:
-                raw_bytes = response.read()
-                try:
-                    content = raw_bytes.decode('utf-8')
-                except UnicodeDecodeError:
-                    content = raw_bytes.decode('iso-8859-9')
-
-            cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                f.write(content)
-
-            return content
-
-        except Exception as e:
-            print(f"  Attempt {attempt+1} failed: {e}")
-            if attempt < retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
-
-    return ""
-
-
 def extract_tefsir(html: str, surah_id: int) -> dict:
     """Extract tefsir data from HTML."""
     tefsir = {}
@@ -228,19 +190,18 @@ def extract_tefsir(html: str, surah_id: int) -> dict:
 
 def main():
     print("=" * 60)
-    print("Kur'an Yolu Tefsiri Fetcher v3 (Sequential)")
+    print("Kur'an Yolu Tefsiri Fetcher v3")
     print("=" * 60)
 
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
     all_commentary = {}
 
-    for i, (surah_id, slug, name, verse_count) in enumerate(SURAHS):
-        print(f"\n[{i+1}/114] {surah_id}. {name}...")
+    urls = [BASE_URL.format(surah_slug=slug, surah_id=surah_id) for surah_id, slug, name, verse_count in SURAHS]
+    print(f"\nFetching {len(urls)} pages ({FETCH_CONCURRENCY} parallel, {FETCH_RATE}/s)...")
+    htmls = fetch_pages(urls, concurrency=FETCH_CONCURRENCY, rate=FETCH_RATE, verify_ssl=False, cache=default_cache)
 
-        url = BASE_URL.format(surah_slug=slug, surah_id=surah_id)
-        cache_file = CACHE_DIR / f"surah_{surah_id:03d}.html"
+    for i, ((surah_id, slug, name, verse_count), html) in enumerate(zip(SURAHS, htmls)):
+        print(f"\n[{i+1}/114] {surah_id}. {name}...")
 
-        html = fetch_page(url, cache_file)
         if html:
             tefsir = extract_tefsir(html, surah_id)
             all_commentary.update(tefsir)
@@ -271,9 +232,6 @@ def main():
                 json.dump(output, f, ensure_ascii=False, indent=2)
             print(f"  [Saved progress: {len(all_commentary)} verses]")
 
-        # Delay between requests
-        time.sleep(1)
-
     # Final save
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     output = {
@@ -1,7 +1,8 @@
 import json
-import urllib.request
 import os
 
+from http_cache import cached_get
+
 # Fetch Study Quran from fawazahmed0/quran-api
 # Source: https://github.com/fawazahmed0/quran-api
 
@@ -9,10 +10,9 @@ API_URL = "https://cdn.jsdelivr.net/gh/fawazahmed0/quran-api@1/editions/eng-thes
 
 print("Fetching Study Quran from API...")
 
-# Fetch the data
-with urllib.request.urlopen(API_URL) as response:
-    raw_data = json.loads(response.read().decode('utf-8'))
-    data = raw_data['quran']  # Data is under 'quran' key
+# Fetch the data (shared HTTP cache, revalidated with a conditional GET)
+raw_data = json.loads(cached_get(API_URL).decode('utf-8'))
+data = raw_data['quran']  # Data is under 'quran' key
 
 print(f"Received {len(data)} verses")
 
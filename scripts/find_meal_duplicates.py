@@ -6,71 +6,48 @@ This happens when the translator combined multiple verses into one sentence.
 
 import json
 from pathlib import Path
-from collections import defaultdict
+
+from verse_ranges import DATA_DIR, source_ranges
 
 SCRIPT_DIR = Path(__file__).parent
-DATA_DIR = SCRIPT_DIR.parent / "src" / "data" / "quran"
 
 def main():
-    # Load Turkish translation
+    # Load Turkish translation (surah names) and Arabic text
     with open(DATA_DIR / "quran_turkish.json", "r", encoding="utf-8") as f:
         turkish_data = json.load(f)
 
-    # Load Arabic text
     with open(DATA_DIR / "quran_arabic.json", "r", encoding="utf-8") as f:
         arabic_data = json.load(f)
 
+    surah_names = {surah["id"]: surah["transliteration"] for surah in turkish_data}
+    arabic = {
+        (surah["id"], verse["id"]): verse["text"] for surah in arabic_data for verse in surah["verses"]
+    }
+
     print("=" * 70)
     print("Aynı Türkçe Meale Sahip Farklı Ayetler")
     print("=" * 70)
 
     duplicates = []
 
-    for surah in turkish_data:
-        surah_id = surah["id"]
-        surah_name = surah["transliteration"]
-        verses = surah["verses"]
-
-        # Find Arabic surah
-        arabic_surah = next((s for s in arabic_data if s["id"] == surah_id), None)
-        if not arabic_surah:
+    # Groups of consecutive verses with the same translation
+    for verse_range in source_ranges("diyanet"):
+        surah_id = verse_range.surah
+        verse_nums = list(range(verse_range.start, verse_range.end + 1))
+        arabic_texts = [arabic.get((surah_id, num)) for num in verse_nums]
+        if None in arabic_texts:
             continue
 
-        # Group consecutive verses with same translation
-        i = 0
-        while i < len(verses):
-            current_translation = verses[i].get("translation", "")
-            if not current_translation:
-                i += 1
-                continue
-
-            # Find all consecutive verses with same translation
-            group = [i]
-            j = i + 1
-            while j < len(verses):
-                next_translation = verses[j].get("translation", "")
-                if next_translation == current_translation:
-                    group.append(j)
-                    j += 1
-                else:
-                    break
-
-            # If we found a group of 2+ verses with same translation
-            if len(group) > 1:
-                verse_nums = [verses[idx]["id"] for idx in group]
-                arabic_texts = [arabic_surah["verses"][idx]["text"] for idx in group]
-
-                # Verify Arabic texts are actually different
-                if len(set(arabic_texts)) > 1:  # Different Arabic texts
-                    duplicates.append({
-                        "surah_id": surah_id,
-                        "surah_name": surah_name,
-                        "verses": verse_nums,
-                        "translation": current_translation[:100] + "..." if len(current_translation) > 100 else current_translation,
-                        "arabic_count": len(set(arabic_texts))
-                    })
-
-            i = j if j > i else i + 1
+        # Verify Arabic texts are actually different
+        if len(set(arabic_texts)) > 1:  # Different Arabic texts
+            current_translation = verse_range.text
+            duplicates.append({
+                "surah_id": surah_id,
+                "surah_name": surah_names[surah_id],
+                "verses": verse_nums,
+                "translation": current_translation[:100] + "..." if len(current_translation) > 100 else current_translation,
+                "arabic_count": len(set(arabic_texts))
+            })
 
     # Print results
     total_affected = 0
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP cache for the scraper scripts.
+
+Entries are keyed by the SHA-256 of the URL and point to gzip-compressed
+bodies stored by the SHA-256 of their content (identical pages share one
+blob). Each entry keeps the ETag / Last-Modified validators, so once the
+TTL has expired the page is revalidated with a conditional GET and an
+unchanged page costs only a 304 response.
+
+Layout (scripts/.http_cache/):
+    entries/<ab>/<url-hash>.json   url, validators, fetched_at, blob hash
+    blobs/<ab>/<body-hash>.gz      compressed body
+
+Usage:
+    from http_cache import cached_get
+
+    body = cached_get(url)                    # bytes; fetched once per TTL
+
+    python http_cache.py                      # entry/blob counts and sizes
+    python http_cache.py --prune              # remove unreferenced blobs
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, asdict
+from email.utils import formatdate
+from pathlib import Path
+from typing import Optional
+
+CACHE_DIR = Path(__file__).parent / ".http_cache"
+
+# Entries younger than this are served without contacting the server
+DEFAULT_TTL = 7 * 24 * 3600
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class CacheEntry:
+    """Metadata of a cached response."""
+    url: str
+    blob: str
+    size: int
+    fetched_at: float
+    etag: str = ""
+    last_modified: str = ""
+    content_type: str = ""
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def is_fresh(self, ttl: Optional[float]) -> bool:
+        """ttl=None: never expires, ttl=0: always revalidate."""
+        return ttl is None or self.age() < ttl
+
+
+class HttpCache:
+    """URL-keyed response cache with content-addressed compressed bodies."""
+
+    def __init__(self, root: Path = CACHE_DIR):
+        self.root = Path(root)
+
+    def _entry_path(self, url: str) -> Path:
+        key = _sha256(url.encode('utf-8'))
+        return self.root / "entries" / key[:2] / f"{key}.json"
+
+    def _blob_path(self, blob: str) -> Path:
+        return self.root / "blobs" / blob[:2] / f"{blob}.gz"
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Cached entry for a URL (None if missing or its blob is gone)."""
+        try:
+            with open(self._entry_path(url), 'r', encoding='utf-8') as f:
+                entry = CacheEntry(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+        if entry.url != url or not self._blob_path(entry.blob).exists():
+            return None
+        return entry
+
+    def body(self, entry: CacheEntry) -> bytes:
+        with open(self._blob_path(entry.blob), 'rb') as f:
+            return gzip.decompress(f.read())
+
+    def store(self, url: str, body: bytes, headers: dict) -> CacheEntry:
+        """Save a 200 response; headers are matched case-insensitively."""
+        headers = {k.lower(): v for k, v in headers.items()}
+        blob = _sha256(body)
+        blob_path = self._blob_path(blob)
+        if not blob_path.exists():
+            _write_atomic(blob_path, gzip.compress(body, compresslevel=6))
+
+        entry = CacheEntry(
+            url=url,
+            blob=blob,
+            size=len(body),
+            fetched_at=time.time(),
+            etag=headers.get('etag', ""),
+            last_modified=headers.get('last-modified', ""),
+            content_type=headers.get('content-type', ""),
+        )
+        self._save_entry(entry)
+        return entry
+
+    def touch(self, entry: CacheEntry, headers: Optional[dict] = None) -> CacheEntry:
+        """Mark an entry as revalidated (after a 304), updating validators if sent."""
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        entry.fetched_at = time.time()
+        entry.etag = headers.get('etag', entry.etag)
+        entry.last_modified = headers.get('last-modified', entry.last_modified)
+        self._save_entry(entry)
+        return entry
+
+    def _save_entry(self, entry: CacheEntry):
+        data = json.dumps(asdict(entry), ensure_ascii=False).encode('utf-8')
+        _write_atomic(self._entry_path(entry.url), data)
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> dict:
+        """If-None-Match / If-Modified-Since for revalidating an entry."""
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        elif not entry.etag:
+            headers['If-Modified-Since'] = formatdate(entry.fetched_at, usegmt=True)
+        return headers
+
+    def stats(self) -> dict:
+        entries = list((self.root / "entries").glob("*/*.json"))
+        blobs = list((self.root / "blobs").glob("*/*.gz"))
+        raw = 0
+        for path in entries:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    raw += json.load(f).get('size', 0)
+            except (OSError, ValueError):
+                pass
+        return {
+            "entries": len(entries),
+            "blobs": len(blobs),
+            "raw_bytes": raw,
+            "stored_bytes": sum(p.stat().st_size for p in blobs),
+        }
+
+    def prune(self) -> int:
+        """Delete blobs no entry refers to; returns the number removed."""
+        referenced = set()
+        for path in (self.root / "entries").glob("*/*.json"):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    referenced.add(json.load(f)['blob'])
+            except (OSError, ValueError, KeyError):
+                pass
+        removed = 0
+        for path in (self.root / "blobs").glob("*/*.gz"):
+            if path.stem not in referenced:
+                path.unlink()
+                removed += 1
+        return removed
+
+
+# Shared default cache
+default_cache = HttpCache()
+
+_last_request = 0.0
+_request_lock = threading.Lock()
+
+
+def _wait_interval(min_interval: float):
+    """Keep at least min_interval seconds between network requests."""
+    global _last_request
+    with _request_lock:
+        delay = _last_request + min_interval - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        _last_request = time.monotonic()
+
+
+def cached_get(url: str, headers: Optional[dict] = None, ttl: Optional[float] = DEFAULT_TTL,
+               timeout: float = 30, cache: Optional[HttpCache] = None, min_interval: float = 0) -> bytes:
+    """
+    GET a URL through the cache (blocking, urllib).
+
+    Fresh entries are returned without a request; stale ones are revalidated
+    with a conditional GET. min_interval spaces out real network requests
+    only (cache hits are not delayed). HTTP/network errors are raised as
+    with urlopen.
+    """
+    cache = cache or default_cache
+    entry = cache.lookup(url)
+    if entry is not None and entry.is_fresh(ttl):
+        return cache.body(entry)
+
+    if min_interval:
+        _wait_interval(min_interval)
+
+    request_headers = {'User-Agent': USER_AGENT, **(headers or {}), **cache.conditional_headers(entry)}
+    req = urllib.request.Request(url, headers=request_headers)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            body = response.read()
+            if response.headers.get('Content-Encoding', '').lower() == 'gzip':
+                body = gzip.decompress(body)
+            cache.store(url, body, dict(response.headers))
+            return body
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and entry is not None:
+            cache.touch(entry, dict(e.headers))
+            return cache.body(entry)
+        raise
+
+
+def main():
+    cache = default_cache
+    if len(sys.argv) > 1 and sys.argv[1] == "--prune":
+        print(f"Removed {cache.prune()} unreferenced blobs")
+        return
+
+    stats = cache.stats()
+    print(f"Cache: {cache.root}")
+    print(f"Entries: {stats['entries']}, blobs: {stats['blobs']}")
+    print(f"Raw: {stats['raw_bytes']:,} bytes, stored: {stats['stored_bytes']:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,15 @@ import json
 import re
 import os
 
+from verse_extractor import SourceText, section_table
+
 # Final Clear Quran parser - merges multiple sources and handles edge cases
 
 print("Reading source files...")
 
-# Read alternative source
+# Alternative source (memory-mapped; only each surah's section is decoded)
 alt_path = os.path.join(os.path.dirname(__file__), "clear_quran_alt.txt")
-with open(alt_path, "r", encoding="utf-8") as f:
-    alt_content = f.read()
-
-# Read original source (if exists)
-raw_path = os.path.join(os.path.dirname(__file__), "clear_quran_raw.txt")
-raw_content = ""
-if os.path.exists(raw_path):
-    with open(raw_path, "r", encoding="utf-8") as f:
-        raw_content = f.read()
+alt_source = SourceText(alt_path)
 
 # Load existing parsed data to merge
 existing_path = os.path.join(os.path.dirname(__file__), "..", "src", "data", "quran", "quran_clearquran.json")
@@ -41,30 +35,6 @@ VERSE_COUNTS = {
     111: 5, 112: 4, 113: 5, 114: 6
 }
 
-# Known start positions in alt_content for problematic surahs
-KNOWN_POSITIONS = {
-    3: 113885,    # Ali-Imran
-    51: 883643,   # Scattering Winds
-    54: 900176,   # The Moon
-    58: 925585,   # Pleading Woman
-    74: 992659,   # One Covered Up
-    82: 1017483,  # Sky Splitting Open
-    86: 1025727,  # Nightly Star
-    103: 1047124, # Passage of Time
-    108: 1050743, # Abundant Goodness
-    109: 1051526, # The Disbelievers
-    110: 1052275, # The Ultimate Help
-    111: 1053011, # Palm Fibre
-    112: 1053679, # Purity of Faith
-    113: 1054233, # The Daybreak
-    114: 1054765, # Humankind
-}
-
-# Known end positions for surahs where auto-detection fails
-KNOWN_END_POSITIONS = {
-    54: 905807,   # The Moon ends before Ar-Rahman
-}
-
 # Surah name patterns
 SURAH_PATTERNS = {
     1: [r"The Opening", r"Al-Fatihah"],
@@ -184,37 +154,16 @@ SURAH_PATTERNS = {
 }
 
 
-def find_surah_start(content, surah_num, min_pos=30000):
-    """Find where a surah's content starts."""
-    # Check known positions first
-    if surah_num in KNOWN_POSITIONS:
-        return KNOWN_POSITIONS[surah_num]
+def find_surah_sections(source):
+    """Surah -> (start, end) byte offsets, from one forward scan of the source.
 
-    patterns = SURAH_PATTERNS.get(surah_num, [])
-    for pattern in patterns:
-        for m in re.finditer(pattern, content[min_pos:], re.IGNORECASE):
-            pos = min_pos + m.start()
-            context = content[pos:pos + 500]
-            # Verify this is a surah header (has Meccan/Medinan indicator)
-            if re.search(r'(Meccan|Medinan|Medin?ian|s.rah)', context, re.IGNORECASE):
-                return pos
-    return None
-
-
-def find_surah_end(content, surah_num, start_pos):
-    """Find where a surah's content ends."""
-    # Check known end positions first
-    if surah_num in KNOWN_END_POSITIONS:
-        return KNOWN_END_POSITIONS[surah_num]
-
-    next_surah = surah_num + 1
-    if next_surah > 114:
-        return len(content)
-
-    next_start = find_surah_start(content, next_surah, start_pos + 500)
-    if next_start:
-        return next_start
-    return len(content)
+    A heading counts when a Meccan/Medinan/surah marker follows it; the table
+    of contents (first 30000 characters) is skipped.
+    """
+    return section_table(
+        source, SURAH_PATTERNS,
+        verify=r'(Meccan|Medinan|Medin?ian|s.rah)', window=500, min_pos=30000,
+    )
 
 
 def extract_verses(text, expected_count):
@@ -268,6 +217,9 @@ MANUAL_VERSES = {
 # Parse surahs
 all_translations = {}
 
+print("Locating surah sections...")
+sections = find_surah_sections(alt_source)
+
 print("Parsing surahs...")
 
 for surah_num in range(1, 115):
@@ -280,11 +232,9 @@ for surah_num in range(1, 115):
         continue
 
     # Find and extract from alt source
-    start = find_surah_start(alt_content, surah_num)
-    if start:
-        end = find_surah_end(alt_content, surah_num, start)
-        surah_text = alt_content[start:end]
-        verses = extract_verses(surah_text, expected)
+    if surah_num in sections:
+        start, end = sections[surah_num]
+        verses = extract_verses(alt_source.text(start, end), expected)
 
         if verses:
             all_translations[surah_num] = {str(k): v for k, v in verses.items()}
@@ -302,6 +252,8 @@ for surah_num in range(1, 115):
         else:
             print(f"Surah {surah_num}: NOT FOUND")
 
+alt_source.close()
+
 # Merge with existing data for missing verses
 print("\nMerging with existing data for missing verses...")
 for surah_num in range(1, 115):
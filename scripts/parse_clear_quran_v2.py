@@ -2,14 +2,15 @@ import json
 import re
 import os
 
+from verse_extractor import SourceText, section_table
+
 # Parse Clear Quran from alternative archive.org source
 # This version has inline numbered verses like "1. text 2. text 3. text"
 
 raw_path = os.path.join(os.path.dirname(__file__), "clear_quran_alt.txt")
 
 print("Reading alternative source file...")
-with open(raw_path, "r", encoding="utf-8") as f:
-    content = f.read()
+source = SourceText(raw_path)
 
 # Total verses per surah
 VERSE_COUNTS = {
@@ -145,47 +146,21 @@ SURAH_NAMES = {
     114: ["Humankind", "An-Nas"],
 }
 
-def find_surah_boundaries(content, surah_num):
-    """Find the start and end positions of a surah's content."""
-    names = SURAH_NAMES.get(surah_num, [])
-
-    # Build pattern to match surah header
-    # Looking for patterns like "1. The Opening" or "The Opening\n(Al-Fatihah)"
-    start_pos = None
-
-    for name in names:
-        # Try to find the surah heading (not in TOC - after position 30000)
-        pattern = rf'(?:{surah_num}\.\s*)?{name}'
-        for match in re.finditer(pattern, content[30000:], re.IGNORECASE):
-            pos = 30000 + match.start()
-            # Check if this looks like a surah heading (has intro text nearby)
-            context = content[pos:pos+500]
-            if re.search(r'(Meccan|Medinan|Medin?ian|surah|s.rah)', context, re.IGNORECASE):
-                start_pos = pos
-                break
-        if start_pos:
-            break
-
-    if start_pos is None:
-        return None, None
-
-    # Find end (next surah or end of content)
-    end_pos = len(content)
-    next_surah = surah_num + 1
-    if next_surah <= 114:
-        next_names = SURAH_NAMES.get(next_surah, [])
-        for name in next_names:
-            pattern = rf'(?:{next_surah}\.\s*)?{name}'
-            for match in re.finditer(pattern, content[start_pos + 500:], re.IGNORECASE):
-                pos = start_pos + 500 + match.start()
-                context = content[pos:pos+500]
-                if re.search(r'(Meccan|Medinan|Medin?ian|surah|s.rah)', context, re.IGNORECASE):
-                    end_pos = pos
-                    break
-            if end_pos < len(content):
-                break
-
-    return start_pos, end_pos
+def find_surah_boundaries(source):
+    """Surah -> (start, end) byte offsets of each surah's content.
+
+    Headings look like "1. The Opening" or "The Opening\n(Al-Fatihah)"; one
+    forward scan after the table of contents (character 30000) finds them all,
+    keeping those with intro text (Meccan/Medinan/surah) nearby.
+    """
+    headings = {
+        surah_num: [rf'(?:{surah_num}\.\s*)?{name}' for name in names]
+        for surah_num, names in SURAH_NAMES.items()
+    }
+    return section_table(
+        source, headings,
+        verify=r'(Meccan|Medinan|Medin?ian|surah|s.rah)', window=500, min_pos=30000,
+    )
 
 def extract_inline_verses(text, expected_count):
     """Extract verses from inline numbered format like '1. text 2. text 3. text'"""
@@ -226,13 +201,14 @@ missing_surahs = []
 
 print("Parsing surahs from alternative source...")
 
+boundaries = find_surah_boundaries(source)
+
 for surah_num in range(1, 115):
     expected = VERSE_COUNTS[surah_num]
-    start, end = find_surah_boundaries(content, surah_num)
 
-    if start is not None:
-        surah_content = content[start:end]
-        verses = extract_inline_verses(surah_content, expected)
+    if surah_num in boundaries:
+        start, end = boundaries[surah_num]
+        verses = extract_inline_verses(source.text(start, end), expected)
 
         if verses:
             all_translations[surah_num] = {str(k): v for k, v in verses.items()}
@@ -246,6 +222,8 @@ for surah_num in range(1, 115):
         print(f"Surah {surah_num}: CONTENT NOT FOUND")
         missing_surahs.append(surah_num)
 
+source.close()
+
 # Save result
 output_path = os.path.join(os.path.dirname(__file__), "..", "src", "data", "quran", "quran_clearquran.json")
 
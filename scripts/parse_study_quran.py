@@ -2,14 +2,15 @@ import json
 import re
 import os
 
+from verse_extractor import SourceText, section_table
+
 # Parse Study Quran from archive.org OCR text
 # Format: verses marked with symbols (0, ©, ®, �) followed by text
 
 raw_path = os.path.join(os.path.dirname(__file__), "study_quran_raw.txt")
 
 print("Reading Study Quran file...")
-with open(raw_path, "r", encoding="utf-8") as f:
-    content = f.read()
+source = SourceText(raw_path)
 
 # Total verses per surah
 VERSE_COUNTS = {
@@ -146,42 +147,37 @@ SURAH_NAMES = {
 }
 
 
-def find_surah_content(content, surah_num, min_pos=100000):
-    """Find where a surah's verses start and end."""
-    name_pattern = SURAH_NAMES.get(surah_num, "")
-    if not name_pattern:
+def find_surah_sections(source, min_pos=100000):
+    """Surah -> (start, end) byte offsets, from one forward scan of the source.
+
+    A heading counts when it is followed by the transliterated name (al-xxx)
+    or the period of revelation.
+    """
+    headings = {surah_num: [name] for surah_num, name in SURAH_NAMES.items()}
+    return section_table(source, headings, verify=r'al-|from the|period', window=200, min_pos=min_pos)
+
+
+def find_surah_content(source, section):
+    """Where a surah's verses start and end within its section."""
+    start, end = section
+
+    # Find "In the Name of God" which precedes verses
+    verse_start = source.find("In the Name of God", start, end)
+    if verse_start == -1:
+        verse_start = source.find("Alif", start, end)  # Some surahs start differently
+    if verse_start == -1:
+        verse_start = source.find("0 ", start, end)  # Verse marker
+    if verse_start <= start:
         return None, None
 
-    # Find surah header
-    for m in re.finditer(name_pattern, content[min_pos:], re.IGNORECASE):
-        pos = min_pos + m.start()
-        # Verify this is a surah header (followed by al-xxx)
-        ctx = content[pos:pos + 200]
-        if 'al-' in ctx.lower() or 'from the' in ctx.lower() or 'period' in ctx.lower():
-            # Find where verses start (after intro, before Commentary)
-            surah_text = content[pos:pos + 50000]
-
-            # Find "In the Name of God" which precedes verses
-            name_idx = surah_text.find("In the Name of God")
-            if name_idx == -1:
-                name_idx = surah_text.find("Alif")  # Some surahs start differently
-            if name_idx == -1:
-                name_idx = surah_text.find("0 ")  # Verse marker
-
-            if name_idx > 0:
-                verse_start = pos + name_idx
-                # Find Commentary section (end of verses)
-                commentary_idx = surah_text.find("\nCommentary\n", name_idx)
-                if commentary_idx == -1:
-                    commentary_idx = surah_text.find("\n\nCommentary", name_idx)
-                if commentary_idx == -1:
-                    commentary_idx = min(name_idx + 10000, len(surah_text))
-
-                verse_end = pos + commentary_idx
-                return verse_start, verse_end
-            break
-
-    return None, None
+    # Find Commentary section (end of verses)
+    verse_end = source.find("\nCommentary\n", verse_start, end)
+    if verse_end == -1:
+        verse_end = source.find("\n\nCommentary", verse_start, end)
+    if verse_end == -1:
+        verse_end = min(verse_start + 10000, end)
+
+    return verse_start, verse_end
 
 
 def extract_verses(text, expected_count):
@@ -236,6 +232,9 @@ MANUAL_VERSES = {
 # Parse surahs
 all_translations = {}
 
+print("Locating surah sections...")
+sections = find_surah_sections(source)
+
 print("Parsing surahs...")
 
 for surah_num in range(1, 115):
@@ -248,10 +247,9 @@ for surah_num in range(1, 115):
         continue
 
     # Find surah content
-    start, end = find_surah_content(content, surah_num)
+    start, end = find_surah_content(source, sections[surah_num]) if surah_num in sections else (None, None)
     if start and end:
-        surah_text = content[start:end]
-        verses = extract_verses(surah_text, expected)
+        verses = extract_verses(source.text(start, end), expected)
 
         if verses:
             all_translations[surah_num] = {str(k): v for k, v in verses.items()}
@@ -263,6 +261,8 @@ for surah_num in range(1, 115):
     else:
         print(f"Surah {surah_num}: CONTENT NOT FOUND")
 
+source.close()
+
 # Save result
 output_path = os.path.join(os.path.dirname(__file__), "..", "src", "data", "quran", "quran_studyquran.json")
 
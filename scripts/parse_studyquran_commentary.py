@@ -148,62 +148,110 @@ def clean_text(text: str) -> str:
     return text.strip()
 
 
-def find_surah_boundaries(lines: List[str]) -> Dict[int, Tuple[int, int]]:
+# Lines before this index are the table of contents (surahs start around 2270)
+TOC_LINES = 2250
+
+
+def _single_line(pattern: str) -> str:
+    """Adapt a per-line SURAHS pattern for whole-text matching.
+
+    Anchors are supplied by the combined matcher, and whitespace must not
+    cross line breaks (the patterns were written for one stripped line).
+    """
+    if pattern.startswith('^'):
+        pattern = pattern[1:]
+    if pattern.endswith('$'):
+        pattern = pattern[:-1]
+    pattern = pattern.replace(r'[\-\s]', r'(?:-|[^\S\n])')
+    return pattern.replace(r'\s', r'[^\S\n]')
+
+
+# Most header patterns share the article prefix; matching it once keeps the
+# alternation cheap on ordinary lines
+AL_PREFIX = r'al[\-\s]?'
+
+
+def _header_pattern() -> str:
+    with_al = [p[len(AL_PREFIX):] for _, _, p, _ in SURAHS if p.startswith(AL_PREFIX)]
+    others = [p for _, _, p, _ in SURAHS if not p.startswith(AL_PREFIX)]
+    alternatives = [_single_line(AL_PREFIX) + '(?:' + '|'.join(map(_single_line, with_al)) + ')']
+    alternatives += map(_single_line, others)
+    return r'^[^\S\n]*(?:' + '|'.join(alternatives) + r')[^\S\n]*$'
+
+
+# One alternation over every surah header: a single scan of the text yields
+# all candidate header lines
+HEADER_RE = re.compile(_header_pattern(), re.IGNORECASE | re.MULTILINE)
+
+# Per-surah patterns, applied to candidate lines only (first unfound surah wins)
+SURAH_RES = [
+    (surah_num, ' '.join(eng_name.lower().split()), re.compile(rf'^{ar_pattern}\s*$', re.IGNORECASE))
+    for surah_num, eng_name, ar_pattern, _ in SURAHS
+]
+
+
+def _line_offset(content: str, line_num: int) -> int:
+    """Character offset of the start of line `line_num`."""
+    pos = 0
+    for _ in range(line_num):
+        pos = content.find('\n', pos) + 1
+        if pos == 0:
+            return len(content)
+    return pos
+
+
+def find_surah_boundaries(lines: List[str], content: Optional[str] = None) -> Dict[int, Tuple[int, int]]:
     """
     Find the start and end line numbers for each surah's content.
     Returns dict: surah_number -> (start_line, end_line)
+
+    Candidate header lines come from one pass of HEADER_RE over the text;
+    only those lines are checked against the surrounding context.
     """
+    if content is None:
+        content = '\n'.join(lines)
+
     boundaries = {}
     surah_starts = []
     found_surahs = set()
 
-    # First pass: find all potential surah starts
-    for i, line in enumerate(lines):
-        line_clean = line.strip()
-        if not line_clean or len(line_clean) < 3:
-            continue
+    pos = _line_offset(content, TOC_LINES)
+    i = TOC_LINES
+    for match in HEADER_RE.finditer(content, pos):
+        i += content.count('\n', pos, match.start())
+        pos = match.start()
 
-        # Skip table of contents section (first ~2250 lines, but surahs start around 2270)
-        if i < 2250:
+        line_clean = lines[i].strip()
+        if len(line_clean) < 3:
             continue
 
-        for surah_num, eng_name, ar_pattern, _ in SURAHS:
-            if surah_num in found_surahs:
+        # A line may match several headers: keep the first unfound surah that verifies
+        for surah_num, eng_name_normalized, surah_re in SURAH_RES:
+            if surah_num in found_surahs or not surah_re.search(line_clean):
                 continue
 
-            # Check for Arabic name pattern
-            try:
-                if re.search(rf'^{ar_pattern}\s*$', line_clean, re.IGNORECASE):
-                    # Look at surrounding lines to verify this is a surah header
-                    prev_lines = [lines[j].strip() for j in range(max(0, i-3), i)]
-                    next_lines = [lines[j].strip() for j in range(i+1, min(len(lines), i+5))]
-
-                    # Check if previous line contains English name
-                    # Normalize spaces for comparison (OCR has double spaces)
-                    is_header = False
-                    eng_name_normalized = ' '.join(eng_name.lower().split())
-                    for pl in prev_lines:
-                        pl_normalized = ' '.join(pl.lower().split())
-                        if eng_name_normalized in pl_normalized:
-                            is_header = True
-                            break
-
-                    # Also check if this looks like a surah header context
-                    # (not just mentioned in commentary text)
-                    if is_header or (len(line_clean) < 30 and any("surah" in nl.lower() or "revealed" in nl.lower() for nl in next_lines[:3])):
-                        # Find the actual start (English name line)
-                        start_line = i
-                        for j in range(i-1, max(0, i-5), -1):
-                            line_normalized = ' '.join(lines[j].lower().split())
-                            if eng_name_normalized in line_normalized:
-                                start_line = j
-                                break
-
-                        surah_starts.append((start_line, surah_num))
-                        found_surahs.add(surah_num)
+            # Look at surrounding lines to verify this is a surah header
+            prev_lines = [lines[j].strip() for j in range(max(0, i-3), i)]
+            next_lines = [lines[j].strip() for j in range(i+1, min(len(lines), i+5))]
+
+            # Check if previous line contains English name
+            # Normalize spaces for comparison (OCR has double spaces)
+            is_header = any(eng_name_normalized in ' '.join(pl.lower().split()) for pl in prev_lines)
+
+            # Also check if this looks like a surah header context
+            # (not just mentioned in commentary text)
+            if is_header or (len(line_clean) < 30 and any("surah" in nl.lower() or "revealed" in nl.lower() for nl in next_lines[:3])):
+                # Find the actual start (English name line)
+                start_line = i
+                for j in range(i-1, max(0, i-5), -1):
+                    line_normalized = ' '.join(lines[j].lower().split())
+                    if eng_name_normalized in line_normalized:
+                        start_line = j
                         break
-            except re.error:
-                continue
+
+                surah_starts.append((start_line, surah_num))
+                found_surahs.add(surah_num)
+                break
 
     # Sort by line number
     surah_starts.sort(key=lambda x: x[0])
@@ -328,7 +376,7 @@ def parse_studyquran(input_file: str, output_file: str) -> Dict:
 
     # Find surah boundaries
     print("Finding surah boundaries...")
-    boundaries = find_surah_boundaries(lines)
+    boundaries = find_surah_boundaries(lines, content)
     print(f"Found {len(boundaries)} surahs")
 
     # Parse each surah
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Dependency-tracked runner for the data build (fetch -> parse -> merge ->
+validate -> export).
+
+Each stage declares the command it runs, the files it reads and the files
+it writes; the dependency graph follows from which stage produces which
+input. A stage's fingerprint is the SHA-256 of its command, its code (the
+script plus the sibling modules it imports, e.g. verse_extractor) and the
+content of its inputs. A stage is skipped when its fingerprint matches the
+last successful run and its outputs are still the files that run wrote.
+Because inputs are compared by content, a stage that reruns but writes
+identical output does not invalidate anything downstream.
+
+Fetch stages read from the network: they run when an output is missing or
+when named with --force, never just because a fingerprint changed. Fetchers
+save partial progress, so an existing output only counts when a run of the
+stage succeeded or the file predates the pipeline state (data fetched
+before the runner was used); otherwise the stage reruns as incomplete.
+
+Stages whose dependencies are done run in parallel (one subprocess each).
+A failed stage blocks its downstream stages; independent ones continue.
+A stage whose source file (one no stage produces) is missing is reported
+and not run; its existing outputs are used as they are.
+
+State is kept in scripts/.pipeline/ (state.json, one log per stage).
+Content hashes are cached by size and mtime, so unchanged files are not
+re-read.
+
+Usage:
+    python scripts/pipeline.py                      # bring every stage up to date
+    python scripts/pipeline.py validate             # a stage and what it needs
+    python scripts/pipeline.py --dry-run            # show what would run
+    python scripts/pipeline.py --list               # stages, inputs, outputs
+    python scripts/pipeline.py --force fetch-haleem --jobs 4
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+SCRIPT_DIR = Path(__file__).parent
+ROOT = SCRIPT_DIR.parent
+STATE_DIR = SCRIPT_DIR / ".pipeline"
+STATE_FILE = STATE_DIR / "state.json"
+LOG_DIR = STATE_DIR / "logs"
+
+QURAN = "src/data/quran"
+
+
+@dataclass
+class Stage:
+    """One build step (paths are relative to the repository root)."""
+    name: str
+    command: tuple[str, ...]
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    fetch: bool = False
+    # Write the command's stdout to this output instead of the log
+    stdout: Optional[str] = None
+
+    @property
+    def script(self) -> str:
+        return self.command[1]
+
+
+def py(script: str, *args: str) -> tuple[str, ...]:
+    return ("python", script, *args)
+
+
+STAGES = [
+    # fetch
+    Stage("fetch-quran-json", ("node", "scripts/download-quran-data.js"),
+          outputs=(f"{QURAN}/quran_arabic.json", f"{QURAN}/quran_turkish.json", f"{QURAN}/quran_english.json"),
+          fetch=True),
+    Stage("fetch-hayrat", ("node", "scripts/scrape_hayrat_v6.js"),
+          outputs=(f"{QURAN}/hayrat_meal.json",), fetch=True),
+    Stage("fetch-haleem", py("scripts/fetch_haleem.py"),
+          outputs=(f"{QURAN}/quran_haleem.json",), fetch=True),
+    Stage("fetch-studyquran", py("scripts/fetch_studyquran.py"),
+          outputs=(f"{QURAN}/quran_studyquran.json",), fetch=True),
+    Stage("fetch-kuranyolu", py("scripts/fetch_kuranyolu_full.py"),
+          outputs=(f"{QURAN}/kuranyolu_commentary.json",), fetch=True),
+    Stage("fetch-elmalili", py("scripts/fetch_elmalili.py"),
+          outputs=(f"{QURAN}/elmalili_tefsir.json",), fetch=True),
+
+    # parse (the raw OCR text files are placed in scripts/ by hand)
+    Stage("parse-clear-quran", py("scripts/parse_clear_quran_final.py"),
+          inputs=("scripts/clear_quran_alt.txt",),
+          outputs=(f"{QURAN}/quran_clearquran.json",)),
+    Stage("parse-studyquran-commentary", py("scripts/parse_studyquran_commentary.py"),
+          inputs=("scripts/studyquran_raw.txt",),
+          outputs=(f"{QURAN}/studyquran_commentary.json",)),
+
+    # merge / derive
+    Stage("merge-elmalili", py("scripts/merge_elmalili.py"),
+          inputs=(f"{QURAN}/elmalili_tefsir_old_backup.json", f"{QURAN}/elmalili_tefsir.json"),
+          outputs=(f"{QURAN}/elmalili_tefsir_merged.json",)),
+    Stage("verse-ranges", py("scripts/verse_ranges.py"),
+          inputs=tuple(f"{QURAN}/{name}" for name in (
+              "quran_turkish.json", "hayrat_meal.json", "quran_haleem.json",
+              "quran_clearquran.json", "quran_studyquran.json", "quran_english.json",
+          )),
+          outputs=tuple(f"{QURAN}/{name}_ranges.json" for name in (
+              "diyanet", "hayrat", "haleem", "clearquran", "studyquran", "sahih",
+          ))),
+    Stage("meal-duplicates", py("scripts/find_meal_duplicates.py"),
+          inputs=(f"{QURAN}/quran_turkish.json", f"{QURAN}/quran_arabic.json"),
+          outputs=("scripts/meal_duplicates.json",)),
+
+    # validate
+    Stage("validate", py("agents/validation.py", "all"),
+          inputs=tuple(f"{QURAN}/{name}" for name in (
+              "hayrat_meal.json", "kuranyolu_commentary.json", "studyquran_commentary.json",
+              "quran_arabic.json", "quran_turkish.json", "quran_english.json",
+              "quran_haleem.json", "quran_clearquran.json", "quran_studyquran.json",
+          )),
+          outputs=("scripts/validation_report.json",),
+          stdout="scripts/validation_report.json"),
+
+    # export (also reads the Elmalılı meal from the quran.com API / agents/.cache/elmalili)
+    Stage("export-meal", py("agents/meal_agent.py", "--export", "all"),
+          inputs=(f"{QURAN}/elmalili_tefsir.json", f"{QURAN}/hayrat_meal.json"),
+          outputs=(f"{QURAN}/combined_turkish_meal.json",), fetch=True),
+]
+
+
+def local_imports(script: Path) -> list[Path]:
+    """The script plus the sibling modules it imports (recursively)."""
+    found = []
+    pending = [script]
+    while pending:
+        path = pending.pop()
+        if path in found or not path.exists():
+            continue
+        found.append(path)
+        if path.suffix != ".py":
+            continue
+        try:
+            tree = ast.parse(path.read_bytes(), filename=str(path))
+        except SyntaxError:
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                module = path.parent / f"{name.split('.')[0]}.py"
+                if module.exists():
+                    pending.append(module)
+    return sorted(found)
+
+
+class HashCache:
+    """Content hashes keyed by path, reused while size and mtime are unchanged."""
+
+    def __init__(self, entries: dict):
+        self.entries = entries
+        self._lock = threading.Lock()
+
+    def digest(self, rel: str) -> Optional[str]:
+        """SHA-256 of a file (None if missing)."""
+        path = ROOT / rel
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        key = [stat.st_size, stat.st_mtime_ns]
+        with self._lock:
+            cached = self.entries.get(rel)
+        if cached and cached[:2] == key:
+            return cached[2]
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                sha.update(block)
+        digest = sha.hexdigest()
+        with self._lock:
+            self.entries[rel] = key + [digest]
+        return digest
+
+
+class Pipeline:
+    """Stage graph + persisted fingerprints."""
+
+    def __init__(self, stages: list[Stage]):
+        self.stages = {stage.name: stage for stage in stages}
+        self.producers = {}
+        for stage in stages:
+            for output in stage.outputs:
+                if output in self.producers:
+                    raise ValueError(f"{output} is written by both {self.producers[output]} and {stage.name}")
+                self.producers[output] = stage.name
+        self.deps = {
+            stage.name: sorted({self.producers[i] for i in stage.inputs if i in self.producers} - {stage.name})
+            for stage in stages
+        }
+        self.order = self._topological_order()
+
+        state = {}
+        if STATE_FILE.exists():
+            try:
+                state = json.loads(STATE_FILE.read_text(encoding="utf-8"))
+            except ValueError:
+                state = {}
+        self.runs: dict[str, dict] = state.get("stages", {})
+        self.hashes = HashCache(state.get("files", {}))
+        # When the state was started (older state files: its first recorded run)
+        self.created: Optional[float] = state.get("created")
+        if self.created is None and self.runs:
+            self.created = min(
+                time.mktime(time.strptime(r["finished_at"], "%Y-%m-%dT%H:%M:%S")) for r in self.runs.values()
+            )
+        self._lock = threading.Lock()
+
+    def _topological_order(self) -> list[str]:
+        order, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through {name}")
+            visiting.add(name)
+            for dep in self.deps[name]:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def closure(self, targets: list[str]) -> list[str]:
+        """Targets and every stage they depend on, in build order."""
+        needed = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in self.stages:
+                raise KeyError(name)
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.deps[name])
+        return [name for name in self.order if name in needed]
+
+    def fingerprint(self, stage: Stage) -> str:
+        sha = hashlib.sha256(json.dumps(stage.command).encode("utf-8"))
+        code = [p.relative_to(ROOT).as_posix() for p in local_imports(ROOT / stage.script)]
+        for rel in code + sorted(stage.inputs):
+            sha.update(f"\0{rel}\0{self.hashes.digest(rel)}".encode("utf-8"))
+        return sha.hexdigest()
+
+    def missing_sources(self, stage: Stage) -> list[str]:
+        """Inputs no stage produces that are not on disk."""
+        return [i for i in stage.inputs if i not in self.producers and not (ROOT / i).exists()]
+
+    def status(self, stage: Stage, force: bool = False) -> tuple[str, str]:
+        """("run" | "skip" | "missing", reason)."""
+        missing = self.missing_sources(stage)
+        if missing:
+            return "missing", ", ".join(missing)
+        if force:
+            return "run", "forced"
+        absent = [o for o in stage.outputs if not (ROOT / o).exists()]
+        if absent:
+            return "run", f"missing {', '.join(absent)}"
+        if stage.fetch:
+            if stage.name in self.runs or self.predates_state(stage):
+                return "skip", "fetched"
+            return "run", "incomplete"
+
+        last = self.runs.get(stage.name)
+        if not last:
+            return "run", "never run"
+        if last["fingerprint"] != self.fingerprint(stage):
+            return "run", "inputs or code changed"
+        if any(last["outputs"].get(o) != self.hashes.digest(o) for o in stage.outputs):
+            return "run", "outputs modified"
+        return "skip", "up to date"
+
+    def execute(self, stage: Stage) -> bool:
+        """Run one stage, recording its fingerprint on success."""
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        command = [sys.executable if part == "python" else part for part in stage.command]
+        env = dict(os.environ, PYTHONIOENCODING="utf-8")
+        fingerprint = self.fingerprint(stage)
+        # An interrupted run must not leave the previous success on record
+        with self._lock:
+            if self.runs.pop(stage.name, None) is not None:
+                self.save()
+
+        with open(LOG_DIR / f"{stage.name}.log", "wb") as log:
+            tmp_path = None
+            try:
+                if stage.stdout:
+                    output = ROOT / stage.stdout
+                    tmp_path = output.with_name(f"{output.name}.{os.getpid()}.tmp")
+                    with open(tmp_path, "wb") as out:
+                        ok = subprocess.run(command, cwd=ROOT, env=env, stdout=out, stderr=log).returncode == 0
+                    if ok:
+                        os.replace(tmp_path, output)
+                else:
+                    ok = subprocess.run(command, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT).returncode == 0
+            except OSError as e:
+                # e.g. node/python not on PATH: the stage fails, the run goes on
+                log.write(f"{' '.join(command)}: {e}\n".encode("utf-8"))
+                ok = False
+            if not ok and tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+
+        if ok:
+            with self._lock:
+                self.runs[stage.name] = {
+                    "fingerprint": fingerprint,
+                    "outputs": {o: self.hashes.digest(o) for o in stage.outputs},
+                    "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                }
+                self.save()
+        return ok
+
+    def predates_state(self, stage: Stage) -> bool:
+        """Outputs written before the pipeline state existed (not by an unfinished run)."""
+        if self.created is None:
+            return True
+        return all((ROOT / o).stat().st_mtime < self.created for o in stage.outputs)
+
+    def save(self):
+        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        if self.created is None:
+            self.created = time.time()
+        tmp_path = STATE_FILE.with_name(f"{STATE_FILE.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(
+            json.dumps({"created": self.created, "stages": self.runs, "files": self.hashes.entries}, indent=2),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, STATE_FILE)
+
+    def run(self, targets: Optional[list[str]] = None, force: set = frozenset(),
+            jobs: Optional[int] = None, dry_run: bool = False) -> dict[str, str]:
+        """
+        Bring the targets (default: all stages) up to date.
+
+        Stages are decided once all their dependencies have finished, so a
+        downstream fingerprint sees the outputs its producers just wrote.
+        With dry_run, stages that would run are assumed to change their outputs.
+        Returns stage -> "ran" | "skipped" | "failed" | "blocked" | "missing"
+        (or "would run" with dry_run).
+        """
+        selected = self.closure(targets) if targets else list(self.order)
+        if self.created is None and not dry_run:
+            # Start the state before any stage runs: later partial fetches are newer
+            self.save()
+        results: dict[str, str] = {}
+        pending = list(selected)
+        running = {}
+
+        def ready(name):
+            return all(results.get(dep) not in (None, "running") for dep in self.deps[name] if dep in selected)
+
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+            while pending or running:
+                for name in [n for n in pending if ready(n)]:
+                    pending.remove(name)
+                    stage = self.stages[name]
+                    upstream = [results.get(dep) for dep in self.deps[name] if dep in selected]
+                    if any(r in ("failed", "blocked") for r in upstream):
+                        results[name] = "blocked"
+                        print(f"  [BLOCKED] {name}")
+                        continue
+                    action, reason = self.status(stage, force=name in force)
+                    if dry_run and action == "skip" and "would run" in upstream:
+                        action, reason = "run", "upstream reruns"
+                    if action == "skip":
+                        results[name] = "skipped"
+                        print(f"  [SKIP] {name} ({reason})")
+                    elif action == "missing":
+                        results[name] = "missing"
+                        print(f"  [MISSING] {name} ({reason})")
+                    elif dry_run:
+                        results[name] = "would run"
+                        print(f"  [RUN] {name} ({reason})")
+                    else:
+                        print(f"  [RUN] {name} ({reason})")
+                        results[name] = "running"
+                        running[pool.submit(self.execute, stage)] = (name, time.time())
+
+                if not running:
+                    if pending and not any(ready(n) for n in pending):
+                        raise RuntimeError(f"Unschedulable stages: {pending}")
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, started = running.pop(future)
+                    ok = future.result()
+                    results[name] = "ran" if ok else "failed"
+                    label = "OK" if ok else "FAIL"
+                    print(f"  [{label}] {name} ({time.time() - started:.1f}s)")
+                    if not ok:
+                        print(f"         log: {LOG_DIR / (name + '.log')}")
+
+        if not dry_run:
+            self.save()
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the data build, skipping up-to-date stages")
+    parser.add_argument("targets", nargs="*", help="Stages to bring up to date (default: all)")
+    parser.add_argument("--force", nargs="+", default=[], metavar="STAGE", help="Rerun these stages (fetch stages only run when forced or missing)")
+    parser.add_argument("--jobs", type=int, help="Parallel stages (default: CPU count)")
+    parser.add_argument("--dry-run", "-n", action="store_true", help="Show what would run")
+    parser.add_argument("--list", action="store_true", help="List stages")
+    args = parser.parse_args()
+
+    pipeline = Pipeline(STAGES)
+    unknown = [n for n in args.targets + args.force if n not in pipeline.stages]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)} (see --list)")
+
+    if args.list:
+        for name in pipeline.order:
+            stage = pipeline.stages[name]
+            kind = " [fetch]" if stage.fetch else ""
+            print(f"{name}{kind}: {' '.join(stage.command)}")
+            for path in stage.inputs:
+                print(f"    < {path}")
+            for path in stage.outputs:
+                print(f"    > {path}")
+        return
+
+    results = pipeline.run(args.targets or None, force=set(args.force), jobs=args.jobs, dry_run=args.dry_run)
+    counts = {}
+    for result in results.values():
+        counts[result] = counts.get(result, 0) + 1
+    print("\n" + ", ".join(f"{count} {result}" for result, count in sorted(counts.items())))
+    if any(result in ("failed", "blocked") for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Shared extraction engine for the OCR'd translation parsers.
+
+The source text is memory-mapped instead of read into a string. Surah
+sections are located with a single forward scan: one combined header
+pattern yields every candidate heading, each is verified against the
+text that follows it, and the longest run of candidates that increases in
+both position and surah number becomes the offset table (preferring
+headings that start a line). Stray mentions
+of surah names (table of contents, cross references) fall outside that
+run, so no hand-maintained byte offsets are needed and the table follows
+the text after OCR fixes.
+
+Scanning and searching work directly on the map; only a surah's own
+section is decoded when its verses are extracted.
+
+Usage:
+    from verse_extractor import SourceText, section_table
+
+    with SourceText(path) as source:
+        table = section_table(source, SURAH_NAMES, verify=r'Meccan|Medinan', min_pos=30000)
+        start, end = table[2]
+        text = source.text(start, end)
+"""
+
+import mmap
+import re
+from typing import Optional
+
+# One UTF-8 encoded character other than a newline (what a single '.' means
+# in the str patterns the parsers were written with)
+UTF8_CHAR = rb'(?:[^\n\x80-\xff]|[\xc0-\xff][\x80-\xbf]*)'
+
+# A heading this close to the start of its line ("55. The Most Compassionate")
+# is preferred over the same name inside running text
+LINE_PREFIX = 16
+
+
+def utf8_pattern(pattern: str) -> bytes:
+    """Translate a str regex into a bytes regex over UTF-8 text."""
+    out = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            out.append(pattern[i:i + 2].encode('utf-8'))
+            i += 2
+            continue
+        if in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '.' and pattern[i + 1:i + 2] not in ('*', '+'):
+            # A run (.*, .+) spans whole characters anyway; a single '.'
+            # must consume a complete multi-byte character
+            out.append(UTF8_CHAR)
+            i += 1
+            continue
+        out.append(char.encode('utf-8'))
+        i += 1
+    return b''.join(out)
+
+
+class SourceText:
+    """Read-only memory map of a UTF-8 text file (offsets are byte offsets)."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        size = self._file.seek(0, 2)
+        # mmap cannot map an empty file
+        self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __enter__(self) -> 'SourceText':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+    def find(self, needle: str, start: int = 0, end: Optional[int] = None) -> int:
+        """Byte offset of `needle` in [start, end), or -1."""
+        return self.data.find(needle.encode('utf-8'), start, len(self.data) if end is None else end)
+
+    def byte_offset(self, char_offset: int) -> int:
+        """Byte offset of the character at `char_offset` of the decoded text."""
+        # A character is at most 4 bytes; invalid bytes count as one character each
+        prefix = self.data[:4 * char_offset].decode('utf-8', errors='surrogateescape')[:char_offset]
+        return len(prefix.encode('utf-8', errors='surrogateescape'))
+
+    def text(self, start: int, end: int) -> str:
+        """Decode one section (the only place the text is copied)."""
+        return self.data[start:end].decode('utf-8', errors='replace')
+
+
+def _increasing_run(candidates: list[tuple[int, int, bool]]) -> dict[int, int]:
+    """
+    Longest subsequence of (position, surah, at_line_start) candidates,
+    already in position order, whose surah numbers strictly increase.
+
+    Among runs of equal length the one with more headings at the start of a
+    line wins, then the one with earlier headings: a surah's heading comes
+    before later mentions of its name in its own text (the table of
+    contents is excluded by section_table's min_pos). Best runs ending
+    below each surah number are kept in a Fenwick tree (prefix maximum).
+    """
+    size = max((surah for _, surah, _ in candidates), default=0)
+    # (length, line starts, -index of the run's last candidate)
+    tree = [(0, 0, 1)] * (size + 1)
+    previous = []
+
+    for i, (_, surah, at_line_start) in enumerate(candidates):
+        best = (0, 0, 1)
+        k = surah - 1
+        while k > 0:
+            best = max(best, tree[k])
+            k -= k & -k
+        previous.append(-best[2])
+        value = (best[0] + 1, best[1] + at_line_start, -i)
+        k = surah
+        while k <= size:
+            tree[k] = max(tree[k], value)
+            k += k & -k
+
+    best = max(tree)
+    starts = {}
+    i = -best[2]
+    while i >= 0:
+        pos, surah, _ = candidates[i]
+        starts[surah] = pos
+        i = previous[i]
+    return starts
+
+
+def _at_line_start(data, pos: int) -> bool:
+    """Heading-like position: at most LINE_PREFIX bytes (e.g. "3. The ") into its line."""
+    return pos <= LINE_PREFIX or data.rfind(b'\n', pos - LINE_PREFIX - 1, pos) != -1
+
+
+def section_table(source: SourceText, names: dict[int, list[str]], verify: str,
+                  window: int = 500, min_pos: int = 0) -> dict[int, tuple[int, int]]:
+    """
+    Byte ranges of each surah's section: surah -> (start, end).
+
+    names:   surah -> header patterns (str regexes, matched case-insensitively)
+    verify:  pattern that must occur within `window` bytes of a real heading
+    min_pos: skip the front matter (table of contents); a character offset
+             into the decoded text, converted to bytes here
+
+    A section ends where the next detected surah begins (or at end of text).
+    """
+    surah_res = {
+        surah: re.compile(b'|'.join(b'(?:' + utf8_pattern(p) + b')' for p in patterns), re.IGNORECASE)
+        for surah, patterns in names.items()
+    }
+    # Zero-width, so a long match (e.g. "Those.*Lined up") cannot hide a
+    # heading that starts inside it; headings start at a word boundary
+    # ("Aid" is not found in "said")
+    header_re = re.compile(
+        rb'\b(?=' + b'|'.join(b'(?:' + utf8_pattern(p) + b')' for patterns in names.values() for p in patterns) + b')',
+        re.IGNORECASE,
+    )
+    verify_re = re.compile(utf8_pattern(verify), re.IGNORECASE)
+
+    data = source.data
+    candidates = []
+    for match in header_re.finditer(data, source.byte_offset(min_pos) if min_pos else 0):
+        pos = match.start()
+        if not verify_re.search(data, pos, pos + window):
+            continue
+        # Several surahs may share a heading pattern; listing them in
+        # decreasing order keeps two of them from starting at the same offset
+        matching = [surah for surah, surah_re in surah_res.items() if surah_re.match(data, pos)]
+        at_line_start = _at_line_start(data, pos)
+        candidates.extend((pos, surah, at_line_start) for surah in sorted(matching, reverse=True))
+
+    starts = _increasing_run(candidates)
+    ordered = sorted(starts.items(), key=lambda item: item[1])
+    return {
+        surah: (start, ordered[i + 1][1] if i + 1 < len(ordered) else len(data))
+        for i, (surah, start) in enumerate(ordered)
+    }
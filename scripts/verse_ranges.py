@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Verse range detection for all translation sources.
+
+A translator sometimes renders several verses as one sentence; the source
+then repeats the same translation for each of those verses. Each verse's
+translation is normalized (Unicode NFC, footnote markers like "(12)"
+removed, whitespace collapsed, case folded) and hashed once; ranges are
+the runs of equal hashes within a surah, found in a single linear pass.
+
+Sources are read in any of the repo's layouts (surah list with verses,
+{surah: {ayah: text}} or Hayrat {"translations": {"s:a": text}}) and
+ordered by (surah, ayah) before the pass.
+
+Output: one <source>_ranges.json per source in src/data/quran
+(diyanet_ranges.json is the file the app loads).
+
+Usage:
+    python verse_ranges.py                   # all available sources
+    python verse_ranges.py diyanet haleem    # selected sources
+"""
+
+import hashlib
+import json
+import re
+import sys
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR.parent / "src" / "data" / "quran"
+
+# name -> (file, description label)
+SOURCES = {
+    "diyanet": ("quran_turkish.json", "Diyanet Turkish translation"),
+    "hayrat": ("hayrat_meal.json", "Hayrat Turkish translation"),
+    "haleem": ("quran_haleem.json", "Abdel Haleem English translation"),
+    "clearquran": ("quran_clearquran.json", "Clear Quran English translation"),
+    "studyquran": ("quran_studyquran.json", "Study Quran English translation"),
+    "sahih": ("quran_english.json", "Sahih International English translation"),
+}
+
+FOOTNOTE_RE = re.compile(r"\(\d+\)")
+
+
+@dataclass
+class VerseRange:
+    """Consecutive verses of a surah sharing one translation."""
+    surah: int
+    start: int
+    end: int
+    count: int
+    text: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.surah}:{self.start}-{self.end}"
+
+
+def output_path(source: str) -> Path:
+    return DATA_DIR / f"{source}_ranges.json"
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFC", text)
+    text = FOOTNOTE_RE.sub(" ", text)
+    return " ".join(text.split()).casefold()
+
+
+def text_hash(text: str) -> Optional[bytes]:
+    """Digest of the normalized translation (None for an empty one)."""
+    text = normalize(text)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest() if text else None
+
+
+def load_verses(path: Path) -> list[tuple[int, int, str]]:
+    """(surah, ayah, translation) records of a source, in verse order."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    verses = []
+    if isinstance(data, list):
+        for surah in data:
+            for verse in surah.get("verses", []):
+                verses.append((surah["id"], verse["id"], verse.get("translation") or ""))
+    elif "translations" in data:
+        for key, text in data["translations"].items():
+            surah, ayah = key.split(":")
+            verses.append((int(surah), int(ayah), text or ""))
+    else:
+        for surah, surah_verses in data.items():
+            for ayah, text in surah_verses.items():
+                verses.append((int(surah), int(ayah), text or ""))
+
+    verses.sort(key=lambda v: (v[0], v[1]))
+    return verses
+
+
+def find_ranges(verses: list[tuple[int, int, str]]) -> list[VerseRange]:
+    """Runs of 2+ consecutive verses (same surah) with equal translation hashes."""
+    ranges = []
+    run_start = 0
+    previous = None  # (surah, ayah, hash) of the verse before
+
+    for i, (surah, ayah, text) in enumerate(verses + [(None, None, "")]):
+        digest = text_hash(text)
+        if (digest is not None and previous is not None and previous[2] == digest
+                and previous[0] == surah and previous[1] + 1 == ayah):
+            previous = (surah, ayah, digest)
+            continue
+        if i - run_start > 1:
+            first, last = verses[run_start], verses[i - 1]
+            ranges.append(VerseRange(first[0], first[1], last[1], i - run_start, first[2]))
+        run_start = i
+        previous = (surah, ayah, digest)
+    return ranges
+
+
+def ranges_document(source: str, ranges: list[VerseRange]) -> dict:
+    label = SOURCES[source][1]
+    return {
+        "metadata": {
+            "description": f"{label} verse ranges - where translator combined multiple verses",
+            "total_ranges": len(ranges),
+            "total_affected_verses": sum(r.count for r in ranges)
+        },
+        "ranges": {
+            r.key: {
+                "surahId": r.surah,
+                "startVerse": r.start,
+                "endVerse": r.end,
+                "verseCount": r.count
+            } for r in ranges
+        }
+    }
+
+
+def source_ranges(source: str) -> list[VerseRange]:
+    return find_ranges(load_verses(DATA_DIR / SOURCES[source][0]))
+
+
+def write_ranges(source: str, ranges: list[VerseRange]) -> Path:
+    path = output_path(source)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(ranges_document(source, ranges), f, ensure_ascii=False, indent=2)
+    return path
+
+
+def main():
+    names = sys.argv[1:] or [name for name, (filename, _) in SOURCES.items() if (DATA_DIR / filename).exists()]
+    unknown = [name for name in names if name not in SOURCES]
+    if unknown:
+        print(f"Unknown source(s): {', '.join(unknown)} (options: {', '.join(SOURCES)})")
+        sys.exit(1)
+
+    for name in names:
+        ranges = source_ranges(name)
+        path = write_ranges(name, ranges)
+        print(f"{name}: {len(ranges)} ranges, {sum(r.count for r in ranges)} verses -> {path.name}")
+
+
+if __name__ == "__main__":
+    main()